@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Multi-Book Concept Extraction Runner
+Runs one extraction session for every active book in config/books_config.json
+
+All books share a single interpreter, a single set of imports (pdfplumber,
+the LLM SDKs) and one processor instance per provider.
+"""
+
+import os
+import sys
+import argparse
+from datetime import datetime
+
+# Add project root to Python path for module imports
+sys.path.append('.')
+
+from core.extraction_engine import (
+    ExtractionEngine, ENV_CONFIG_FILE, load_books_config, resolve_project_path, create_book_processor
+)
+from core.book_lock import BookLockedError
+
+
+def run_all_books(book_keys=None):
+    """Run one session per active book; returns {book_key: status}"""
+    books = load_books_config()
+    processors = {}  # processor name -> shared instance
+    results = {}
+
+    for book_key, book_config in books.items():
+        if book_keys and book_key not in book_keys:
+            continue
+
+        display_name = book_config.get("display_name", book_key)
+
+        if book_config.get("status", "active") != "active":
+            print(f"⏳ Skipping {display_name} (status: {book_config.get('status')})")
+            results[book_key] = "PENDING"
+            continue
+
+        pdf_path = resolve_project_path(book_config["pdf_path"])
+        if not pdf_path.exists():
+            print(f"❌ {display_name} PDF not found: {pdf_path}")
+            results[book_key] = "PDF_MISSING"
+            continue
+
+        print(f"\n{'=' * 60}\n📚 {display_name} ({book_config['processor']})\n{'=' * 60}")
+
+        try:
+            processor = create_book_processor(book_config, shared_processors=processors)
+            engine = ExtractionEngine(book_key, book_config, processor=processor)
+            continue_extraction = engine.run_extraction_session()
+            results[book_key] = "SUCCESS" if continue_extraction else "COMPLETE"
+        except BookLockedError as e:
+            print(f"🔒 Skipping {display_name}: {e}")
+            results[book_key] = "LOCKED"
+        except Exception as e:
+            print(f"❌ {display_name} extraction failed: {e}")
+            results[book_key] = "FAILED"
+
+    return results
+
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Run daily extraction for all configured books")
+    parser.add_argument("books", nargs="*", help="book keys to run (default: all active books)")
+    parser.add_argument("--no-cache", action="store_true", help="bypass the LLM response cache entirely")
+    parser.add_argument("--refresh-cache", action="store_true", help="ignore cached responses but store fresh ones")
+    args = parser.parse_args()
+
+    if args.no_cache:
+        os.environ["LLM_CACHE_BYPASS"] = "1"
+    if args.refresh_cache:
+        os.environ["LLM_CACHE_REFRESH"] = "1"
+
+    if not ENV_CONFIG_FILE.exists():
+        print("❌ Config file not found. Please create config/config.env with your API keys")
+        return 1
+
+    started = datetime.now()
+    results = run_all_books(args.books or None)
+
+    print(f"\n🏛️  Multi-book extraction finished in {(datetime.now() - started).total_seconds():.1f}s")
+    for book_key, status in results.items():
+        print(f"  • {book_key}: {status}")
+
+    return 0 if all(status in ("SUCCESS", "COMPLETE", "PENDING", "LOCKED") for status in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Atomic File Core Module
+Extracted from the Content-Intelligent C Concept Extraction Engine
+
+Crash-safe writes for state files. Data goes to a temporary file in the
+same directory, is fsynced, and then renamed over the target, so a reader
+(or the next run after a kill) sees either the old or the new content,
+never a truncated file.
+"""
+
+import os
+import json
+import threading
+
+
+def _fsync_directory(directory):
+    """Persist the rename itself (no-op where directories cannot be opened)"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write_text(path, text):
+    """Replace `path` with `text` atomically"""
+    _atomic_write(path, text, 'w')
+
+
+def atomic_write_bytes(path, data):
+    """Replace `path` with binary `data` atomically"""
+    _atomic_write(path, data, 'wb')
+
+
+def _atomic_write(path, data, mode):
+    path = os.fspath(path)
+    directory = os.path.dirname(path) or "."
+    tmp_path = os.path.join(directory, f".{os.path.basename(path)}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, mode) as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _fsync_directory(directory)
+
+
+def atomic_write_json(path, data, indent=2):
+    """json.dump() replacement that never leaves a partial file behind"""
+    atomic_write_text(path, json.dumps(data, indent=indent))
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Book Lock Core Module
+Extracted from the Content-Intelligent C Concept Extraction Engine
+
+Per-book exclusive lock held for the length of an extraction session, so
+different books extract in parallel (threads, processes or overlapping cron
+runs) while the same book can never run twice at once and interleave
+progress, backlog or concept writes.
+
+The lock is an fcntl.flock on outputs/<book>/.extraction.lock, which also
+records the holder's PID, host and start time. The kernel drops a flock
+when its holder exits, so a killed run does not leave the book locked. The
+exception is a forked child that inherited the descriptor (e.g. a PDF
+worker orphaned by SIGKILL): a held lock whose recorded PID is dead on this
+host is stale, and is reclaimed by replacing the lock file. Reclaimers take
+a short flock on .extraction.lock.reclaim around checking and unlinking the
+stale file, so one that lost the race never unlinks the file that the
+winner's successor has just locked.
+"""
+
+import os
+import json
+import fcntl
+import socket
+from datetime import datetime
+
+BOOK_LOCK_FILENAME = ".extraction.lock"
+RECLAIM_SUFFIX = ".reclaim"
+LOCKED_EXIT_CODE = 75  # EX_TEMPFAIL: the book is busy, try again later
+RECLAIM_ATTEMPTS = 3
+
+
+class BookLockedError(RuntimeError):
+    """Raised when another live process is extracting the same book"""
+
+    def __init__(self, book, holder):
+        self.book = book
+        self.holder = holder
+        super().__init__(
+            f"{book} is already being extracted (PID {holder.get('pid', '?')} on "
+            f"{holder.get('host', '?')} since {holder.get('since', '?')})"
+        )
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # exists, owned by someone else
+    return True
+
+
+class BookLock:
+    """Exclusive non-blocking flock for one book's output directory"""
+
+    def __init__(self, lock_path, book=None):
+        self.lock_path = os.fspath(lock_path)
+        self.book = book or os.path.basename(os.path.dirname(os.path.abspath(self.lock_path)))
+        self.fd = None
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+    def acquire(self):
+        """Take the lock or raise BookLockedError; stale locks are reclaimed"""
+        for _ in range(RECLAIM_ATTEMPTS):
+            fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                holder = self._read_holder(fd)
+                if not self._is_stale(holder):
+                    os.close(fd)
+                    raise BookLockedError(self.book, holder)
+
+                print(f"🔓 Reclaiming stale {self.book} lock left by dead PID {holder['pid']}")
+                # New inode: the orphaned descriptor keeps locking only the old file
+                self._reclaim(fd)
+                os.close(fd)
+                continue
+
+            if not self._still_linked(fd):
+                # Locked a file that was released or reclaimed meanwhile; start over
+                os.close(fd)
+                continue
+
+            self._write_holder(fd)
+            self.fd = fd
+            return self
+
+        raise BookLockedError(self.book, {})
+
+    def release(self):
+        if self.fd is None:
+            return
+        # Unlink while still holding the lock; late openers notice via _still_linked
+        if self._still_linked(self.fd):
+            os.unlink(self.lock_path)
+        os.close(self.fd)
+        self.fd = None
+
+    def _reclaim(self, fd):
+        """Unlink the stale lock file behind fd, unless the path already names a newer one"""
+        guard = os.open(self.lock_path + RECLAIM_SUFFIX, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            # Held only for the check and the unlink; the kernel drops it if we die
+            fcntl.flock(guard, fcntl.LOCK_EX)
+            if self._still_linked(fd):
+                os.unlink(self.lock_path)
+        finally:
+            os.close(guard)
+
+    def _still_linked(self, fd):
+        """True while the lock path still names the file behind fd"""
+        try:
+            return os.stat(self.lock_path).st_ino == os.fstat(fd).st_ino
+        except FileNotFoundError:
+            return False
+
+    def _read_holder(self, fd):
+        try:
+            return json.loads(os.pread(fd, 4096, 0) or b"{}")
+        except ValueError:
+            return {}  # holder has not written its details yet
+
+    def _write_holder(self, fd):
+        holder = {"book": self.book, "pid": os.getpid(), "host": socket.gethostname(),
+                  "since": datetime.now().isoformat(timespec="seconds")}
+        os.ftruncate(fd, 0)
+        os.pwrite(fd, json.dumps(holder).encode("utf-8"), 0)
+
+    def _is_stale(self, holder):
+        """The recorded holder is a dead process on this host"""
+        return (isinstance(holder.get("pid"), int) and holder.get("host") == socket.gethostname()
+                and not _pid_alive(holder["pid"]))
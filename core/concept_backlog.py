@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Concept Backlog Core Module
+Extracted from the Content-Intelligent C Concept Extraction Engine
+
+Persists detected-but-unprocessed concept candidates between sessions.
+
+The backlog is saved before the session's progress checkpoint, so a run
+killed in between re-detects pages whose candidates are already queued.
+Candidates are keyed by page range and content digest, and the engine skips
+any it has already queued or drained this session instead of queueing them
+twice.
+"""
+
+import os
+import json
+
+from core.atomic_file import atomic_write_json
+from core.dedup import content_digest
+
+MAX_ATTEMPTS = 3  # failed LLM calls before a candidate is dropped
+
+
+class ConceptBacklog:
+    """FIFO queue of concept candidates waiting for an LLM call"""
+
+    def __init__(self, backlog_file="backlog.json"):
+        self.backlog_file = backlog_file
+        self.concepts = self.load_backlog()
+        self.seen = {self.key(concept) for concept in self.concepts}  # queued or popped since loading
+
+    def __len__(self):
+        return len(self.concepts)
+
+    def __contains__(self, concept):
+        """True if the candidate was in the backlog at any point since it was loaded"""
+        return self.key(concept) in self.seen
+
+    @staticmethod
+    def key(concept):
+        return concept["page_range"], content_digest(concept["raw_content"])
+
+    def load_backlog(self):
+        if os.path.exists(self.backlog_file):
+            try:
+                with open(self.backlog_file, 'r') as f:
+                    content = f.read().strip()
+                    if content:
+                        return json.loads(content)
+            except (json.JSONDecodeError, Exception) as e:
+                print(f"📝 Backlog file corrupted ({e}), starting with an empty backlog...")
+
+        return []
+
+    def save_backlog(self):
+        # Atomic replace: a kill mid-write must not lose the whole queue
+        atomic_write_json(self.backlog_file, self.concepts)
+
+    def pop(self, count):
+        """Remove and return up to `count` of the oldest candidates"""
+        popped = self.concepts[:count]
+        self.concepts = self.concepts[count:]
+        return popped
+
+    def push(self, concept):
+        """Queue a detected candidate (blocks, page_range, raw_content, ...); False if already seen"""
+        key = self.key(concept)
+        if key in self.seen:
+            return False
+        self.seen.add(key)
+        self.concepts.append(concept)
+        return True
+
+    def retry(self, concept, max_attempts=MAX_ATTEMPTS):
+        """Queue a candidate whose LLM call failed; False once it has failed max_attempts times"""
+        concept["attempts"] = concept.get("attempts", 0) + 1
+        if concept["attempts"] >= max_attempts:
+            return False
+        self.seen.add(self.key(concept))
+        self.concepts.append(concept)
+        return True
+
+    def requeue(self, concepts):
+        """Put popped-but-unprocessed candidates back at the front"""
+        self.seen.update(self.key(concept) for concept in concepts)
+        self.concepts = list(concepts) + self.concepts
@@ -6,20 +6,38 @@ Extracted from the Content-Intelligent C Concept Extraction Engine
 Detects natural atomic concept boundaries in structured content.
 """
 
+from core.metrics import get_metrics, IterationSpan
+
 
 class ConceptBoundaryDetector:
     """Detects natural atomic concept boundaries"""
     
     def detect_atomic_concepts(self, content_blocks):
         """Group content blocks into atomic concepts"""
-        concepts = []
+        return list(self.iter_atomic_concepts(content_blocks))
+    
+    def iter_atomic_concepts(self, content_blocks):
+        """Yield each atomic concept as soon as its boundary closes
+        
+        Accepts any iterable of blocks (e.g. iter_structured_content()), so
+        only the blocks of the concept being built are held in memory.
+        Recorded as one "concept_detection" metrics span, excluding the time
+        spent extracting the blocks it pulls from.
+        """
+        return get_metrics().iter_span(
+            "concept_detection", self._iter_concepts(content_blocks),
+            measure=lambda concept: len(concept["raw_content"]),
+            inner=content_blocks if isinstance(content_blocks, IterationSpan) else None
+        )
+    
+    def _iter_concepts(self, content_blocks):
         current_concept = []
         
         for block in content_blocks:
             # Start new concept on headers
             if block["type"] == "header":
                 if current_concept:
-                    concepts.append(self._finalize_concept(current_concept))
+                    yield self._finalize_concept(current_concept)
                 current_concept = [block]
             
             # Add to current concept
@@ -28,14 +46,12 @@ class ConceptBoundaryDetector:
                 
                 # Check if we have a complete atomic concept
                 if self._is_complete_concept(current_concept):
-                    concepts.append(self._finalize_concept(current_concept))
+                    yield self._finalize_concept(current_concept)
                     current_concept = []
         
         # Don't forget the last concept
         if current_concept:
-            concepts.append(self._finalize_concept(current_concept))
-        
-        return concepts
+            yield self._finalize_concept(current_concept)
     
     def _is_complete_concept(self, blocks):
         """Check if we have a complete atomic concept"""
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Concept Store Core Module
+Extracted from the Content-Intelligent C Concept Extraction Engine
+
+Single SQLite database (WAL mode) holding every extracted concept plus the
+per-book progress, session history and dedup fingerprints, so readers load
+all books with one query instead of opening hundreds of JSON files.
+
+The engine writes each concept to the store and, for compatibility, still
+to outputs/<book>/<filename>.json. Per-book progress.json/progress.journal
+stay authoritative for resuming; the store mirrors them for readers.
+export_json() rebuilds the classic directory layout from the store.
+"""
+
+import os
+import sys
+import json
+import time
+import fnmatch
+import sqlite3
+import threading
+from pathlib import Path
+
+from core.atomic_file import atomic_write_json, atomic_write_text
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+STORE_FILENAME = "concepts.sqlite3"
+DEFAULT_STORE_FILE = PROJECT_ROOT / "outputs" / STORE_FILENAME
+
+# Every concept file, with or without the book's file_prefix (progress.json, backlog.json, ... never match)
+CONCEPT_FILE_GLOB = "*concept_*.json"
+
+SCHEMA_VERSION = 2
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS concepts (
+    book TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    topic TEXT,
+    data TEXT NOT NULL,
+    updated REAL NOT NULL,
+    PRIMARY KEY (book, filename)
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    book TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    date TEXT,
+    concepts_extracted INTEGER,
+    page_range TEXT,
+    chapter TEXT,
+    PRIMARY KEY (book, seq)
+);
+CREATE TABLE IF NOT EXISTS content_fingerprints (
+    book TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    signature BLOB NOT NULL,
+    filename TEXT,
+    PRIMARY KEY (book, digest)
+);
+CREATE TABLE IF NOT EXISTS progress (
+    book TEXT PRIMARY KEY,
+    last_processed_page INTEGER NOT NULL,
+    total_concepts_extracted INTEGER NOT NULL,
+    current_chapter INTEGER,
+    updated REAL NOT NULL
+);
+"""
+
+
+def is_concept_file(name):
+    """Whether a file name in a book directory is a concept file (CONCEPT_FILE_GLOB)"""
+    return fnmatch.fnmatchcase(name, CONCEPT_FILE_GLOB)
+
+
+class ConceptStore:
+    """Thread-safe SQLite store for concepts, sessions and progress"""
+
+    def __init__(self, db_path=DEFAULT_STORE_FILE):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        # Several book threads share the connection; the timeout covers other processes
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+            self.conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    def put_concept(self, book, filename, concept, data=None):
+        """Insert or replace one concept; `data` is its JSON text if already serialised"""
+        topic = concept.get("topic") if isinstance(concept, dict) else None
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO concepts (book, filename, topic, data, updated) VALUES (?, ?, ?, ?, ?)",
+                (book, filename, topic, data if data is not None else json.dumps(concept), time.time())
+            )
+
+    def concepts(self, books=None, pattern=CONCEPT_FILE_GLOB):
+        """[(book, filename, concept)] for the given books (all when None), in file order"""
+        rows = self._query("book, filename, data", books, pattern)
+        return [(book, filename, json.loads(data)) for book, filename, data in rows]
+
+    def topics(self, books=None, pattern=CONCEPT_FILE_GLOB):
+        """[(book, topic)] without decoding the concept bodies"""
+        return [(book, topic) for book, topic in self._query("book, topic", books, pattern) if topic]
+
+    def _query(self, columns, books, pattern):
+        sql = f"SELECT {columns} FROM concepts WHERE filename GLOB ?"
+        params = [pattern]
+        if books is not None:
+            books = list(books)
+            sql += f" AND book IN ({', '.join('?' * len(books))})"
+            params.extend(books)
+        with self.lock:
+            return self.conn.execute(sql + " ORDER BY book, filename", params).fetchall()
+
+    def topic_files(self, book):
+        """[(filename, topic)] of one book"""
+        return [(filename, topic) for filename, topic in self._query("filename, topic", [book], CONCEPT_FILE_GLOB) if topic]
+
+    def get_concept(self, book, filename):
+        """Stored concept or None"""
+        with self.lock:
+            row = self.conn.execute("SELECT data FROM concepts WHERE book = ? AND filename = ?",
+                                    (book, filename)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def books(self):
+        """Books with at least one stored concept"""
+        with self.lock:
+            return {row[0] for row in self.conn.execute("SELECT DISTINCT book FROM concepts")}
+
+    def versions(self):
+        """book -> (concept count, last update time); changes whenever a book's concepts do"""
+        with self.lock:
+            rows = self.conn.execute("SELECT book, COUNT(*), MAX(updated) FROM concepts GROUP BY book").fetchall()
+        return {book: (count, updated) for book, count, updated in rows}
+
+    def put_fingerprint(self, book, digest, signature, filename):
+        """Content fingerprint (packed MinHash signature) of a processed candidate, see core.dedup"""
+        with self.lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO content_fingerprints VALUES (?, ?, ?, ?)",
+                              (book, digest, signature, filename))
+
+    def fingerprints(self, book):
+        """[(digest, signature, filename)] of one book"""
+        with self.lock:
+            return self.conn.execute("SELECT digest, signature, filename FROM content_fingerprints WHERE book = ?",
+                                     (book,)).fetchall()
+
+    def sync_progress(self, book, progress):
+        """Mirror a ProgressTracker state (checkpoint and session list) for one book"""
+        sessions = [
+            (book, seq, session.get("date"), session.get("concepts_extracted"),
+             session.get("page_range"), session.get("chapter"))
+            for seq, session in enumerate(progress.get("extraction_sessions", []), 1)
+        ]
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM sessions WHERE book = ?", (book,))
+            self.conn.executemany("INSERT INTO sessions VALUES (?, ?, ?, ?, ?, ?)", sessions)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO progress VALUES (?, ?, ?, ?, ?)",
+                (book, progress.get("last_processed_page", 0), progress.get("total_concepts_extracted", 0),
+                 progress.get("current_chapter", 1), time.time())
+            )
+
+    def progress(self, book):
+        """Progress dict in ProgressTracker's shape, or None if the book was never synced"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT last_processed_page, total_concepts_extracted, current_chapter FROM progress WHERE book = ?",
+                (book,)
+            ).fetchone()
+            if row is None:
+                return None
+            sessions = self.conn.execute(
+                "SELECT date, concepts_extracted, page_range, chapter FROM sessions WHERE book = ? ORDER BY seq",
+                (book,)
+            ).fetchall()
+
+        return {
+            "last_processed_page": row[0],
+            "total_concepts_extracted": row[1],
+            "extraction_sessions": [
+                {"date": date, "concepts_extracted": count, "page_range": page_range, "chapter": chapter}
+                for date, count, page_range, chapter in sessions
+            ],
+            "current_chapter": row[2]
+        }
+
+    def import_directory(self, book, book_dir):
+        """Backfill concept files the store lacks or holds an older copy of; returns how many were imported
+
+        A file is re-read when its size differs from the stored JSON or it was
+        modified after the row was written (e.g. rewritten outside the engine).
+        """
+        book_dir = Path(book_dir)
+        if not book_dir.is_dir():
+            return 0
+
+        with self.lock:
+            known = {filename: (updated, size) for filename, updated, size in self.conn.execute(
+                "SELECT filename, updated, length(CAST(data AS BLOB)) FROM concepts WHERE book = ?", (book,))}
+
+        imported = []
+        for entry in sorted(os.scandir(book_dir), key=lambda entry: entry.name):
+            if not is_concept_file(entry.name):
+                continue
+            try:
+                stat = entry.stat()
+                if entry.name in known:
+                    updated, size = known[entry.name]
+                    if stat.st_size == size and stat.st_mtime <= updated:
+                        continue
+                with open(entry.path, 'r', encoding='utf-8') as f:
+                    data = f.read()
+                concept = json.loads(data)
+            except (json.JSONDecodeError, UnicodeDecodeError, OSError) as e:
+                print(f"⚠️  Skipping unreadable concept file {entry.path}: {e}")
+                continue
+            topic = concept.get("topic") if isinstance(concept, dict) else None
+            imported.append((book, entry.name, topic, data, time.time()))
+
+        if imported:
+            with self.lock, self.conn:
+                self.conn.executemany("INSERT OR REPLACE INTO concepts VALUES (?, ?, ?, ?, ?)", imported)
+        return len(imported)
+
+    def export_json(self, output_root, books=None):
+        """Write the classic outputs/<book>/ layout (concept files + progress.json)"""
+        output_root = Path(output_root)
+        books = sorted(self.books()) if books is None else list(books)
+        written = 0
+
+        for book, filename, concept in self.concepts(books, pattern="*"):
+            book_dir = output_root / book
+            book_dir.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(book_dir / filename, json.dumps(concept, indent=2))
+            written += 1
+
+        for book in books:
+            progress = self.progress(book)
+            if progress is not None:
+                (output_root / book).mkdir(parents=True, exist_ok=True)
+                atomic_write_json(output_root / book / "progress.json", progress)
+
+        return written
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_concept_store(db_path=DEFAULT_STORE_FILE):
+    """Process-wide store for a database file (created on first use)"""
+    key = str(Path(db_path).resolve())
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = ConceptStore(db_path)
+        return _stores[key]
+
+
+def open_concept_store(db_path=DEFAULT_STORE_FILE):
+    """Store for readers, or None when no database exists yet (fall back to the JSON files)"""
+    if not Path(db_path).exists():
+        return None
+    try:
+        return get_concept_store(db_path)
+    except sqlite3.Error as e:
+        # stderr: readers include MCP servers speaking JSON-RPC on stdout
+        print(f"⚠️  Concept store {db_path} unusable ({e}), reading JSON files", file=sys.stderr)
+        return None
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Concept Table Core Module
+Extracted from the Content-Intelligent C Concept Extraction Engine
+
+The MCP servers keep their loaded concepts in a plain list and used to find
+one by ID by scanning it. ConceptTable is that list plus an id -> concept
+hash index kept in step with it, so lookups by ID are O(1) however many
+books are loaded. Existing code that iterates, slices or appends to
+`concepts` keeps working unchanged.
+
+reload() swaps in a freshly loaded list and only touches the index entries
+whose concepts were added, changed or removed. Concepts that carry their
+book and source_file are also indexed by file, so replace_file() can swap
+one rewritten or deleted file's concepts without scanning the table.
+"""
+
+
+class ConceptTable(list):
+    """Ordered concept list with an O(1) id -> concept index
+
+    The index follows append, extend, +=, remove, clear, reload and
+    replace_file (the only ways the servers modify their concept lists);
+    the first concept with an ID wins.
+    """
+
+    def __init__(self, concepts=()):
+        super().__init__()
+        self.by_id = {}
+        self.by_file = {}  # (book, source_file) -> that file's concepts, in file order
+        self.positions = {}  # id(concept) -> its position in the list
+        self.extend(concepts)
+
+    @staticmethod
+    def file_key(concept):
+        return (concept.get('book'), concept['source_file']) if 'source_file' in concept else None
+
+    def _register(self, concept, position):
+        self.positions[id(concept)] = position
+        self.by_id.setdefault(concept['id'], concept)
+        key = self.file_key(concept)
+        if key is not None:
+            self.by_file.setdefault(key, []).append(concept)
+
+    def _reindex(self):
+        self.by_file.clear()
+        self.positions.clear()
+        for position, concept in enumerate(self):
+            self.positions[id(concept)] = position
+            key = self.file_key(concept)
+            if key is not None:
+                self.by_file.setdefault(key, []).append(concept)
+
+    def append(self, concept):
+        super().append(concept)
+        self._register(concept, len(self) - 1)
+
+    def extend(self, concepts):
+        for concept in concepts:
+            self.append(concept)
+
+    def __iadd__(self, concepts):
+        self.extend(concepts)
+        return self
+
+    def clear(self):
+        super().clear()
+        self.by_id.clear()
+        self.by_file.clear()
+        self.positions.clear()
+
+    def remove(self, concept):
+        """Remove this concept object (identity, not equality)"""
+        position = self.positions.get(id(concept))
+        if position is None:
+            raise ValueError("concept not in table")
+        del self[position]
+        if self.by_id.get(concept['id']) is concept:
+            del self.by_id[concept['id']]
+        self._reindex()
+
+    def replace_file(self, book, source_file, concepts):
+        """Swap one file's concepts for a fresh load of it (empty if deleted); returns the replaced ones
+
+        Fresh concepts take the old ones' list positions and extra ones are
+        appended, so only a file that lost concepts costs a pass over the table.
+        """
+        replaced = self.by_file.pop((book, source_file), [])
+        slots = [self.positions.pop(id(concept)) for concept in replaced]
+        for concept in replaced:
+            if self.by_id.get(concept['id']) is concept:
+                del self.by_id[concept['id']]
+
+        for position, concept in zip(slots, concepts):
+            self[position] = concept
+            self._register(concept, position)
+        for concept in concepts[len(slots):]:
+            self.append(concept)
+
+        emptied = slots[len(concepts):]
+        if emptied:
+            for position in sorted(emptied, reverse=True):
+                del self[position]
+            self._reindex()
+        return replaced
+
+    def get(self, concept_id, default=None):
+        return self.by_id.get(concept_id, default)
+
+    def get_many(self, concept_ids):
+        """Concepts for several IDs in one pass, None where an ID is unknown"""
+        by_id = self.by_id
+        return [by_id.get(concept_id) for concept_id in concept_ids]
+
+    def reload(self, concepts):
+        """Replace the contents with a freshly loaded list; returns (changed IDs, removed IDs)
+
+        Concepts whose ID and data are unchanged keep their existing entry,
+        so callers holding derived state only need to redo the changed IDs.
+        """
+        fresh = {}
+        for concept in concepts:
+            fresh.setdefault(concept['id'], concept)
+
+        removed = [concept_id for concept_id in self.by_id if concept_id not in fresh]
+        for concept_id in removed:
+            del self.by_id[concept_id]
+
+        changed = []
+        for concept_id, concept in fresh.items():
+            if self.by_id.get(concept_id) != concept:
+                self.by_id[concept_id] = concept
+                changed.append(concept_id)
+
+        # List entries are the indexed objects, so unchanged concepts stay the same object
+        super().clear()
+        for concept in concepts:
+            is_first = fresh[concept['id']] is concept
+            super().append(self.by_id[concept['id']] if is_first else concept)
+        self._reindex()
+        return changed, removed
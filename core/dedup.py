@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Concept Deduplication Core Module
+Extracted from the Content-Intelligent C Concept Extraction Engine
+
+Keeps near-duplicate concepts out of the corpus at two points:
+
+- before the LLM call: each candidate's raw_content is MinHash-fingerprinted
+  (word shingles) and looked up through LSH banding in the book's index of
+  already-processed content; a near-duplicate is skipped, saving the call
+- after the LLM call: a concept whose normalised topic is near-identical to
+  one already saved for the book ("The main() Function in C" / "Main
+  Function") is folded into the existing concept instead of becoming a file;
+  topics are compared as ordered word sequences with their prepositions, so
+  "Pointers to Arrays" never folds into "Arrays of Pointers"
+
+Fingerprints are persisted in the concept store, so the index survives
+across sessions; without a store it only covers the current session.
+"""
+
+import re
+import array
+import difflib
+import random
+import sqlite3
+import hashlib
+
+NUM_PERMUTATIONS = 64
+BANDS = 16  # 16 bands x 4 rows: pairs above ~0.5 Jaccard become candidates
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+SHINGLE_SIZE = 5
+DEFAULT_CONTENT_THRESHOLD = 0.8
+DEFAULT_TOPIC_THRESHOLD = 0.8
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(1_000_003)  # fixed: stored signatures must stay comparable
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+                 for _ in range(NUM_PERMUTATIONS)]
+
+TOPIC_STOPWORDS = {"a", "an", "the", "in", "of", "and", "for", "to", "with", "using", "c", "on", "by"}
+TOPIC_ARTICLES = {"a", "an", "the"}
+TOPIC_LANGUAGE_SUFFIXES = [("in", "c"), ("using", "c"), ("with", "c"), ("c",)]
+
+
+def content_digest(raw_content):
+    return hashlib.sha1(raw_content.encode("utf-8")).hexdigest()
+
+
+def _shingle_hashes(text):
+    tokens = re.findall(r"\w+", text.lower())
+    if len(tokens) <= SHINGLE_SIZE:
+        shingles = {" ".join(tokens)}
+    else:
+        shingles = {" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+    return [int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+            for shingle in shingles]
+
+
+def minhash_signature(text):
+    """NUM_PERMUTATIONS minimum hashes over the text's word shingles"""
+    hashes = _shingle_hashes(text)
+    return [min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def estimated_similarity(signature, other):
+    """Fraction of matching minimums, an estimate of shingle-set Jaccard similarity"""
+    return sum(1 for x, y in zip(signature, other) if x == y) / len(signature)
+
+
+def pack_signature(signature):
+    return array.array("Q", signature).tobytes()
+
+
+def unpack_signature(blob):
+    return array.array("Q", blob).tolist()
+
+
+def topic_tokens(topic):
+    """Ordered words of a topic without articles or a language suffix ("The read() Function in C" -> ("read", "function"))
+
+    Prepositions stay, and so does word order: "Const Pointer" and "Pointer
+    to Const" are different concepts.
+    """
+    tokens = [token for token in re.findall(r"\w+", topic.lower()) if token not in TOPIC_ARTICLES]
+    if tokens[:1] == ["c"]:
+        tokens = tokens[1:]
+    for suffix in TOPIC_LANGUAGE_SUFFIXES:
+        if len(tokens) > len(suffix) and tuple(tokens[-len(suffix):]) == suffix:
+            tokens = tokens[:-len(suffix)]
+            break
+    return tuple(tokens)
+
+
+def topic_similarity(tokens, other):
+    """Share of the two word sequences that lines up in order (1.0 = same words, same order)"""
+    return difflib.SequenceMatcher(None, tokens, other, autojunk=False).ratio()
+
+
+class ConceptDeduplicator:
+    """Per-book near-duplicate index over raw content (MinHash/LSH) and topics"""
+
+    def __init__(self, book, store=None, content_threshold=DEFAULT_CONTENT_THRESHOLD,
+                 topic_threshold=DEFAULT_TOPIC_THRESHOLD):
+        self.book = book
+        self.store = store
+        self.content_threshold = content_threshold
+        self.topic_threshold = topic_threshold
+
+        self.signatures = {}  # content digest -> signature
+        self.sources = {}  # content digest -> concept filename it was saved as or folded into
+        self.buckets = {}  # (band, band values) -> set of digests
+        self.topics = {}  # topic tokens -> filename of the first concept with them
+
+        if store is not None:
+            for digest, blob, filename in store.fingerprints(book):
+                self._index(digest, unpack_signature(blob), filename)
+            for filename, topic in store.topic_files(book):
+                self.topics.setdefault(topic_tokens(topic), filename)
+
+    def _index(self, digest, signature, filename):
+        self.signatures[digest] = signature
+        self.sources[digest] = filename
+        for band in range(BANDS):
+            key = (band, tuple(signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]))
+            self.buckets.setdefault(key, set()).add(digest)
+
+    def find_duplicate_content(self, raw_content):
+        """(digest, similarity) of recorded content this candidate nearly repeats, else None
+
+        Only content that produced a saved or folded concept is indexed (see
+        record_content), so a candidate whose call fails or that goes to the
+        backlog never hides a later near-duplicate.
+        """
+        digest = content_digest(raw_content)
+        if digest in self.signatures:
+            return digest, 1.0
+
+        signature = minhash_signature(raw_content)
+        candidates = set()
+        for band in range(BANDS):
+            candidates |= self.buckets.get((band, tuple(signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND])), set())
+
+        best = None
+        for candidate in candidates:
+            similarity = estimated_similarity(signature, self.signatures[candidate])
+            if similarity >= self.content_threshold and (best is None or similarity > best[1]):
+                best = (candidate, similarity)
+        return best
+
+    def describe(self, digest):
+        """Human-readable origin of an indexed fingerprint"""
+        return self.sources[digest]
+
+    def record_content(self, raw_content, filename):
+        """Remember that this content produced (or was folded into) filename"""
+        digest = content_digest(raw_content)
+        if digest not in self.signatures:
+            self._index(digest, minhash_signature(raw_content), filename)
+        self.sources[digest] = filename
+        if self.store is not None:
+            try:
+                self.store.put_fingerprint(self.book, digest, pack_signature(self.signatures[digest]), filename)
+            except sqlite3.Error as e:
+                print(f"⚠️  Could not store content fingerprint: {e}")
+
+    def find_similar_topic(self, topic):
+        """Filename of a saved concept whose topic is near-identical, else None"""
+        tokens = topic_tokens(topic)
+        if not tokens:
+            return None
+        if tokens in self.topics:
+            return self.topics[tokens]
+
+        for other, filename in self.topics.items():
+            if other and topic_similarity(tokens, other) >= self.topic_threshold:
+                return filename
+        return None
+
+    def record_topic(self, topic, filename):
+        self.topics.setdefault(topic_tokens(topic), filename)
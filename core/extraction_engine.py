@@ -0,0 +1,648 @@
+#!/usr/bin/env python3
+"""
+Extraction Engine Core Module
+Extracted from the Content-Intelligent C Concept Extraction Engine
+
+Config-driven orchestrator that replaces the per-book extract_*.py engines.
+Every book is described by an entry in config/books_config.json.
+"""
+
+import os
+import sys
+import json
+import re
+import sqlite3
+import itertools
+import importlib
+from datetime import datetime
+from pathlib import Path
+from dotenv import load_dotenv
+
+from core.progress_tracker import ProgressTracker
+from core.concept_backlog import ConceptBacklog, MAX_ATTEMPTS
+from core.concept_store import ConceptStore, STORE_FILENAME
+from core.book_lock import BookLock, BookLockedError, BOOK_LOCK_FILENAME, LOCKED_EXIT_CODE
+from core.dedup import ConceptDeduplicator, DEFAULT_CONTENT_THRESHOLD, DEFAULT_TOPIC_THRESHOLD
+from core.atomic_file import atomic_write_text
+from core.pdf_extractor import PDFStructureExtractor
+from core.concept_detector import ConceptBoundaryDetector
+from core.metrics import get_metrics, set_metrics_book, format_stage_times
+from processors.batching import estimate_tokens, DEFAULT_MAX_BATCH_SIZE
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+BOOKS_CONFIG_FILE = PROJECT_ROOT / "config" / "books_config.json"
+ENV_CONFIG_FILE = PROJECT_ROOT / "config" / "config.env"
+PROVIDERS_CONFIG_FILE = PROJECT_ROOT / "config" / "providers_config.json"
+DEFAULT_RESPONSE_CACHE_FILE = PROJECT_ROOT / "cache" / "llm_responses.sqlite3"
+
+# processor name -> (module, class, API key variable, display name)
+PROCESSORS = {
+    "gemini": ("processors.gemini_processor", "GeminiAtomicProcessor", "GEMINI_API_KEY", "Gemini"),
+    "grok": ("processors.grok_processor", "GrokAtomicProcessor", "GROK_API_KEY", "Grok"),
+    "gpt4_nano": ("processors.gpt4_nano_processor", "GPT4NanoAtomicProcessor", "OPENAI_API_KEY", "GPT-4.1 Nano")
+}
+
+_response_cache = None
+
+
+def load_books_config(config_file=BOOKS_CONFIG_FILE):
+    """Load the per-book extraction configuration"""
+    with open(config_file, 'r') as f:
+        return json.load(f)
+
+
+def load_providers_config(config_file=PROVIDERS_CONFIG_FILE):
+    """Load per-provider runtime limits (empty when the file is absent)"""
+    if not Path(config_file).exists():
+        return {}
+    with open(config_file, 'r') as f:
+        return json.load(f)
+
+
+def resolve_project_path(path):
+    """Resolve config paths relative to the project root"""
+    path = Path(path)
+    return path if path.is_absolute() else PROJECT_ROOT / path
+
+
+def get_api_key(processor_name, config_file=ENV_CONFIG_FILE):
+    """Load the API key for a processor from config.env / the environment"""
+    load_dotenv(config_file)
+    key_variable = PROCESSORS[processor_name][2]
+
+    api_key = os.getenv(key_variable)
+    if not api_key:
+        print(f"❌ {key_variable} not found in {config_file}")
+        print(f"📝 Please ensure config.env contains: {key_variable}=your_actual_api_key")
+        raise ValueError(f"Missing {key_variable}")
+
+    print(f"✅ {PROCESSORS[processor_name][3]} API key loaded successfully (length: {len(api_key)} chars)")
+    return api_key
+
+
+def _env_flag(name):
+    return os.getenv(name, "").strip().lower() in ("1", "true", "yes")
+
+
+def get_base_url_override(config_file=ENV_CONFIG_FILE):
+    """LLM_BASE_URL from config.env / the environment (None when unset)"""
+    load_dotenv(config_file)
+    return os.getenv("LLM_BASE_URL", "").strip().rstrip("/") or None
+
+
+def get_response_cache(config_file=ENV_CONFIG_FILE):
+    """Return the process-wide LLM response cache (None when disabled)
+
+    Configured through config.env / the environment:
+    LLM_CACHE_PATH, LLM_CACHE_MAX_MB, LLM_CACHE_BYPASS, LLM_CACHE_REFRESH.
+    """
+    global _response_cache
+    if _response_cache is None:
+        load_dotenv(config_file)
+        if os.getenv("LLM_CACHE_PATH", "").strip().lower() in ("off", "none"):
+            return None
+
+        from processors.response_cache import ResponseCache
+        cache_path = resolve_project_path(os.getenv("LLM_CACHE_PATH") or DEFAULT_RESPONSE_CACHE_FILE)
+        base_url = get_base_url_override(config_file)
+        if base_url:
+            # Never mix replies from an overridden endpoint into the real cache
+            endpoint = re.sub(r'[^A-Za-z0-9]+', '_', base_url.split("://", 1)[-1]).strip("_")
+            cache_path = cache_path.with_name(f"{cache_path.stem}.{endpoint}{cache_path.suffix}")
+
+        _response_cache = ResponseCache(
+            cache_path,
+            max_bytes=int(float(os.getenv("LLM_CACHE_MAX_MB", "256")) * 1024 * 1024),
+            bypass=_env_flag("LLM_CACHE_BYPASS"),
+            refresh=_env_flag("LLM_CACHE_REFRESH")
+        )
+        mode = "bypass" if _response_cache.bypass else "refresh" if _response_cache.refresh else "read/write"
+        print(f"🗄️  LLM response cache: {_response_cache.db_path} ({mode})")
+    return _response_cache
+
+
+def create_processor(processor_name, config_file=ENV_CONFIG_FILE):
+    """Import and initialise a processor by its books_config.json name
+
+    Modules are imported lazily, so a run only pays for the SDKs it uses.
+    Constructor options (pool size, connection probing, streaming, ...) come from the
+    provider's "processor_options" in config/providers_config.json;
+    LLM_BASE_URL points every processor at another endpoint (mock server).
+    """
+    if processor_name not in PROCESSORS:
+        raise ValueError(f"Unknown processor '{processor_name}'. Available: {', '.join(PROCESSORS)}")
+
+    module_name, class_name, _, _ = PROCESSORS[processor_name]
+    processor_class = getattr(importlib.import_module(module_name), class_name)
+    options = dict(load_providers_config().get(processor_name, {}).get("processor_options", {}))
+    base_url = get_base_url_override(config_file)
+    if base_url:
+        print(f"🧪 {PROCESSORS[processor_name][3]} requests go to {base_url} (LLM_BASE_URL)")
+        options["base_url"] = base_url
+    return processor_class(
+        get_api_key(processor_name, config_file), response_cache=get_response_cache(config_file), **options
+    )
+
+
+def create_book_processor(book_config, config_file=ENV_CONFIG_FILE, shared_processors=None):
+    """Processor for one book: its provider, or a RoutingProcessor when
+    fallback_processors are configured (hedged requests + failover)
+
+    shared_processors is an optional {name: instance} dict reused across books.
+    """
+    shared_processors = shared_processors if shared_processors is not None else {}
+    names = [book_config["processor"], *book_config.get("fallback_processors", [])]
+
+    for name in names:
+        if name not in shared_processors:
+            try:
+                shared_processors[name] = create_processor(name, config_file)
+            except Exception as e:
+                if len(names) == 1:
+                    raise
+                print(f"⚠️  {name} processor unavailable: {e}")
+                shared_processors[name] = None
+
+    if len(names) == 1:
+        return shared_processors[names[0]]
+
+    from processors.routing_processor import RoutingProcessor
+    return RoutingProcessor(names[0], shared_processors, names[1:])
+
+
+class ExtractionEngine:
+    """Main orchestrator for config-driven concept extraction of one book"""
+
+    def __init__(self, book_key, book_config, config_file=ENV_CONFIG_FILE, processor=None):
+        self.book_key = book_key
+        self.book_config = book_config
+        self.display_name = book_config.get("display_name", book_key)
+        self.source_title = book_config["source_title"]
+        self.file_prefix = book_config.get("file_prefix", "")
+        self.max_concepts = book_config.get("max_concepts_per_day", 4)
+        self.page_window = book_config.get("page_window", 15)
+        self.extract_workers = book_config.get("extract_workers")
+        self.dedup_enabled = book_config.get("dedup", True)
+        self.max_attempts = book_config.get("max_concept_attempts", MAX_ATTEMPTS)
+
+        # Batch mode packs several candidates into one LLM request; books opt in with "batch": true,
+        # the provider's batch_token_budget (0 = off) and max_batch_size cap each request
+        self.batch_opt_in = book_config.get("batch", False)
+        provider_config = load_providers_config().get(book_config["processor"], {})
+        self.batch_token_budget = provider_config.get("batch_token_budget", 0)
+        self.max_batch_size = provider_config.get("max_batch_size", DEFAULT_MAX_BATCH_SIZE)
+
+        self.pdf_path = str(resolve_project_path(book_config["pdf_path"]))
+        self.output_dir = resolve_project_path(book_config["output_dir"])
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+
+        # Initialize components
+        self.progress_tracker = ProgressTracker(str(self.output_dir / "progress.json"))
+        self.backlog = ConceptBacklog(str(self.output_dir / "backlog.json"))
+        self.store = self._open_store()
+        self.dedup = None
+        self.dedup_counts = {"skipped": 0, "folded": 0}
+        self.processor = processor or create_book_processor(book_config, config_file)
+
+        print(f"🏛️  {self.display_name} Archaeological Extraction Engine Initialized")
+        print(f"📚 Source: {self.pdf_path}")
+        print(f"📁 Output: {self.output_dir}")
+        print(f"📊 Previous progress: {self.progress_tracker.progress['total_concepts_extracted']} concepts extracted")
+
+    def run_extraction_session(self, max_concepts=None, cancel_event=None):
+        """Run one extraction session with daily summary generation
+
+        cancel_event (a threading.Event) lets a supervisor stop the session
+        between concepts; unprocessed candidates go back to the backlog and
+        progress is saved as usual.
+
+        The session holds the book's lock; BookLockedError is raised if
+        another process or thread is already extracting this book.
+        """
+        with BookLock(self.output_dir / BOOK_LOCK_FILENAME, self.book_key):
+            # A run that held the lock before us may have moved progress and backlog on
+            self.progress_tracker = ProgressTracker(self.progress_tracker.progress_file)
+            self.backlog = ConceptBacklog(self.backlog.backlog_file)
+            self.dedup = self._create_deduplicator()
+            return self._run_locked_session(max_concepts, cancel_event)
+
+    def _run_locked_session(self, max_concepts, cancel_event):
+        max_concepts = max_concepts or self.max_concepts
+        session_start = datetime.now()
+        set_metrics_book(self.book_key)
+        print(f"\n🔍 Starting {self.display_name} extraction session...")
+
+        start_page = self.progress_tracker.progress["last_processed_page"]
+        extracted_concepts = []  # Track what we extracted for summary
+        self.dedup_counts = {"skipped": 0, "folded": 0}
+
+        # Concepts detected in earlier sessions but not yet processed go first
+        backlog_concepts = self.backlog.pop(max_concepts)
+        if backlog_concepts:
+            print(f"📥 Draining {len(backlog_concepts)} backlog concepts ({len(self.backlog)} still queued)")
+
+        with PDFStructureExtractor(self.pdf_path, cache_dir=self.output_dir / ".pagecache") as extractor:
+            detector = ConceptBoundaryDetector()
+            concepts_detected = 0
+            last_page = start_page
+            stages = []
+
+            if len(backlog_concepts) < max_concepts:
+                # Extract structured content
+                print(f"📖 Extracting {self.display_name} content from page {start_page + 1}...")
+                content_blocks = extractor.iter_structured_content(
+                    start_page, max_pages=self.page_window, workers=self.extract_workers
+                )
+
+                # Detect atomic concept boundaries as pages stream in
+                new_concepts = detector.iter_atomic_concepts(content_blocks)
+                stages = [new_concepts, content_blocks]
+            else:
+                new_concepts = iter(())
+
+            # Process each concept as soon as it is available (or its batch is full)
+            pending = []
+            processed_slots = 0  # concepts of this session sent to the LLM
+            for i, concept in enumerate(itertools.chain(backlog_concepts, new_concepts)):
+                if i >= len(backlog_concepts):
+                    concepts_detected += 1
+                    last_page = max(last_page, concept["blocks"][-1]["page"])
+                    # Pages re-read after a run killed between the backlog save and the checkpoint
+                    if concept in self.backlog:
+                        continue
+
+                if cancel_event is not None and cancel_event.is_set():
+                    print(f"🛑 Cancellation requested, queueing remaining {self.display_name} concepts")
+                    if i < len(backlog_concepts):
+                        remaining = backlog_concepts[i:]
+                    else:
+                        # The checkpoint moves past the window, so keep the rest of its concepts too
+                        remaining = [concept]
+                        for queued in new_concepts:
+                            concepts_detected += 1
+                            last_page = max(last_page, queued["blocks"][-1]["page"])
+                            if queued not in self.backlog:
+                                remaining.append(queued)
+                    self.backlog.requeue(pending + remaining)
+                    pending = []
+                    break
+
+                # Near-duplicates of content already processed never reach the LLM
+                if self.dedup is not None:
+                    duplicate = self.dedup.find_duplicate_content(concept["raw_content"])
+                    if duplicate:
+                        self.dedup_counts["skipped"] += 1
+                        print(f"♻️  Skipping near-duplicate {self.display_name} candidate "
+                              f"({duplicate[1]:.0%} similar to {self.dedup.describe(duplicate[0])})")
+                        continue
+
+                # Queue the rest of the window for later sessions instead of dropping it
+                if processed_slots >= max_concepts:
+                    self.backlog.push(concept)
+                    continue
+                processed_slots += 1
+
+                print(f"\n⚡ Processing {self.display_name} concept {processed_slots}/{max_concepts}...")
+
+                # Update metadata for this book
+                concept["source_title"] = self.source_title
+                pending.append(concept)
+
+                if not self._batching_enabled() or self._batch_full(pending, processed_slots == max_concepts):
+                    self._process_pending(pending, extracted_concepts)
+                    pending = []
+
+            if pending:
+                self._process_pending(pending, extracted_concepts)
+
+            # Record the stage spans now, also when the loop stopped early
+            for stage in stages:
+                stage.close()
+
+            concepts_extracted = len(extracted_concepts)
+            self.backlog.save_backlog()
+            cache_stats = extractor.cache.stats()
+            print(f"💾 Page cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+
+            if not backlog_concepts and not concepts_detected:
+                print(f"🏁 No more content found. {self.display_name} extraction complete!")
+                self._generate_completion_summary(session_start)
+                return False
+
+            print(f"🧠 Detected {concepts_detected} potential {self.display_name} atomic concepts")
+            if any(self.dedup_counts.values()):
+                print(f"♻️  Near-duplicates: {self.dedup_counts['skipped']} skipped before the LLM, "
+                      f"{self.dedup_counts['folded']} folded into existing concepts")
+            print(f"📥 Backlog: {len(self.backlog)} concepts queued for later sessions")
+
+        # Update progress
+        page_range = f"{start_page + 1}-{last_page}" if concepts_detected else "backlog only"
+        session_info = {"page_range": page_range, "chapter": "Auto-detected"}
+
+        self.progress_tracker.update_progress(
+            last_page,
+            concepts_extracted,
+            session_info
+        )
+        self._sync_store_progress()
+
+        # Generate daily summary
+        self._generate_daily_summary(session_start, extracted_concepts, session_info)
+
+        print(f"\n📊 {self.display_name} session complete: {concepts_extracted} atomic concepts extracted")
+        print(f"⏱️  Stage time: {format_stage_times(get_metrics().book_rollup(self.book_key))}")
+        print(f"📈 Total {self.display_name} progress: {self.progress_tracker.progress['total_concepts_extracted']} concepts")
+
+        return concepts_extracted > 0
+
+    def _batching_enabled(self):
+        return self.batch_opt_in and bool(self.batch_token_budget) and hasattr(self.processor, "process_concepts")
+
+    def _batch_full(self, pending, last_slot):
+        """Flush once the batch is at its size/token limit or no more slots remain"""
+        pending_tokens = sum(estimate_tokens(concept["raw_content"]) for concept in pending)
+        return last_slot or len(pending) >= self.max_batch_size or pending_tokens >= self.batch_token_budget
+
+    def _process_pending(self, pending, extracted_concepts):
+        """Generate atomic training data for queued candidates and save the results"""
+        with get_metrics().span("processing", items=len(pending),
+                                bytes=sum(len(concept["raw_content"]) for concept in pending)):
+            if len(pending) > 1:
+                processed_concepts = self.processor.process_concepts(pending, self.batch_token_budget, self.max_batch_size)
+            else:
+                processed_concepts = [self.processor.process_concept(pending[0])]
+
+        for candidate, processed_concept in zip(pending, processed_concepts):
+            if processed_concept:
+                # Update source in metadata
+                processed_concept["extraction_metadata"]["source"] = self.source_title
+
+                topic = processed_concept.get('topic', 'Unknown')
+                existing = self.dedup.find_similar_topic(topic) if self.dedup is not None else None
+                if existing and self._fold_concept(existing, processed_concept):
+                    self.dedup.record_content(candidate["raw_content"], existing)
+                    self.dedup_counts["folded"] += 1
+                    print(f"🔁 Folded {self.display_name} concept '{topic}' into {existing}")
+                    continue
+
+                # Save concept
+                filename = self._save_concept(processed_concept, len(extracted_concepts))
+                if self.dedup is not None:
+                    self.dedup.record_content(candidate["raw_content"], filename)
+                    self.dedup.record_topic(topic, filename)
+
+                # Track for summary
+                extracted_concepts.append({
+                    "topic": processed_concept.get('topic', 'Unknown'),
+                    "explanation": processed_concept.get('explanation', 'No explanation available'),
+                    "filename": filename,
+                    "page_range": processed_concept["extraction_metadata"]["page_range"],
+                    "cache_hit": processed_concept["extraction_metadata"].get("response_cache_hit", False)
+                })
+
+                print(f"✅ Saved {self.display_name} concept: {processed_concept.get('topic', 'Unknown')}")
+            elif self.backlog.retry(candidate, self.max_attempts):
+                print(f"❌ Failed to process {self.display_name} concept, queued for retry "
+                      f"(attempt {candidate['attempts']}/{self.max_attempts})")
+            else:
+                print(f"❌ Failed to process {self.display_name} concept "
+                      f"(pages {candidate['page_range']}), giving up after {candidate['attempts']} attempts")
+
+    def _create_deduplicator(self):
+        """Near-duplicate index for this book, loaded from the concept store"""
+        if not self.dedup_enabled:
+            return None
+        try:
+            return ConceptDeduplicator(
+                self.book_key, self.store,
+                content_threshold=self.book_config.get("dedup_content_threshold", DEFAULT_CONTENT_THRESHOLD),
+                topic_threshold=self.book_config.get("dedup_topic_threshold", DEFAULT_TOPIC_THRESHOLD)
+            )
+        except sqlite3.Error as e:
+            print(f"⚠️  Could not load dedup fingerprints ({e}), deduplicating within this session only")
+            return ConceptDeduplicator(self.book_key)
+
+    def _fold_concept(self, filename, concept):
+        """Merge a near-identical concept into the saved one; False if that file is gone
+
+        The folded explanation is appended when it says something new, and its
+        code goes to additional_examples, so the generated text is kept.
+        """
+        filepath = self.output_dir / filename
+        try:
+            with open(filepath, 'r') as f:
+                existing = json.load(f)
+        except (OSError, ValueError):
+            return False
+
+        page_range = concept["extraction_metadata"]["page_range"]
+        explanation = concept.get("explanation")
+        if explanation and explanation not in existing.get("explanation", ""):
+            existing["explanation"] = f"{existing['explanation']}\n\n{explanation}" if existing.get("explanation") else explanation
+
+        code_example = concept.get("code_example")
+        examples = existing.get("additional_examples", [])
+        if code_example and code_example != existing.get("code_example") and all(
+                code_example != example.get("code_example") for example in examples):
+            existing["additional_examples"] = examples + [{
+                "code_example": code_example,
+                "example_explanation": concept.get("example_explanation", ""),
+                "page_range": page_range
+            }]
+
+        folded = existing.setdefault("extraction_metadata", {}).setdefault("folded_page_ranges", [])
+        folded.append(page_range)
+
+        with get_metrics().span("save") as span:
+            data = json.dumps(existing, indent=2)
+            atomic_write_text(filepath, data)
+            self._store_concept(filename, existing, data)
+            span["bytes"] = len(data)
+        return True
+
+    def _open_store(self):
+        """Concept store shared by all books (next to their directories), caught up with files on disk"""
+        try:
+            store = ConceptStore(self.output_dir.parent / STORE_FILENAME)
+            imported = store.import_directory(self.book_key, self.output_dir)
+            if imported:
+                print(f"🗄️  Imported {imported} {self.display_name} concept files into {store.db_path.name}")
+            store.sync_progress(self.book_key, self.progress_tracker.progress)
+            return store
+        except sqlite3.Error as e:
+            print(f"⚠️  Concept store unavailable ({e}), writing JSON files only")
+            return None
+
+    def _sync_store_progress(self):
+        if self.store is None:
+            return
+        try:
+            self.store.sync_progress(self.book_key, self.progress_tracker.progress)
+        except sqlite3.Error as e:
+            print(f"⚠️  Could not mirror progress to the concept store: {e}")
+
+    def _save_concept(self, concept, concept_number):
+        """Save atomic concept to the concept store and its JSON file"""
+        filename = f"{self.file_prefix}concept_{self.progress_tracker.progress['total_concepts_extracted'] + concept_number + 1:03d}_{self._safe_filename(concept.get('topic', 'unknown'))}.json"
+
+        filepath = self.output_dir / filename
+
+        with get_metrics().span("save") as span:
+            data = json.dumps(concept, indent=2)
+            atomic_write_text(filepath, data)
+            self._store_concept(filename, concept, data)
+            span["bytes"] = len(data)
+
+        return filename
+
+    def _store_concept(self, filename, concept, data):
+        """Write the concept store row; callers do this after the JSON file is in place"""
+        # A crash in between leaves a file the store lacks, which the next engine start imports;
+        # readers that reload on file events read the changed files themselves in the meantime
+        if self.store is None:
+            return
+        try:
+            self.store.put_concept(self.book_key, filename, concept, data)
+        except sqlite3.Error as e:
+            # The JSON file is on disk; the next engine start imports it
+            print(f"⚠️  Could not store concept in {STORE_FILENAME}: {e}")
+
+    def _generate_daily_summary(self, session_start, extracted_concepts, session_info):
+        """Generate daily summary report"""
+        session_date = session_start.strftime("%Y-%m-%d")
+        summary_filename = f"{self.file_prefix}daily_summary_{session_date}.md"
+        summary_path = self.output_dir / summary_filename
+
+        duration = datetime.now() - session_start
+
+        summary_content = f"""# Daily {self.display_name} Extraction Summary
+**Date:** {session_start.strftime("%Y-%m-%d %H:%M:%S")}
+**Duration:** {duration.total_seconds():.1f} seconds
+**Page Range:** {session_info['page_range']}
+**Book:** {self.source_title}
+
+## {self.display_name} Concepts Extracted Today: {len(extracted_concepts)}
+
+"""
+
+        for i, concept in enumerate(extracted_concepts, 1):
+            summary_content += f"""### {i}. {concept['topic']}
+**What it's about:** {concept['explanation'][:200]}{'...' if len(concept['explanation']) > 200 else ''}
+
+- **File:** `{concept['filename']}`
+- **Pages:** {concept['page_range']}
+
+"""
+
+        total_concepts = self.progress_tracker.progress['total_concepts_extracted']
+        summary_content += f"""## {self.display_name} Progress Summary
+- **Total {self.display_name} Concepts Extracted:** {total_concepts}
+- **Extraction Sessions Completed:** {len(self.progress_tracker.progress['extraction_sessions'])}
+- **Last Processed Page:** {self.progress_tracker.progress['last_processed_page']}
+- **Backlog Queued Concepts:** {len(self.backlog)}
+"""
+
+        if any(self.dedup_counts.values()):
+            summary_content += f"""- **Near-Duplicates:** {self.dedup_counts['skipped']} candidates skipped before the LLM, {self.dedup_counts['folded']} concepts folded into existing ones
+"""
+
+        if getattr(self.processor, "response_cache", None) is not None:
+            cache_hits = sum(1 for concept in extracted_concepts if concept["cache_hit"])
+            hit_rate = cache_hits / len(extracted_concepts) if extracted_concepts else 0.0
+            summary_content += f"""- **LLM Response Cache:** {cache_hits}/{len(extracted_concepts)} responses replayed without an API call ({hit_rate:.0%} hit rate)
+"""
+
+        summary_content += f"""
+## Next Session
+Run the {self.display_name} extraction again tomorrow to continue processing.
+
+---
+*Generated by {self.display_name} Archaeological Extraction Engine*
+"""
+
+        with open(summary_path, 'w') as f:
+            f.write(summary_content)
+
+        print(f"📋 {self.display_name} daily summary saved: {summary_filename}")
+
+    def _generate_completion_summary(self, session_start):
+        """Generate final completion summary"""
+        completion_date = session_start.strftime("%Y-%m-%d")
+        summary_filename = f"{self.file_prefix}extraction_complete_{completion_date}.md"
+        summary_path = self.output_dir / summary_filename
+
+        total_concepts = self.progress_tracker.progress['total_concepts_extracted']
+        total_sessions = len(self.progress_tracker.progress['extraction_sessions'])
+
+        summary_content = f"""# 🎉 {self.display_name} Book Extraction Complete!
+
+**Completion Date:** {session_start.strftime("%Y-%m-%d %H:%M:%S")}
+
+## Final Statistics
+- **Total {self.display_name} Atomic Concepts Extracted:** {total_concepts}
+- **Total Extraction Sessions:** {total_sessions}
+- **Total Pages Processed:** {self.progress_tracker.progress['last_processed_page']}
+
+## All Extracted {self.display_name} Concepts
+Your complete {self.display_name} training dataset is now ready in the `{self.book_config['output_dir']}/` directory.
+
+Each concept follows the atomic structure:
+- ✅ Concept Definition
+- ✅ Syntax Pattern
+- ✅ Compilable Example
+- ✅ Example Explanation
+
+---
+*Archaeological excavation of "{self.source_title}" complete!*
+"""
+
+        with open(summary_path, 'w') as f:
+            f.write(summary_content)
+
+        print(f"🏆 {self.display_name} completion summary saved: {summary_filename}")
+
+    def _safe_filename(self, topic):
+        """Create safe filename from topic"""
+        safe = re.sub(r'[^\w\s-]', '', topic)
+        safe = re.sub(r'[-\s]+', '_', safe)
+        return safe.lower()[:30]
+
+
+def run_book(book_key, config_file=BOOKS_CONFIG_FILE):
+    """Run one extraction session for a single configured book
+
+    Exits with LOCKED_EXIT_CODE when another run is already extracting it.
+    """
+    books = load_books_config(config_file)
+    if book_key not in books:
+        print(f"❌ Unknown book '{book_key}'. Configured books: {', '.join(books)}")
+        return
+
+    book_config = books[book_key]
+    display_name = book_config.get("display_name", book_key)
+    pdf_path = resolve_project_path(book_config["pdf_path"])
+
+    # Verify files exist
+    if not pdf_path.exists():
+        print(f"❌ {display_name} PDF not found: {pdf_path}")
+        return
+
+    if not ENV_CONFIG_FILE.exists():
+        key_variable = PROCESSORS[book_config["processor"]][2]
+        print(f"❌ Config file not found. Please create config/config.env with {key_variable}=your_key")
+        return
+
+    # Initialize and run extraction engine
+    engine = ExtractionEngine(book_key, book_config)
+
+    # Run extraction session
+    try:
+        continue_extraction = engine.run_extraction_session()
+    except BookLockedError as e:
+        print(f"🔒 Skipping: {e}")
+        sys.exit(LOCKED_EXIT_CODE)
+
+    if not continue_extraction:
+        print(f"\n🎉 {display_name} book extraction complete! All atomic concepts have been archaeologically excavated.")
+    else:
+        print(f"\n⏳ Run {display_name} extraction again tomorrow to continue...")
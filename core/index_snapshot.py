@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Index Snapshot Core Module
+Extracted from the Content-Intelligent C Concept Extraction Engine
+
+On-disk snapshot of an MCP server's in-memory index (concepts, id table,
+search index), so a server spawned on demand answers its first request
+without re-reading every concept file.
+
+The file starts with a fingerprint of everything the index was built from:
+the concept store's per-book versions, (name, mtime, size) of every concept
+JSON file, and a hash of the code that shapes the index. Start-up
+recomputes the fingerprint (stat calls and one small query, no JSON
+parsing) and compares it with the memory-mapped header, so a stale snapshot
+is rejected without reading its body. The body is plain JSON (no pickle: a
+forged snapshot can at worst hold wrong data, never run code) and the
+snapshot lives under cache/, away from the shared outputs/ tree.
+"""
+
+import os
+import json
+import mmap
+import struct
+import hashlib
+from pathlib import Path
+
+from core.atomic_file import atomic_write_bytes
+from core.concept_store import open_concept_store, is_concept_file, STORE_FILENAME
+
+SNAPSHOT_MAGIC = b"CIDX2\n"
+_HEADER = struct.Struct(">I")  # length of the fingerprint that follows the magic
+
+
+def source_fingerprint(outputs_dir, books, code_files=()):
+    """Hex digest that changes whenever the concepts of `books` or the given code change"""
+    outputs_dir = Path(outputs_dir)
+    digest = hashlib.sha1()
+
+    for code_file in code_files:
+        with open(code_file, 'rb') as f:
+            digest.update(f.read())
+
+    store = open_concept_store(outputs_dir / STORE_FILENAME)
+    if store is not None:
+        versions = store.versions()
+        digest.update(repr(sorted((book, versions[book]) for book in books if book in versions)).encode())
+
+    for book in sorted(books):
+        try:
+            entries = sorted((entry.name, entry.stat().st_mtime_ns, entry.stat().st_size)
+                             for entry in os.scandir(outputs_dir / book) if is_concept_file(entry.name))
+        except FileNotFoundError:
+            entries = None
+        digest.update(repr((book, entries)).encode())
+
+    return digest.hexdigest()
+
+
+class IndexSnapshot:
+    """Memory-mapped JSON snapshot of an index, valid for one source fingerprint"""
+
+    def __init__(self, path, fingerprint):
+        self.path = Path(path)
+        self.fingerprint = fingerprint.encode("ascii")
+
+    def load(self):
+        """The saved index state, or None if the snapshot is missing, stale or unreadable"""
+        try:
+            with open(self.path, 'rb') as f:
+                snapshot = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return None  # ValueError: empty file
+
+        try:
+            offset = len(SNAPSHOT_MAGIC) + _HEADER.size
+            if snapshot[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC or len(snapshot) < offset:
+                return None
+            (length,) = _HEADER.unpack(snapshot[len(SNAPSHOT_MAGIC):offset])
+            if snapshot[offset:offset + length] != self.fingerprint:
+                return None
+            # Slicing copies, so no view into the map outlives close()
+            payload = snapshot[offset + length:]
+        finally:
+            snapshot.close()
+
+        try:
+            return json.loads(payload)
+        except (ValueError, UnicodeDecodeError):
+            return None
+
+    def save(self, state):
+        """Atomically replace the snapshot with the JSON-serialisable `state` under the current fingerprint"""
+        header = SNAPSHOT_MAGIC + _HEADER.pack(len(self.fingerprint)) + self.fingerprint
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(self.path, header + json.dumps(state, separators=(",", ":")).encode("utf-8"))
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Metrics Core Module
+Extracted from the Content-Intelligent C Concept Extraction Engine
+
+Structured per-stage instrumentation. Spans (stage name, duration, bytes,
+prompt/completion tokens and estimated cost per provider) are appended as
+JSON lines to logs/metrics/metrics_<date>.jsonl and rolled up in memory, so
+a run can tell whether a slow night was PDF parsing, the LLM or disk.
+"""
+
+import os
+import json
+import time
+import threading
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+METRICS_DIR = PROJECT_ROOT / "logs" / "metrics"
+PROVIDERS_CONFIG_FILE = PROJECT_ROOT / "config" / "providers_config.json"
+CHARS_PER_TOKEN = 4  # same rough estimate as processors.batching
+
+AGGREGATE_FIELDS = ("count", "seconds", "items", "pages", "bytes", "prompt_tokens", "completion_tokens", "cost", "errors",
+                    "tokens_estimated")
+SUMMED_ATTRIBUTES = ("items", "pages", "bytes", "prompt_tokens", "completion_tokens", "cost")
+
+# Book the current thread / task is working on; tags every span it records
+_current_book = contextvars.ContextVar("metrics_book", default=None)
+
+
+def set_metrics_book(book_key):
+    """Attribute spans recorded in this context to a book"""
+    return _current_book.set(book_key)
+
+
+def load_pricing(config_file=PROVIDERS_CONFIG_FILE):
+    """provider -> {"input_per_million_tokens", "output_per_million_tokens"}"""
+    if not Path(config_file).exists():
+        return {}
+    with open(config_file, 'r') as f:
+        return {name: config["pricing"] for name, config in json.load(f).items() if "pricing" in config}
+
+
+def token_usage(prompt, completion, prompt_tokens=None, completion_tokens=None):
+    """Span attributes for one LLM exchange; estimates tokens the provider did not report"""
+    usage = {
+        "bytes": len(prompt.encode("utf-8")) + len(completion.encode("utf-8")),
+        "prompt_tokens": prompt_tokens if prompt_tokens is not None else len(prompt) // CHARS_PER_TOKEN + 1,
+        "completion_tokens": completion_tokens if completion_tokens is not None else len(completion) // CHARS_PER_TOKEN + 1
+    }
+    if prompt_tokens is None or completion_tokens is None:
+        usage["tokens_estimated"] = True
+    return usage
+
+
+def _new_aggregate():
+    return dict.fromkeys(AGGREGATE_FIELDS, 0)
+
+
+class MetricsRecorder:
+    """Thread-safe JSONL span writer with an in-memory roll-up"""
+
+    def __init__(self, metrics_dir=METRICS_DIR, pricing=None):
+        self.metrics_dir = Path(metrics_dir)
+        self.pricing = load_pricing() if pricing is None else pricing
+        self.run_id = f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{os.getpid()}"
+        self.lock = threading.Lock()
+        self.books = {}  # book -> span name -> aggregate
+        self.providers = {}  # provider -> aggregate of its LLM calls
+        self._file = None
+
+    def estimate_cost(self, provider, prompt_tokens, completion_tokens):
+        prices = self.pricing.get(provider)
+        if not prices:
+            return None
+        return (prompt_tokens * prices.get("input_per_million_tokens", 0)
+                + completion_tokens * prices.get("output_per_million_tokens", 0)) / 1_000_000
+
+    def record(self, name, duration, **attrs):
+        """Append one span and fold it into the roll-up"""
+        book = attrs.pop("book", None) or _current_book.get()
+        provider = attrs.get("provider")
+        if provider and "prompt_tokens" in attrs and "cost" not in attrs:
+            cost = self.estimate_cost(provider, attrs["prompt_tokens"], attrs.get("completion_tokens", 0))
+            if cost is not None:
+                attrs["cost"] = round(cost, 8)
+
+        entry = {
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "run": self.run_id,
+            "book": book,
+            "span": name,
+            "duration": round(duration, 6),
+            **attrs
+        }
+
+        with self.lock:
+            aggregates = [self.books.setdefault(book, {}).setdefault(name, _new_aggregate())]
+            if provider:
+                aggregates.append(self.providers.setdefault(provider, _new_aggregate()))
+            for aggregate in aggregates:
+                aggregate["count"] += 1
+                aggregate["seconds"] += duration
+                aggregate["errors"] += "error" in attrs
+                aggregate["tokens_estimated"] += bool(attrs.get("tokens_estimated"))  # calls without reported usage
+                for field in SUMMED_ATTRIBUTES:
+                    aggregate[field] += attrs.get(field) or 0
+
+            try:
+                self._stream().write(json.dumps(entry) + "\n")
+            except OSError as e:
+                # Metrics must never break an extraction
+                print(f"⚠️  Could not write metrics: {e}")
+
+    def _stream(self):
+        """Line-buffered append handle for today's file (caller holds the lock)"""
+        path = self.metrics_dir / f"metrics_{datetime.now().strftime('%Y-%m-%d')}.jsonl"
+        if self._file is None or self._file.name != str(path):
+            if self._file is not None:
+                self._file.close()
+            self.metrics_dir.mkdir(parents=True, exist_ok=True)
+            self._file = open(path, 'a', buffering=1)
+        return self._file
+
+    def close(self):
+        with self.lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    @contextmanager
+    def span(self, name, **attrs):
+        """Time a block; the yielded dict takes extra attributes (tokens, bytes, ...)"""
+        started = time.perf_counter()
+        try:
+            yield attrs
+        except BaseException as e:
+            attrs["error"] = e.__class__.__name__
+            raise
+        finally:
+            self.record(name, time.perf_counter() - started, **attrs)
+
+    def iter_span(self, name, iterable, measure=None, inner=None, **attrs):
+        """Wrap a streaming stage; see IterationSpan"""
+        return IterationSpan(self, name, iterable, measure, inner, **attrs)
+
+    def book_rollup(self, book):
+        """span name -> aggregate for one book"""
+        with self.lock:
+            return {name: dict(aggregate) for name, aggregate in self.books.get(book, {}).items()}
+
+    def rollup(self):
+        """Totals per span, per book and per provider for this process"""
+        with self.lock:
+            spans = {}
+            for book_spans in self.books.values():
+                for name, aggregate in book_spans.items():
+                    total = spans.setdefault(name, _new_aggregate())
+                    for field in AGGREGATE_FIELDS:
+                        total[field] += aggregate[field]
+            return {
+                "spans": spans,
+                "books": {book: {name: dict(a) for name, a in book_spans.items()} for book, book_spans in self.books.items()},
+                "providers": {provider: dict(a) for provider, a in self.providers.items()}
+            }
+
+
+class IterationSpan:
+    """Times the work done inside next() of a streaming stage
+
+    Records a single span once the stage is exhausted or closed, with the
+    item count and (via measure(item)) bytes. Time spent in an `inner`
+    IterationSpan this stage pulls from is subtracted, so stacked
+    generators report exclusive time.
+    """
+
+    def __init__(self, recorder, name, iterable, measure=None, inner=None, **attrs):
+        self.recorder = recorder
+        self.name = name
+        self.measure = measure
+        self.inner = inner
+        self.attrs = attrs
+        self.seconds = 0.0
+        self.items = 0
+        self.bytes = 0
+        self._iterator = self._run(iter(iterable))
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._iterator)
+
+    def close(self):
+        self._iterator.close()
+
+    def _run(self, iterator):
+        try:
+            while True:
+                started = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    self.seconds += time.perf_counter() - started
+
+                self.items += 1
+                if self.measure:
+                    self.bytes += self.measure(item)
+                yield item
+        finally:
+            # Stop the wrapped stage too (e.g. its process pool) when closed early
+            if hasattr(iterator, "close"):
+                iterator.close()
+            exclusive = self.seconds - (self.inner.seconds if self.inner else 0.0)
+            self.recorder.record(self.name, max(0.0, exclusive), items=self.items, bytes=self.bytes, **self.attrs)
+
+
+_recorder = None
+_recorder_lock = threading.Lock()
+
+
+def get_metrics():
+    """Process-wide metrics recorder"""
+    global _recorder
+    with _recorder_lock:
+        if _recorder is None:
+            _recorder = MetricsRecorder()
+        return _recorder
+
+
+def reset_metrics(metrics_dir=METRICS_DIR):
+    """Start a fresh process-wide recorder (e.g. per benchmark run)"""
+    global _recorder
+    with _recorder_lock:
+        if _recorder is not None:
+            _recorder.close()
+        _recorder = MetricsRecorder(metrics_dir)
+        return _recorder
+
+
+def format_stage_times(spans):
+    """One-line breakdown, e.g. for the end-of-session log"""
+    parts = []
+    for name, aggregate in spans.items():
+        part = f"{name} {aggregate['seconds']:.2f}s"
+        if aggregate["cost"]:
+            part += f" (${aggregate['cost']:.4f})"
+        parts.append(part)
+    return " | ".join(parts)
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Outputs Watcher Core Module
+Extracted from the Content-Intelligent C Concept Extraction Engine
+
+Tells long-running readers (the MCP servers) which concept files under
+outputs/<book>/ were written or deleted since they last asked, so they can
+update their indexes in place instead of restarting or re-statting the
+whole tree on every query.
+
+A daemon thread follows the book directories with Linux inotify (through
+ctypes, no extra dependency) and falls back to polling the directories
+every few seconds where inotify is unavailable. Either way the thread does
+the filesystem work; readers only call changes(), which drains an
+in-memory set, or compare `version` with the one they loaded.
+
+The engine saves concepts by renaming a temp file into place, which
+inotify reports as IN_MOVED_TO; editors that rewrite in place end with
+IN_CLOSE_WRITE. A queue overflow triggers a rescan against the last known
+file stats, like a polling pass.
+"""
+
+import os
+import json
+import struct
+import inspect
+import functools
+import select
+import ctypes
+import ctypes.util
+import threading
+from pathlib import Path
+
+from core.concept_store import is_concept_file
+
+POLL_INTERVAL_SECONDS = 2.0
+CHANGED = "changed"
+DELETED = "deleted"
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+
+BOOK_DIR_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE | IN_DELETE_SELF
+OUTPUTS_DIR_MASK = IN_CREATE | IN_MOVED_TO
+_EVENT = struct.Struct("iIII")  # struct inotify_event without the trailing name
+
+
+def _load_libc():
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    if not hasattr(libc, "inotify_init1"):
+        return None  # not Linux
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    return libc
+
+
+class OutputsWatcher:
+    """Background watcher reporting changed and deleted concept files per book"""
+
+    def __init__(self, outputs_dir, books, poll_interval=POLL_INTERVAL_SECONDS, use_inotify=True):
+        self.outputs_dir = Path(outputs_dir)
+        self.books = set(books)
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.backend = None
+        self.version = 0  # bumped on every change; cheap staleness check for readers
+
+        self.lock = threading.Lock()
+        self.pending = {}  # (book, filename) -> CHANGED / DELETED
+        self.known = {}  # (book, filename) -> (mtime_ns, size) as of the last scan
+        self.stopping = threading.Event()
+        self.thread = None
+        self.libc = None
+        self.inotify_fd = None
+        self.watches = {}  # watch descriptor -> book (None for outputs_dir itself)
+
+    def start(self):
+        """Take the initial file stats and start the watcher thread; returns self"""
+        if self.use_inotify:
+            self._start_inotify()
+        self.known = self._scan()
+        if self.backend is None:
+            self.backend = "polling"
+            target = self._poll_loop
+        else:
+            target = self._inotify_loop
+        self.thread = threading.Thread(target=target, name="outputs-watcher", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopping.set()
+        if self.thread is not None:
+            self.thread.join(timeout=self.poll_interval + 1)
+        if self.inotify_fd is not None:
+            os.close(self.inotify_fd)
+            self.inotify_fd = None
+
+    def changes(self):
+        """{(book, filename): CHANGED | DELETED} since the previous call (no filesystem access)"""
+        with self.lock:
+            pending, self.pending = self.pending, {}
+        return pending
+
+    def _record(self, book, filename, change):
+        with self.lock:
+            self.pending[(book, filename)] = change
+            self.version += 1
+
+    def _scan(self):
+        """Stats of every concept file in the watched books"""
+        stats = {}
+        for book in self.books:
+            try:
+                entries = list(os.scandir(self.outputs_dir / book))
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            for entry in entries:
+                if not is_concept_file(entry.name):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                stats[(book, entry.name)] = (stat.st_mtime_ns, stat.st_size)
+        return stats
+
+    def _rescan(self):
+        """Diff a fresh scan against the last one and record the differences"""
+        current = self._scan()
+        for key, stat in current.items():
+            if self.known.get(key) != stat:
+                self._record(*key, CHANGED)
+        for key in self.known.keys() - current.keys():
+            self._record(*key, DELETED)
+        self.known = current
+
+    def _poll_loop(self):
+        while not self.stopping.wait(self.poll_interval):
+            self._rescan()
+
+    def _start_inotify(self):
+        libc = _load_libc()
+        if libc is None:
+            return
+        fd = libc.inotify_init1(IN_CLOEXEC)
+        if fd < 0:
+            return  # e.g. max_user_instances reached
+        self.libc = libc
+        self.inotify_fd = fd
+        if not self._add_watch(self.outputs_dir, None, OUTPUTS_DIR_MASK):
+            os.close(fd)
+            self.inotify_fd = None
+            return
+        for book in self.books:
+            self._add_watch(self.outputs_dir / book, book, BOOK_DIR_MASK)
+        self.backend = "inotify"
+
+    def _add_watch(self, path, book, mask):
+        wd = self.libc.inotify_add_watch(self.inotify_fd, os.fsencode(path), mask)
+        if wd < 0:
+            return False
+        self.watches[wd] = book
+        return True
+
+    def _inotify_loop(self):
+        while not self.stopping.is_set():
+            ready, _, _ = select.select([self.inotify_fd], [], [], self.poll_interval)
+            if not ready:
+                continue
+            try:
+                data = os.read(self.inotify_fd, 64 * 1024)
+            except OSError:
+                return
+            self._handle_events(data)
+
+    def _handle_events(self, data):
+        offset = 0
+        rescan = False
+        while offset + _EVENT.size <= len(data):
+            wd, mask, _, name_length = _EVENT.unpack_from(data, offset)
+            name = data[offset + _EVENT.size:offset + _EVENT.size + name_length].rstrip(b"\0").decode(
+                "utf-8", "surrogateescape")
+            offset += _EVENT.size + name_length
+
+            if mask & IN_Q_OVERFLOW:
+                rescan = True
+                continue
+            if mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+
+            book = self.watches.get(wd)
+            if book is None:
+                # outputs/ itself: a book directory created (or recreated) after start-up
+                if mask & IN_ISDIR and name in self.books and self._add_watch(self.outputs_dir / name, name,
+                                                                              BOOK_DIR_MASK):
+                    rescan = True  # files written before the watch was in place
+                continue
+            if mask & IN_ISDIR or not is_concept_file(name):
+                continue
+
+            if mask & (IN_DELETE | IN_MOVED_FROM):
+                self.known.pop((book, name), None)
+                self._record(book, name, DELETED)
+            elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                self.known[(book, name)] = None  # exact stats only matter to the next rescan
+                self._record(book, name, CHANGED)
+
+        if rescan:
+            self._rescan()
+
+
+def overlay_changed_files(outputs_dir, rows, changes, books):
+    """Concept store rows [(book, filename, concept)] brought up to date with changes()
+
+    The engine writes a concept's JSON file before its store row, so a
+    reader reloading from the store right after a file event may find the
+    row missing or stale. Changed files of `books` are read from disk
+    instead (new ones appended), deleted ones dropped.
+    """
+    changes = {key: change for key, change in changes.items() if key[0] in books}
+    if not changes:
+        return rows
+
+    def read(book, filename, default=None):
+        try:
+            with open(Path(outputs_dir) / book / filename, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return default  # deleted or being replaced again; the next event covers it
+
+    overlaid = []
+    for book, filename, concept in rows:
+        change = changes.pop((book, filename), None)
+        if change == CHANGED:
+            concept = read(book, filename, concept)
+        if change != DELETED:
+            overlaid.append((book, filename, concept))
+
+    for (book, filename), change in sorted(changes.items()):
+        concept = read(book, filename) if change == CHANGED else None
+        if concept is not None:
+            overlaid.append((book, filename, concept))
+    return overlaid
+
+
+def refresh_first(refresh):
+    """Decorator for MCP tools: call refresh() (apply pending outputs changes) before the tool runs"""
+    def decorator(tool):
+        if inspect.iscoroutinefunction(tool):
+            @functools.wraps(tool)
+            async def refreshed_tool(*args, **kwargs):
+                refresh()
+                return await tool(*args, **kwargs)
+        else:
+            @functools.wraps(tool)
+            def refreshed_tool(*args, **kwargs):
+                refresh()
+                return tool(*args, **kwargs)
+        return refreshed_tool
+    return decorator
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Page Cache Core Module
+Extracted from the Content-Intelligent C Concept Extraction Engine
+
+Persists raw page text and classified blocks on disk so repeated runs never
+re-open the PDF for pages that were already extracted.
+"""
+
+import os
+import json
+import hashlib
+from pathlib import Path
+import pdfplumber
+
+
+class PageCache:
+    """Disk cache of per-page text keyed by (PDF sha256, page, pdfplumber version)"""
+
+    MANIFEST_NAME = "manifest.json"
+
+    def __init__(self, cache_dir, pdf_path):
+        self.cache_dir = Path(cache_dir)
+        self.pdf_path = pdf_path
+        self.pdfplumber_version = pdfplumber.__version__
+        self.hits = 0
+        self.misses = 0
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest = self._load_manifest()
+        self.pdf_sha256 = self.manifest["pdf_sha256"]
+
+    def _load_manifest(self):
+        """Load the manifest, re-hashing the PDF only when it changed on disk"""
+        manifest_path = self.cache_dir / self.MANIFEST_NAME
+        stat = os.stat(self.pdf_path)
+
+        manifest = None
+        if manifest_path.exists():
+            try:
+                with open(manifest_path, 'r') as f:
+                    manifest = json.load(f)
+            except (json.JSONDecodeError, OSError):
+                manifest = None
+
+        if (manifest
+                and manifest.get("pdf_size") == stat.st_size
+                and manifest.get("pdf_mtime_ns") == stat.st_mtime_ns
+                and manifest.get("pdfplumber_version") == self.pdfplumber_version):
+            return manifest
+
+        previous_page_count = None
+        pdf_sha256 = self._hash_pdf()
+        if manifest and manifest.get("pdf_sha256") == pdf_sha256:
+            # Touched but unchanged PDF: keep the known page count
+            previous_page_count = manifest.get("page_count")
+
+        manifest = {
+            "pdf_sha256": pdf_sha256,
+            "pdf_size": stat.st_size,
+            "pdf_mtime_ns": stat.st_mtime_ns,
+            "pdfplumber_version": self.pdfplumber_version,
+            "page_count": previous_page_count
+        }
+        self._write_json(manifest_path, manifest)
+        self._prune_stale_entries(pdf_sha256)
+        return manifest
+
+    def _hash_pdf(self):
+        """Compute the sha256 of the PDF contents"""
+        sha = hashlib.sha256()
+        with open(self.pdf_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                sha.update(chunk)
+        return sha.hexdigest()
+
+    def _entry_prefix(self, pdf_sha256=None):
+        return f"{(pdf_sha256 or self.pdf_sha256)[:16]}_{self.pdfplumber_version}_"
+
+    def _entry_path(self, page_num):
+        return self.cache_dir / f"{self._entry_prefix()}p{page_num:05d}.json"
+
+    def _prune_stale_entries(self, pdf_sha256):
+        """Remove entries written for another PDF revision or pdfplumber version"""
+        current_prefix = self._entry_prefix(pdf_sha256)
+        for entry in self.cache_dir.glob("*_p*.json"):
+            if not entry.name.startswith(current_prefix):
+                try:
+                    entry.unlink()
+                except OSError:
+                    pass
+
+    def _write_json(self, path, data):
+        """Write JSON via a temporary file so readers never see partial entries"""
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    @property
+    def page_count(self):
+        return self.manifest.get("page_count")
+
+    def set_page_count(self, page_count):
+        if self.manifest.get("page_count") != page_count:
+            self.manifest["page_count"] = page_count
+            self._write_json(self.cache_dir / self.MANIFEST_NAME, self.manifest)
+
+    def get(self, page_num):
+        """Return the cached entry for a 0-based page number, or None on a miss"""
+        entry_path = self._entry_path(page_num)
+        try:
+            with open(entry_path, 'r') as f:
+                entry = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry
+
+    def put(self, page_num, text, blocks, classifier_version):
+        """Store raw page text together with its classification result"""
+        self._write_json(self._entry_path(page_num), {
+            "page": page_num,
+            "text": text,
+            "blocks": blocks,
+            "classifier_version": classifier_version
+        })
+
+    def add_stats(self, hits, misses):
+        """Fold in counters reported by worker processes"""
+        self.hits += hits
+        self.misses += misses
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
@@ -6,41 +6,216 @@ Extracted from the Content-Intelligent C Concept Extraction Engine
 Intelligently extracts and classifies content from PDF documents.
 """
 
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 import pdfplumber
 
+from core.page_cache import PageCache
+from core.metrics import get_metrics
+
+# Bump whenever _classify_content output changes so cached blocks are rebuilt
+CLASSIFIER_VERSION = 1
+
+# K&R patterns: "Chapter 1", "1.1", "2.3 The For Statement"
+HEADER_RULES = [
+    ("chapter", r'Chapter\s+\d+'),
+    ("section", r'\d+\.\d+\s+\w+'),
+    ("title", r'[A-Z][A-Za-z\s]+$')  # All caps or title case standalone
+]
+
+CODE_RULES = [
+    ("include", r'#include\s*<'),
+    ("main", r'\bint\s+main\s*\('),
+    ("printf", r'\bprintf\s*\('),
+    ("for", r'\bfor\s*\('),
+    ("while", r'\bwhile\s*\('),
+    ("if", r'\bif\s*\('),
+    ("open_brace", r'^\s*{'),
+    ("close_brace", r'^\s*}'),
+    ("semicolon", r';\s*$'),
+    ("block_comment", r'/\*.*\*/'),
+    ("line_comment", r'//.*')
+]
+
+# One anchored alternation per line type; the named group says which rule fired
+HEADER_PATTERN = re.compile("|".join(f"(?P<{name}>{rule})" for name, rule in HEADER_RULES))
+CODE_PATTERN = re.compile("|".join(f"(?P<{name}>{rule})" for name, rule in CODE_RULES))
+
+# Every code rule needs one of these characters, so most prose lines are
+# rejected without running the regex at all
+CODE_TRIGGER_CHARS = frozenset("#({};/")
+
+MAX_HEADER_LENGTH = 80
+
+
+def _match_code_rule(line):
+    if CODE_TRIGGER_CHARS.isdisjoint(line):
+        return None
+    match = CODE_PATTERN.search(line)
+    return match.lastgroup if match else None
+
+
+def classify_line(line):
+    """Classify a stripped line in a single pass
+    
+    Returns (line_type, rule) where line_type is "header", "code" or "text"
+    and rule names the pattern that fired (None for text). Header rules are
+    tried in order; for code lines the leftmost match in the line is reported.
+    """
+    if len(line) < MAX_HEADER_LENGTH:
+        match = HEADER_PATTERN.match(line)
+        if match:
+            return "header", match.lastgroup
+    
+    rule = _match_code_rule(line)
+    if rule:
+        return "code", rule
+    
+    return "text", None
+
+
+def _block_bytes(block):
+    return sum(len(line) for line in block["content"])
+
+
+def _extract_page_range(pdf_path, start_page, end_page, cache_dir=None):
+    """Worker: open a private pdfplumber handle and classify a page shard"""
+    extractor = PDFStructureExtractor(pdf_path, cache_dir=cache_dir)
+    with extractor:
+        blocks = extractor._extract_pages(start_page, end_page)
+        stats = extractor.cache.stats() if extractor.cache else None
+        return blocks, stats
+
 
 class PDFStructureExtractor:
     """Intelligently extracts and classifies content from PDF"""
     
-    def __init__(self, pdf_path):
+    def __init__(self, pdf_path, cache_dir=None):
         self.pdf_path = pdf_path
         self.pdf = None
+        self.cache_dir = cache_dir
+        self.cache = PageCache(cache_dir, pdf_path) if cache_dir else None
     
     def __enter__(self):
-        self.pdf = pdfplumber.open(self.pdf_path)
+        # With a page cache the PDF is only opened once a page misses
+        if not self.cache:
+            self._open_pdf()
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         if self.pdf:
             self.pdf.close()
     
-    def extract_structured_content(self, start_page=0, max_pages=20):
-        """Extract content with structure awareness"""
+    def _open_pdf(self):
+        if self.pdf is None:
+            self.pdf = pdfplumber.open(self.pdf_path)
+            if self.cache:
+                self.cache.set_page_count(len(self.pdf.pages))
+        return self.pdf
+    
+    def _page_count(self):
+        if self.cache and self.cache.page_count is not None:
+            return self.cache.page_count
+        return len(self._open_pdf().pages)
+    
+    def extract_structured_content(self, start_page=0, max_pages=20, workers=None):
+        """Extract content with structure awareness
+        
+        With workers > 1 the page range is sharded into contiguous chunks and
+        extracted in a process pool. Shards are reassembled in page order, so
+        the result is identical to the serial path.
+        """
+        return list(self.iter_structured_content(start_page, max_pages, workers))
+    
+    def iter_structured_content(self, start_page=0, max_pages=20, workers=None):
+        """Yield classified content blocks page by page, in page order
+        
+        Streaming counterpart of extract_structured_content(); consumers can
+        start on the first blocks while later pages are still being parsed.
+        Recorded as one "pdf_extraction" metrics span.
+        """
+        end_page = min(self._page_count(), start_page + max_pages)
+        return get_metrics().iter_span(
+            "pdf_extraction", self._iter_page_blocks(start_page, end_page, workers),
+            measure=_block_bytes, pages=max(0, end_page - start_page), workers=workers or 1
+        )
+    
+    def _iter_page_blocks(self, start_page, end_page, workers):
+        shards = None
+        if workers and workers > 1:
+            shards = self._shard_page_range(start_page, end_page, workers)
+        
+        if not shards or len(shards) < 2:
+            for page_num in range(start_page, end_page):
+                yield from self._page_blocks(page_num)
+            return
+        
+        pool = ProcessPoolExecutor(max_workers=len(shards))
+        try:
+            # map() yields results in submission order, i.e. page order
+            results = pool.map(
+                _extract_page_range,
+                [self.pdf_path] * len(shards),
+                [shard[0] for shard in shards],
+                [shard[1] for shard in shards],
+                [self.cache_dir] * len(shards)
+            )
+            for shard_blocks, shard_stats in results:
+                if self.cache and shard_stats:
+                    self.cache.add_stats(shard_stats["hits"], shard_stats["misses"])
+                yield from shard_blocks
+        finally:
+            # Consumers may stop early; don't parse shards nobody will read
+            pool.shutdown(wait=True, cancel_futures=True)
+    
+    def _extract_pages(self, start_page, end_page):
+        """Serially extract and classify pages [start_page, end_page)"""
         content_blocks = []
         
-        for page_num in range(start_page, min(len(self.pdf.pages), start_page + max_pages)):
-            page = self.pdf.pages[page_num]
+        for page_num in range(start_page, end_page):
+            content_blocks.extend(self._page_blocks(page_num))
+        
+        return content_blocks
+    
+    def _page_blocks(self, page_num):
+        """Classified blocks for one 0-based page, served from the cache when possible"""
+        entry = self.cache.get(page_num) if self.cache else None
+        
+        if entry is not None:
+            if entry.get("classifier_version") == CLASSIFIER_VERSION:
+                return entry["blocks"]
+            # Text is still valid, only the classification is stale
+            text = entry["text"]
+        else:
+            page = self._open_pdf().pages[page_num]
             text = page.extract_text()
-            
-            if not text or len(text.strip()) < 50:  # Skip sparse pages
-                continue
-            
+        
+        if not text or len(text.strip()) < 50:  # Skip sparse pages
+            blocks = []
+        else:
             # Classify content types
-            classified_content = self._classify_content(text, page_num + 1)
-            content_blocks.extend(classified_content)
+            blocks = self._classify_content(text, page_num + 1)
         
-        return content_blocks
+        if self.cache:
+            self.cache.put(page_num, text, blocks, CLASSIFIER_VERSION)
+        
+        return blocks
+    
+    @staticmethod
+    def _shard_page_range(start_page, end_page, workers):
+        """Split [start_page, end_page) into at most `workers` contiguous shards"""
+        total = end_page - start_page
+        workers = min(workers, total, os.cpu_count() or 1) or 1
+        base, extra = divmod(total, workers)
+        
+        shards = []
+        shard_start = start_page
+        for i in range(workers):
+            shard_end = shard_start + base + (1 if i < extra else 0)
+            shards.append((shard_start, shard_end))
+            shard_start = shard_end
+        return shards
     
     def _classify_content(self, text, page_num):
         """Classify text into headers, explanations, code blocks, etc."""
@@ -53,14 +228,16 @@ class PDFStructureExtractor:
             if not line:
                 continue
             
+            line_type, _rule = classify_line(line)
+            
             # Detect headers (chapter/section markers)
-            if self._is_header(line):
+            if line_type == "header":
                 if current_block["content"]:
                     blocks.append(current_block)
                 current_block = {"type": "header", "content": [line], "page": page_num}
             
             # Detect code blocks
-            elif self._is_code_line(line):
+            elif line_type == "code":
                 if current_block["type"] != "code":
                     if current_block["content"]:
                         blocks.append(current_block)
@@ -84,35 +261,8 @@ class PDFStructureExtractor:
     
     def _is_header(self, line):
         """Detect if line is a chapter/section header"""
-        # K&R patterns: "Chapter 1", "1.1", "2.3 The For Statement"
-        header_patterns = [
-            r'^Chapter\s+\d+',
-            r'^\d+\.\d+\s+\w+',
-            r'^[A-Z][A-Za-z\s]+$'  # All caps or title case standalone
-        ]
-        
-        for pattern in header_patterns:
-            if re.match(pattern, line) and len(line) < 80:
-                return True
-        return False
+        return classify_line(line)[0] == "header"
     
     def _is_code_line(self, line):
         """Detect if line contains C code"""
-        code_indicators = [
-            r'#include\s*<',
-            r'\bint\s+main\s*\(',
-            r'\bprintf\s*\(',
-            r'\bfor\s*\(',
-            r'\bwhile\s*\(',
-            r'\bif\s*\(',
-            r'^\s*{',
-            r'^\s*}',
-            r';\s*$',
-            r'/\*.*\*/',
-            r'//.*'
-        ]
-        
-        for indicator in code_indicators:
-            if re.search(indicator, line):
-                return True
-        return False
+        return _match_code_rule(line) is not None
@@ -4,51 +4,164 @@ Progress Tracker Core Module
 Extracted from the Content-Intelligent C Concept Extraction Engine
 
 Tracks extraction progress for resumable operations across multiple books.
+
+State is kept crash-safe in two files next to each other:
+- progress.json: small checkpoint (last page, totals) replaced atomically
+- progress.journal: append-only JSON lines, one record per session
+
+Each session costs one journal append plus a constant-size checkpoint
+write. On load, journal records newer than the checkpoint are replayed, so
+a process killed between the two writes (or a damaged checkpoint) never
+sends a book back to page 0.
 """
 
 import os
 import json
 from datetime import datetime
 
+from core.atomic_file import atomic_write_json, atomic_write_text
+
+SESSION_FIELDS = ("date", "concepts_extracted", "page_range", "chapter")
+
+
+def journal_path_for(progress_file):
+    root, _ = os.path.splitext(progress_file)
+    return root + ".journal"
+
 
 class ProgressTracker:
     """Tracks extraction progress for resumable operations"""
-    
+
     def __init__(self, progress_file="progress.json"):
         self.progress_file = progress_file
+        self.journal_file = journal_path_for(progress_file)
+        self.journal_seq = 0
+        self.journal_good_bytes = None  # set when a torn record must be cut before appending
         self.progress = self.load_progress()
-    
+
     def load_progress(self):
+        progress = self._fresh_progress()
+        checkpoint_seq = 0
+        legacy_sessions = []
+
         if os.path.exists(self.progress_file):
             try:
                 with open(self.progress_file, 'r') as f:
                     content = f.read().strip()
                     if content:  # Only parse if file has content
-                        return json.loads(content)
+                        snapshot = json.loads(content)
+                        checkpoint_seq = snapshot.pop("journal_seq", 0)
+                        snapshot.pop("sessions_recorded", None)
+                        snapshot.pop("updated", None)
+                        # Files written before the journal keep their session history inline
+                        legacy_sessions = snapshot.pop("extraction_sessions", [])
+                        progress.update(snapshot)
                     else:
-                        print("📝 Found empty progress file, initializing fresh...")
+                        print("📝 Found empty progress file, recovering from journal...")
             except (json.JSONDecodeError, Exception) as e:
-                print(f"📝 Progress file corrupted ({e}), initializing fresh...")
-        
-        # Return fresh progress structure
+                print(f"📝 Progress file corrupted ({e}), recovering from journal...")
+
+        records = self._read_journal()
+        if records:
+            progress["extraction_sessions"] = [
+                {field: record.get(field, "") for field in SESSION_FIELDS} for record in records
+            ]
+            self.journal_seq = records[-1]["seq"]
+
+            # Replay sessions the checkpoint missed (killed between journal append and checkpoint)
+            replayed = [record for record in records if record["seq"] > checkpoint_seq and "last_processed_page" in record]
+            if replayed:
+                progress["last_processed_page"] = replayed[-1]["last_processed_page"]
+                progress["total_concepts_extracted"] = replayed[-1]["total_concepts_extracted"]
+                print(f"📝 Replayed {len(replayed)} journaled session(s) newer than {os.path.basename(self.progress_file)}")
+        else:
+            progress["extraction_sessions"] = legacy_sessions
+
+        return progress
+
+    def _fresh_progress(self):
         return {
             "last_processed_page": 0,
             "total_concepts_extracted": 0,
             "extraction_sessions": [],
             "current_chapter": 1
         }
-    
+
+    def _read_journal(self):
+        """Journal records in order; a torn final line from a crash is cut off"""
+        if not os.path.exists(self.journal_file):
+            return []
+
+        records = []
+        good_bytes = 0
+        with open(self.journal_file, 'rb') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("incomplete record")
+                    records.append(json.loads(line))
+                except ValueError:
+                    print(f"📝 Dropping incomplete record at the end of {os.path.basename(self.journal_file)}")
+                    break
+                good_bytes += len(line)
+
+        if good_bytes < os.path.getsize(self.journal_file):
+            self.journal_good_bytes = good_bytes
+        return records
+
+    def _append_journal(self, record):
+        if self.journal_seq == 0 and self.progress["extraction_sessions"][:-1]:
+            self._migrate_legacy_sessions(self.progress["extraction_sessions"][:-1])
+
+        if self.journal_good_bytes is not None:
+            # The next record must start on a clean line
+            with open(self.journal_file, 'r+b') as f:
+                f.truncate(self.journal_good_bytes)
+            self.journal_good_bytes = None
+
+        self.journal_seq += 1
+        record["seq"] = self.journal_seq
+        with open(self.journal_file, 'a') as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _migrate_legacy_sessions(self, sessions):
+        """Move an inline extraction_sessions list into the journal (once)"""
+        lines = [json.dumps(dict(session, seq=seq, migrated=True)) for seq, session in enumerate(sessions, 1)]
+        # Replaces any incomplete record too, so there is nothing left to truncate
+        atomic_write_text(self.journal_file, "\n".join(lines) + "\n")
+        self.journal_good_bytes = None
+        self.journal_seq = len(sessions)
+
     def save_progress(self):
-        with open(self.progress_file, 'w') as f:
-            json.dump(self.progress, f, indent=2)
-    
+        """Atomically replace the checkpoint (session history lives in the journal)"""
+        snapshot = {key: value for key, value in self.progress.items() if key != "extraction_sessions"}
+        snapshot["sessions_recorded"] = len(self.progress["extraction_sessions"])
+        snapshot["journal_seq"] = self.journal_seq
+        snapshot["updated"] = datetime.now().isoformat()
+        atomic_write_json(self.progress_file, snapshot)
+
     def update_progress(self, page_num, concepts_count, session_info):
         self.progress["last_processed_page"] = page_num
         self.progress["total_concepts_extracted"] += concepts_count
-        self.progress["extraction_sessions"].append({
+        session = {
             "date": datetime.now().isoformat(),
             "concepts_extracted": concepts_count,
             "page_range": session_info.get("page_range", ""),
             "chapter": session_info.get("chapter", "")
-        })
+        }
+        self.progress["extraction_sessions"].append(session)
+
+        # Journal first: once this append is on disk the session survives a kill
+        self._append_journal(dict(
+            session,
+            last_processed_page=page_num,
+            total_concepts_extracted=self.progress["total_concepts_extracted"]
+        ))
         self.save_progress()
+
+
+def read_progress(progress_file):
+    """Current progress for external readers (checkpoint + journal replay)"""
+    return ProgressTracker(progress_file).progress
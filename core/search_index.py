@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Concept Search Index Core Module
+Extracted from the Content-Intelligent C Concept Extraction Engine
+
+Tokenised inverted index over loaded concepts for the MCP servers, ranked
+with BM25F: per-field term frequencies are weighted (title > description >
+content > book title) and length-normalised against the field's average
+before BM25 saturation, so a hit in a short title outranks one buried in
+a long explanation.
+
+Concepts are tokenised once when they are added; a query only walks the
+postings of its own terms and picks the top k with a heap, so its cost
+follows the number of matching concepts rather than the size of the corpus.
+Query words that are not indexed as whole tokens fall back to every indexed
+token they prefix ("mem" -> memory, memcpy, ...), keeping the partial-word
+matches the old substring search gave.
+"""
+
+import re
+import math
+import heapq
+import bisect
+
+from core.dedup import TOPIC_STOPWORDS
+
+FIELDS = ("title", "description", "content", "book_title")
+FIELD_WEIGHTS = (3.0, 2.0, 1.0, 0.5)
+K1 = 1.2
+B = 0.75
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _stem(token):
+    """Fold plain plurals so "pointers" finds "pointer" and back"""
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text):
+    return [_stem(token) for token in _TOKEN_RE.findall(text.lower())]
+
+
+def query_terms(query):
+    """Distinct query tokens, dropping filler words unless nothing else is left"""
+    terms = list(dict.fromkeys(tokenize(query)))
+    meaningful = [term for term in terms if term not in TOPIC_STOPWORDS]
+    return meaningful or terms
+
+
+class ConceptSearchIndex:
+    """BM25F inverted index over MCP concept dicts (title/description/content/book_title)"""
+
+    def __init__(self):
+        self.docs = []  # doc id -> concept dict (None once removed)
+        self.doc_ids = {}  # concept id -> doc id
+        self.doc_count = 0
+        self.postings = {}  # token -> {doc id: [tf per field]}
+        self.field_lengths = []  # doc id -> [token count per field]
+        self.total_lengths = [0] * len(FIELDS)
+        self._vocabulary = None  # sorted tokens, rebuilt after new tokens arrive
+
+    def __len__(self):
+        return self.doc_count
+
+    def clear(self):
+        self.__init__()
+
+    def add(self, concept):
+        """Index one concept; returns its doc id"""
+        doc_id = len(self.docs)
+        self.docs.append(concept)
+        self.doc_ids[concept['id']] = doc_id
+        self.doc_count += 1
+
+        lengths = []
+        for field_index, field in enumerate(FIELDS):
+            tokens = tokenize(concept.get(field) or "")
+            lengths.append(len(tokens))
+            self.total_lengths[field_index] += len(tokens)
+            for token in tokens:
+                frequencies = self.postings.get(token)
+                if frequencies is None:
+                    frequencies = self.postings[token] = {}
+                    self._vocabulary = None
+                counts = frequencies.get(doc_id)
+                if counts is None:
+                    counts = frequencies[doc_id] = [0] * len(FIELDS)
+                counts[field_index] += 1
+        self.field_lengths.append(lengths)
+        return doc_id
+
+    def remove(self, concept_id):
+        """Drop a concept's postings; doc ids are never reused"""
+        doc_id = self.doc_ids.pop(concept_id, None)
+        if doc_id is None:
+            return
+        concept = self.docs[doc_id]
+        for field_index, field in enumerate(FIELDS):
+            for token in set(tokenize(concept.get(field) or "")):
+                frequencies = self.postings.get(token)
+                if frequencies is not None and frequencies.pop(doc_id, None) is not None and not frequencies:
+                    del self.postings[token]
+                    self._vocabulary = None
+            self.total_lengths[field_index] -= self.field_lengths[doc_id][field_index]
+        self.docs[doc_id] = None
+        self.field_lengths[doc_id] = [0] * len(FIELDS)
+        self.doc_count -= 1
+
+    def state(self):
+        """JSON-serialisable index contents; concepts are referenced by their ID"""
+        return {
+            "docs": [concept['id'] if concept is not None else None for concept in self.docs],
+            "postings": {token: [[doc_id, *counts] for doc_id, counts in frequencies.items()]
+                         for token, frequencies in self.postings.items()},
+            "field_lengths": self.field_lengths,
+            "total_lengths": self.total_lengths
+        }
+
+    @classmethod
+    def from_state(cls, state, concepts_by_id):
+        """Index restored from state(), pointing at the concepts in concepts_by_id"""
+        index = cls()
+        index.docs = [concepts_by_id[concept_id] if concept_id is not None else None for concept_id in state["docs"]]
+        index.doc_ids = {concept['id']: doc_id for doc_id, concept in enumerate(index.docs) if concept is not None}
+        index.doc_count = len(index.doc_ids)
+        index.postings = {token: {doc_id: counts for doc_id, *counts in rows}
+                          for token, rows in state["postings"].items()}
+        index.field_lengths = state["field_lengths"]
+        index.total_lengths = state["total_lengths"]
+        return index
+
+    def _expand(self, term):
+        """Indexed tokens for a query term: itself, or every token it prefixes"""
+        if term in self.postings:
+            return [term]
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        start = bisect.bisect_left(self._vocabulary, term)
+        end = bisect.bisect_left(self._vocabulary, term + "\uffff")
+        return self._vocabulary[start:end]
+
+    def _term_scores(self, tokens, book):
+        """doc id -> BM25F score of one query term (the union of its expansions)"""
+        average_lengths = [total / self.doc_count or 1 for total in self.total_lengths]
+        weighted_tf = {}
+        for token in tokens:
+            for doc_id, counts in self.postings[token].items():
+                if book is not None and self.docs[doc_id]['book'] != book:
+                    continue
+                lengths = self.field_lengths[doc_id]
+                tf = 0.0
+                for field_index, count in enumerate(counts):
+                    if count:
+                        norm = 1 - B + B * lengths[field_index] / average_lengths[field_index]
+                        tf += FIELD_WEIGHTS[field_index] * count / norm
+                weighted_tf[doc_id] = weighted_tf.get(doc_id, 0.0) + tf
+
+        # Document frequency over the whole corpus, so scores compare across book filters
+        if len(tokens) == 1:
+            containing = len(self.postings[tokens[0]])
+        else:
+            containing = len(set().union(*(self.postings[token] for token in tokens)))
+        idf = math.log(1 + (self.doc_count - containing + 0.5) / (containing + 0.5))
+        return {doc_id: idf * tf * (K1 + 1) / (tf + K1) for doc_id, tf in weighted_tf.items()}
+
+    def search(self, query, limit=None, book=None, require_all=False):
+        """[(concept, score)] best first; `limit` None returns every match
+
+        With require_all only concepts containing every query word match
+        (topic lookups); otherwise any word does and BM25 sorts them out.
+        Ties keep corpus order.
+        """
+        if not self.doc_count:
+            return []
+
+        scores = None
+        for term in query_terms(query):
+            tokens = self._expand(term)
+            if not tokens:
+                if require_all:
+                    return []
+                continue
+            term_scores = self._term_scores(tokens, book)
+            if scores is None:
+                scores = term_scores
+            elif require_all:
+                scores = {doc_id: score + term_scores[doc_id] for doc_id, score in scores.items()
+                          if doc_id in term_scores}
+            else:
+                for doc_id, score in term_scores.items():
+                    scores[doc_id] = scores.get(doc_id, 0.0) + score
+
+        if not scores:
+            return []
+
+        def rank(doc_id):
+            return scores[doc_id], -doc_id  # ties stay in corpus order
+
+        if limit is None or limit >= len(scores):
+            ranked = sorted(scores, key=rank, reverse=True)
+        else:
+            ranked = heapq.nlargest(limit, scores, key=rank)
+        return [(self.docs[doc_id], scores[doc_id]) for doc_id in ranked]
@@ -31,11 +31,13 @@ def test_step_1_pdf_extraction():
         return None
     
     try:
-        with PDFStructureExtractor(pdf_path) as extractor:
+        cache_dir = "/home/shahar42/Suumerizing_C_holy_grale_book/outputs/linkers_loaders/.pagecache"
+        with PDFStructureExtractor(pdf_path, cache_dir=cache_dir) as extractor:
             # Extract content from pages 31-45 (where we know good content exists)
             content_blocks = extractor.extract_structured_content(30, max_pages=15)
             
             print(f"✅ Extracted {len(content_blocks)} content blocks")
+            print(f"💾 Page cache: {extractor.cache.stats()}")
             
             # Analyze content types
             content_types = {}
@@ -5,6 +5,8 @@ Provides access to programming concepts from technical books.
 """
 
 import json
+import time
+import inspect
 import logging
 import sys
 from pathlib import Path
@@ -18,6 +20,12 @@ sys.path.append('.')
 
 from mcp.server.fastmcp import FastMCP
 
+from core.concept_store import open_concept_store, STORE_FILENAME, CONCEPT_FILE_GLOB
+from core.search_index import ConceptSearchIndex
+from core.concept_table import ConceptTable
+from core.index_snapshot import IndexSnapshot, source_fingerprint
+from core.outputs_watcher import OutputsWatcher, refresh_first, DELETED
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("programming-concepts-mcp")
@@ -25,8 +33,15 @@ logger = logging.getLogger("programming-concepts-mcp")
 # Initialize FastMCP server
 mcp = FastMCP("programming-concepts")
 
+PROJECT_ROOT = Path("/home/shahar42/Suumerizing_C_holy_grale_book")
+OUTPUTS_DIR = PROJECT_ROOT / "outputs"
+SNAPSHOT_FILE = PROJECT_ROOT / "cache" / "mcp_index.snapshot"  # local only, never under the shared outputs/
+STARTUP_BUDGET_SECONDS = 1.0  # the index must be ready within this before the stdio transport starts
+
 # Global variables for concepts database
-concepts = []
+concepts = ConceptTable()  # list of concepts plus an id -> concept index
+search_index = ConceptSearchIndex()  # BM25 over title/description/content, filled by add_concept_data
+outputs_watcher = None  # reports concept files written after start-up (cron extractions)
 books_metadata = {
     "kernighan_ritchie": "The C Programming Language (Kernighan & Ritchie)",
     "unix_env": "Advanced Programming in the UNIX Environment (Stevens)",
@@ -35,6 +50,28 @@ books_metadata = {
     "expert_c_programming": "Expert C Programming Deep C Secrets (van der Linden)"
 }
 
+# Heuristics for what makes a concept "advanced" (find_advanced_concepts); keywords are
+# matched against lowercased text, so the uppercase ones never hit
+ADVANCED_KEYWORDS = [
+    'advanced', 'internals', 'optimization', 'low-level', 'kernel', 'complex',
+    'performance', 'architecture', 'concurrent', 'asynchronous', 'memory layout',
+    'virtual memory', 'system call', 'linking', 'loading', 'multithreading',
+    'synchronization', 'parallelism', 'cache coherence', 'memory alignment',
+    'interrupts', 'scheduling', 'file systems', 'network stack', 'garbage collection',
+    'instruction pipelining', 'branch prediction', 'memory paging', 'context switching',
+    'atomic operations', 'lock-free programming', 'syscalls',
+    'dynamic linking', 'static analysis',
+    'memory fences', 'thread affinity', 'heap management', 'GOT', 'TLB',
+    'page table', 'segment'
+]
+BOOK_WEIGHTS = {
+    "linkers_loaders": 3,
+    "expert_c_programming": 3,  # Expert C Programming is advanced
+    "unix_env": 2,
+    "os_three_pieces": 2,
+    "kernighan_ritchie": 0  # K&R is foundational, so less inherently "advanced"
+}
+
 
 def build_concept_index():
     """Build the concept index from outputs directory."""
@@ -42,44 +79,45 @@ def build_concept_index():
 
     logger.info("Building concept index from outputs")
 
-    PROJECT_ROOT = Path("/home/shahar42/Suumerizing_C_holy_grale_book")
-    outputs_dir = PROJECT_ROOT / "outputs"
+    outputs_dir = OUTPUTS_DIR
     if not outputs_dir.exists():
         logger.error("outputs directory not found")
         return
 
     total_concepts = 0
 
+    # Books already in the SQLite concept store load with a single query
+    store = open_concept_store(outputs_dir / STORE_FILENAME)
+    stored_books = store.books() & set(books_metadata) if store else set()
+    if stored_books:
+        book_counts = defaultdict(int)
+        for book_name, filename, concept_data in store.concepts(stored_books):
+            book_counts[book_name] += add_concept_data(concept_data, book_name, filename)
+
+        for book_name, book_concepts in sorted(book_counts.items()):
+            logger.info(f"Found {book_concepts} concepts in {book_name} (concept store)")
+            total_concepts += book_concepts
+
     for book_dir in outputs_dir.iterdir():
         if not book_dir.is_dir():
             continue
 
         book_name = book_dir.name
-        if book_name not in books_metadata:
+        if book_name not in books_metadata or book_name in stored_books:
             continue
 
         logger.info(f"Indexing book: {book_name}")
 
         # Look for JSON files containing concepts
-        concept_files = list(book_dir.glob("*.json"))
+        concept_files = list(book_dir.glob(CONCEPT_FILE_GLOB))
         book_concepts = 0
 
         for concept_file in concept_files:
-            if concept_file.name in ["progress.json", "metadata.json"]:
-                continue
-
             try:
                 with open(concept_file, 'r', encoding='utf-8') as f:
                     concept_data = json.load(f)
 
-                # Handle both single concept and list of concepts
-                if isinstance(concept_data, list):
-                    for concept in concept_data:
-                        add_concept(concept, book_name, concept_file.name)
-                        book_concepts += 1
-                elif isinstance(concept_data, dict):
-                    add_concept(concept_data, book_name, concept_file.name)
-                    book_concepts += 1
+                book_concepts += add_concept_data(concept_data, book_name, concept_file.name)
 
             except (json.JSONDecodeError, IOError) as e:
                 logger.warning(f"Failed to load {concept_file}: {e}")
@@ -90,15 +128,73 @@ def build_concept_index():
             total_concepts += book_concepts
 
     logger.info(
-        f"Successfully indexed {total_concepts} concepts across {len([k for k in books_metadata.keys() if any(Path('outputs').glob(f'{k}/*.json'))])} books")
+        f"Successfully indexed {total_concepts} concepts across {len([k for k in books_metadata.keys() if any(Path('outputs').glob(f'{k}/{CONCEPT_FILE_GLOB}'))])} books")
+
+
+def load_concept_index():
+    """Load the concept index from its snapshot, rebuilding and re-saving it when the outputs changed."""
+    global concepts, search_index, outputs_watcher
+
+    started = time.perf_counter()
+    snapshot = None
+    saved = None
+    if OUTPUTS_DIR.exists():
+        # Watch first: files written while the index loads are applied on the first tool call
+        outputs_watcher = OutputsWatcher(OUTPUTS_DIR, books_metadata).start()
+        # Code that shapes the index is part of the fingerprint, so edits to it invalidate old snapshots
+        code_files = [__file__, inspect.getfile(ConceptSearchIndex), inspect.getfile(ConceptTable)]
+        snapshot = IndexSnapshot(SNAPSHOT_FILE, source_fingerprint(OUTPUTS_DIR, books_metadata, code_files))
+        saved = snapshot.load()
+
+    if saved is not None:
+        for concept in saved['concepts']:
+            concept['words'] = frozenset(concept['words'])
+        concepts = ConceptTable(saved['concepts'])
+        search_index = ConceptSearchIndex.from_state(saved['search_index'], concepts.by_id)
+        source = "snapshot"
+    else:
+        build_concept_index()
+        source = "rebuilt"
+        if snapshot is not None:
+            try:
+                snapshot.save({
+                    'concepts': [dict(concept, words=sorted(concept['words'])) for concept in concepts],
+                    'search_index': search_index.state()
+                })
+            except OSError as e:
+                logger.warning(f"Could not save index snapshot {SNAPSHOT_FILE}: {e}")
 
+    elapsed = time.perf_counter() - started
+    logger.info(f"Concept index ready in {elapsed * 1000:.0f} ms ({source}, {len(concepts)} concepts, "
+                f"{outputs_watcher.backend if outputs_watcher else 'no'} outputs watcher)")
+    if elapsed > STARTUP_BUDGET_SECONDS:
+        logger.warning(f"Index start-up took {elapsed:.2f}s, over the {STARTUP_BUDGET_SECONDS:.1f}s budget")
 
-def add_concept(concept_data: Dict[str, Any], book_name: str, filename: str):
-    """Add a concept to the index with proper field mapping."""
-    global concepts
 
+def add_concept_data(concept_data: Any, book_name: str, filename: str) -> int:
+    """Add a concept file's content (single concept or list of concepts); returns how many were added."""
+    file_entries = file_concepts(concept_data, book_name, filename)
+    for concept in file_entries:
+        concepts.append(concept)
+        search_index.add(concept)
+    return len(file_entries)
+
+
+def file_concepts(concept_data: Any, book_name: str, filename: str) -> List[Dict[str, Any]]:
+    """Index entries for a concept file's content, numbered by their position in the file."""
+    # Handle both single concept and list of concepts
+    if isinstance(concept_data, dict):
+        concept_data = [concept_data]
+    elif not isinstance(concept_data, list):
+        return []
+    return [make_concept(data, book_name, filename, index) for index, data in enumerate(concept_data)]
+
+
+def make_concept(concept_data: Dict[str, Any], book_name: str, filename: str, index: int) -> Dict[str, Any]:
+    """Build a concept's index entry with proper field mapping."""
     # Generate a unique ID for the concept
-    concept_id = f"{book_name}_{filename.replace('.json', '')}_{len(concepts)}"
+    # Numbered within its file, so a rewritten file keeps its concepts' IDs
+    concept_id = f"{book_name}_{filename.replace('.json', '')}_{index}"
 
     # SURGICAL FIX: Map the standardized extractor format to MCP server expectations
 
@@ -138,9 +234,56 @@ def add_concept(concept_data: Dict[str, Any], book_name: str, filename: str):
         'raw_data': concept_data
     }
 
-    concepts.append(concept)
+    normalize_concept(concept)
+    return concept
+
+
+def normalize_concept(concept: Dict[str, Any]):
+    """Precompute the lowercased text, word set and advanced-keyword bitmap the tools match against."""
+    concept['title_lower'] = concept['title'].lower()
+    concept['description_lower'] = concept['description'].lower()
+    concept['content_lower'] = concept['content'].lower()
+    concept['syntax_lower'] = concept['syntax'].lower()
+    concept['search_text'] = (concept['title'] + ' ' + concept['description'] + ' ' + concept['content']).lower()
+    concept['words'] = frozenset((concept['content'] + ' ' + concept['description']).lower().split())
+    # Bit i is set when ADVANCED_KEYWORDS[i] occurs in the text
+    concept['advanced_bits'] = sum(1 << i for i, keyword in enumerate(ADVANCED_KEYWORDS)
+                                   if keyword in concept['search_text'])
+
+
+def apply_outputs_changes():
+    """Bring the index up to date with concept files written or deleted since the previous tool call."""
+    if outputs_watcher is None:
+        return
+    changes = outputs_watcher.changes()
+    if not changes:
+        return
+
+    replaced = 0
+    added = 0
+    for (book_name, filename), change in changes.items():
+        fresh = []
+        if change != DELETED:
+            try:
+                with open(OUTPUTS_DIR / book_name / filename, 'r', encoding='utf-8') as f:
+                    fresh = file_concepts(json.load(f), book_name, filename)
+            except (json.JSONDecodeError, IOError) as e:
+                logger.warning(f"Failed to load {book_name}/{filename}: {e}")
+                continue
+
+        # Looked up by file, and a rewritten file's concepts keep their IDs and list positions
+        for concept in concepts.replace_file(book_name, filename, fresh):
+            search_index.remove(concept['id'])
+            replaced += 1
+        for concept in fresh:
+            search_index.add(concept)
+        added += len(fresh)
+
+    logger.info(f"Applied {len(changes)} changed concept files: {replaced} concepts replaced or removed, {added} indexed")
+
 
 @mcp.tool()
+@refresh_first(apply_outputs_changes)
 async def search_concepts(query: str, limit: int = 10) -> str:
     """Search programming concepts by keyword, topic, or description.
 
@@ -148,22 +291,12 @@ async def search_concepts(query: str, limit: int = 10) -> str:
         query: Search query (use '*' to list all concepts)
         limit: Maximum number of results to return (default: 10)
     """
-    query_lower = query.lower()
-
     if query == "*":
         # Return all concepts
         matching_concepts = concepts[:limit]
     else:
-        # Search concepts
-        matching_concepts = []
-        for concept in concepts:
-            if (query_lower in concept['title'].lower() or
-                    query_lower in concept['description'].lower() or
-                    query_lower in concept['content'].lower() or
-                    query_lower in concept['book_title'].lower()):
-                matching_concepts.append(concept)
-                if len(matching_concepts) >= limit:
-                    break
+        # Ranked search: any query word matches, best BM25 scores first
+        matching_concepts = [concept for concept, _ in search_index.search(query, limit)]
 
     if not matching_concepts:
         return f"No concepts found for query: '{query}'"
@@ -180,6 +313,7 @@ async def search_concepts(query: str, limit: int = 10) -> str:
 
 
 @mcp.tool()
+@refresh_first(apply_outputs_changes)
 async def search_by_book(book_name: str, query: str = "") -> str:
     """Search concepts within a specific book.
 
@@ -198,15 +332,9 @@ async def search_by_book(book_name: str, query: str = "") -> str:
     if not book_concepts:
         return f"No concepts found for book: {books_metadata[book_name]}"
 
-    # If query is provided, filter further
+    # If query is provided, filter further (concepts with every query word, most relevant first)
     if query:
-        query_lower = query.lower()
-        matching_concepts = []
-        for concept in book_concepts:
-            if (query_lower in concept['title'].lower() or
-                    query_lower in concept['description'].lower() or
-                    query_lower in concept['content'].lower()):
-                matching_concepts.append(concept)
+        matching_concepts = [concept for concept, _ in search_index.search(query, book=book_name, require_all=True)]
     else:
         matching_concepts = book_concepts
 
@@ -229,6 +357,7 @@ async def search_by_book(book_name: str, query: str = "") -> str:
 
 
 @mcp.tool()
+@refresh_first(apply_outputs_changes)
 async def find_advanced_concepts(topic: str, threshold: int = 2) -> str:
     """Finds advanced concepts related to a specific topic.
 
@@ -239,46 +368,21 @@ async def find_advanced_concepts(topic: str, threshold: int = 2) -> str:
         threshold: A score (default: 2) a concept must meet to be considered "advanced".
                    Higher values return more specialized concepts.
     """
-    # 1. Define our heuristics for what makes a concept "advanced"
-    ADVANCED_KEYWORDS = [
-        'advanced', 'internals', 'optimization', 'low-level', 'kernel', 'complex',
-        'performance', 'architecture', 'concurrent', 'asynchronous', 'memory layout',
-        'virtual memory', 'system call', 'linking', 'loading', 'multithreading',
-        'synchronization', 'parallelism', 'cache coherence', 'memory alignment',
-        'interrupts', 'scheduling', 'file systems', 'network stack', 'garbage collection',
-        'instruction pipelining', 'branch prediction', 'memory paging', 'context switching',
-        'atomic operations', 'lock-free programming', 'syscalls',
-        'dynamic linking', 'static analysis',
-        'memory fences', 'thread affinity', 'heap management', 'GOT', 'TLB',
-        'page table', 'segment'
-    ]
-    BOOK_WEIGHTS = {
-        "linkers_loaders": 3,
-        "expert_c_programming": 3,  # Expert C Programming is advanced
-        "unix_env": 2,
-        "os_three_pieces": 2,
-        "kernighan_ritchie": 0  # K&R is foundational, so less inherently "advanced"
-    }
-
     # 2. Search for concepts matching the topic and calculate their "advanced score"
     advanced_matches = []
     topic_lower = topic.lower()
 
     for concept in concepts:
-        concept_text = (concept['title'] + ' ' + concept['description'] + ' ' + concept['content']).lower()
-
         # First, ensure the concept is relevant to the topic at all
-        if topic_lower not in concept_text:
+        if topic_lower not in concept['search_text']:
             continue
 
         # Calculate the advanced score
         advanced_score = 0
         # Add points for being from an advanced book
         advanced_score += BOOK_WEIGHTS.get(concept['book'], 0)
-        # Add points for each advanced keyword found
-        for keyword in ADVANCED_KEYWORDS:
-            if keyword in concept_text:
-                advanced_score += 1
+        # Add a point for each advanced keyword found (bits precomputed in normalize_concept)
+        advanced_score += bin(concept['advanced_bits']).count('1')
 
         # Only include concepts that meet our threshold
         if advanced_score >= threshold:
@@ -303,6 +407,7 @@ async def find_advanced_concepts(topic: str, threshold: int = 2) -> str:
 
 
 @mcp.tool()
+@refresh_first(apply_outputs_changes)
 async def find_code_examples(pattern: str = "") -> str:
     """Find all concepts that contain actual code examples.
 
@@ -360,6 +465,7 @@ async def find_code_examples(pattern: str = "") -> str:
 
 
 @mcp.tool()
+@refresh_first(apply_outputs_changes)
 async def compare_concepts(concept1_id: str, concept2_id: str) -> str:
     """Compare two concepts side-by-side.
 
@@ -368,14 +474,7 @@ async def compare_concepts(concept1_id: str, concept2_id: str) -> str:
         concept2_id: ID of the second concept to compare
     """
     # Find both concepts
-    concept1 = None
-    concept2 = None
-
-    for c in concepts:
-        if c['id'] == concept1_id:
-            concept1 = c
-        elif c['id'] == concept2_id:
-            concept2 = c
+    concept1, concept2 = concepts.get_many([concept1_id, concept2_id])
 
     if not concept1:
         return f"First concept not found: {concept1_id}"
@@ -444,6 +543,7 @@ async def compare_concepts(concept1_id: str, concept2_id: str) -> str:
 
 
 @mcp.tool()
+@refresh_first(apply_outputs_changes)
 async def generate_study_path(goal: str) -> str:
     """Create ordered learning sequence for a programming goal.
 
@@ -478,8 +578,7 @@ async def generate_study_path(goal: str) -> str:
     # Find concepts matching the keywords
     relevant_concepts = []
     for concept in concepts:
-        concept_text = (concept['title'] + ' ' + concept['description'] + ' ' + concept['content']).lower()
-        relevance_score = sum(1 for keyword in relevant_keywords if keyword in concept_text)
+        relevance_score = sum(1 for keyword in relevant_keywords if keyword in concept['search_text'])
 
         if relevance_score > 0:
             relevant_concepts.append((concept, relevance_score))
@@ -501,7 +600,7 @@ async def generate_study_path(goal: str) -> str:
     advanced_concepts = []
 
     for concept, score in relevant_concepts:
-        concept_text = concept['title'].lower() + ' ' + concept['description'].lower()
+        concept_text = concept['title_lower'] + ' ' + concept['description_lower']
 
         # Simple heuristic for complexity
         if any(word in concept_text for word in ['basic', 'introduction', 'overview', 'simple']):
@@ -550,6 +649,7 @@ async def generate_study_path(goal: str) -> str:
 
 
 @mcp.tool()
+@refresh_first(apply_outputs_changes)
 async def explain_my_code(code_snippet: str, language: str = "C") -> str:
     """Analyze code using concepts from your knowledge base.
 
@@ -586,12 +686,11 @@ async def explain_my_code(code_snippet: str, language: str = "C") -> str:
     # Find concepts that match the identified keywords
     relevant_concepts = []
     for concept in concepts:
-        concept_text = (concept['title'] + ' ' + concept['description'] + ' ' + concept['content']).lower()
-        relevance_score = sum(1 for keyword in code_keywords if keyword in concept_text)
+        relevance_score = sum(1 for keyword in code_keywords if keyword in concept['search_text'])
 
         # Also check if concept has similar code patterns
         if concept['syntax']:
-            syntax_lower = concept['syntax'].lower()
+            syntax_lower = concept['syntax_lower']
             code_similarity = sum(1 for line in code_snippet.split('\n')
                                   if any(word in syntax_lower for word in line.split() if len(word) > 2))
             relevance_score += code_similarity * 0.5
@@ -621,7 +720,7 @@ async def explain_my_code(code_snippet: str, language: str = "C") -> str:
         result_text += f"   {concept['description'][:150] if concept['description'] else 'No description'}{'...' if len(concept.get('description', '')) > 150 else ''}\n"
 
         # Show relevant code if available
-        if concept['syntax'] and any(keyword in concept['syntax'].lower() for keyword in code_keywords):
+        if concept['syntax'] and any(keyword in concept['syntax_lower'] for keyword in code_keywords):
             code_preview = concept['syntax'].strip().split('\n')[:2]
             result_text += f"   ```c\n   {chr(10).join(code_preview)}\n   ```\n"
 
@@ -650,6 +749,7 @@ async def explain_my_code(code_snippet: str, language: str = "C") -> str:
 
 
 @mcp.tool()
+@refresh_first(apply_outputs_changes)
 async def get_concept_details(concept_id: str) -> str:
     """Get detailed information about a specific concept.
 
@@ -657,11 +757,7 @@ async def get_concept_details(concept_id: str) -> str:
         concept_id: The ID of the concept to retrieve
     """
     # Find the concept
-    concept = None
-    for c in concepts:
-        if c['id'] == concept_id:
-            concept = c
-            break
+    concept = concepts.get(concept_id)
 
     if not concept:
         return f"Concept not found: {concept_id}"
@@ -690,6 +786,7 @@ async def get_concept_details(concept_id: str) -> str:
 
 
 @mcp.tool()
+@refresh_first(apply_outputs_changes)
 async def generate_reference_sheet(topic: str, format: str = "markdown") -> str:
     """Generate a formatted reference sheet for a specific topic.
 
@@ -702,15 +799,8 @@ async def generate_reference_sheet(topic: str, format: str = "markdown") -> str:
     if not concepts:
         return "No concepts available"
 
-    # Search for relevant concepts
-    topic_lower = topic.lower()
-    relevant_concepts = []
-
-    for concept in concepts:
-        if (topic_lower in concept['title'].lower() or
-                topic_lower in concept['description'].lower() or
-                topic_lower in concept['content'].lower()):
-            relevant_concepts.append(concept)
+    # Search for relevant concepts, most relevant first within each book
+    relevant_concepts = [concept for concept, _ in search_index.search(topic, require_all=True)]
 
     if not relevant_concepts:
         return f"No concepts found for topic: {topic}"
@@ -732,6 +822,7 @@ async def generate_reference_sheet(topic: str, format: str = "markdown") -> str:
         return _generate_text_reference(topic, by_book)
 
 @mcp.tool()
+@refresh_first(apply_outputs_changes)
 async def synthesize_concepts(topic: str, max_sources: int = 5) -> str:
     """AI-powered synthesis: Combine concepts from multiple books into comprehensive explanation.
     
@@ -747,9 +838,9 @@ async def synthesize_concepts(topic: str, max_sources: int = 5) -> str:
     
     for concept in concepts:
         # Calculate relevance score using multiple factors
-        title_score = 2.0 if topic_lower in concept['title'].lower() else 0.0
-        desc_score = 1.5 if topic_lower in concept['description'].lower() else 0.0
-        content_score = 1.0 if topic_lower in concept['content'].lower() else 0.0
+        title_score = 2.0 if topic_lower in concept['title_lower'] else 0.0
+        desc_score = 1.5 if topic_lower in concept['description_lower'] else 0.0
+        content_score = 1.0 if topic_lower in concept['content_lower'] else 0.0
         
         # Boost score for certain books based on topic
         book_boost = {
@@ -897,9 +988,8 @@ async def synthesize_concepts(topic: str, max_sources: int = 5) -> str:
     for book_concepts in concepts_by_book.values():
         for concept, _ in book_concepts:
             # Extract potential related topics from content
-            content_words = (concept['content'] + ' ' + concept['description']).lower().split()
             for word in ['memory', 'pointer', 'process', 'thread', 'file', 'system', 'kernel', 'linking']:
-                if word in content_words and word != topic_lower:
+                if word in concept['words'] and word != topic_lower:
                     related_topics.add(word)
     
     if related_topics:
@@ -913,6 +1003,7 @@ async def synthesize_concepts(topic: str, max_sources: int = 5) -> str:
 
 
 @mcp.tool()
+@refresh_first(apply_outputs_changes)
 async def generate_custom_tutorial(topic: str, skill_level: str = "intermediate") -> str:
     """Generate a custom tutorial by merging related concepts across books.
     
@@ -932,11 +1023,11 @@ async def generate_custom_tutorial(topic: str, skill_level: str = "intermediate"
     advanced_concepts = []
     
     for concept in concepts:
-        if topic_lower in concept['title'].lower() or topic_lower in concept['description'].lower():
+        if topic_lower in concept['title_lower'] or topic_lower in concept['description_lower']:
             # Categorize based on book and content
-            if concept['book'] == 'kernighan_ritchie' or 'basic' in concept['title'].lower():
+            if concept['book'] == 'kernighan_ritchie' or 'basic' in concept['title_lower']:
                 beginner_concepts.append(concept)
-            elif concept['book'] == 'expert_c_programming' or 'advanced' in concept['title'].lower():
+            elif concept['book'] == 'expert_c_programming' or 'advanced' in concept['title_lower']:
                 advanced_concepts.append(concept)
             else:
                 intermediate_concepts.append(concept)
@@ -1028,48 +1119,33 @@ async def generate_custom_tutorial(topic: str, skill_level: str = "intermediate"
 
 
 @mcp.tool()
+@refresh_first(apply_outputs_changes)
 async def create_best_practices_guide(topic: str) -> str:
     """Analyze patterns across all sources to generate best practices guide.
     
     Args:
         topic: The topic to analyze for best practices (e.g., 'error handling', 'memory management')
     """
-    topic_lower = topic.lower()
-    
-    # Collect all relevant concepts
-    relevant_concepts = []
-    for concept in concepts:
-        relevance_score = 0
-        if topic_lower in concept['title'].lower():
-            relevance_score += 3
-        if topic_lower in concept['description'].lower():
-            relevance_score += 2
-        if topic_lower in concept['content'].lower():
-            relevance_score += 1
-            
-        if relevance_score > 0:
-            relevant_concepts.append((concept, relevance_score))
+    # Collect the most relevant concepts (BM25, title > description > content)
+    relevant_concepts = search_index.search(topic, 20, require_all=True)
     
     if not relevant_concepts:
         return f"No concepts found to generate best practices for '{topic}'"
     
-    # Sort by relevance
-    relevant_concepts.sort(key=lambda x: x[1], reverse=True)
-    
     # Analyze patterns across books
     patterns_by_book = {}
     code_patterns = []
     common_recommendations = []
     pitfalls = []
     
-    for concept, _ in relevant_concepts[:20]:  # Top 20 concepts
+    for concept, _ in relevant_concepts:  # Top 20 concepts
         book = concept['book']
         if book not in patterns_by_book:
             patterns_by_book[book] = []
         patterns_by_book[book].append(concept)
         
         # Extract patterns from content
-        content = (concept['content'] + ' ' + concept['description']).lower()
+        content = concept['content_lower'] + ' ' + concept['description_lower']
         
         # Look for recommendations
         if any(word in content for word in ['should', 'must', 'always', 'recommend']):
@@ -1317,7 +1393,7 @@ def _generate_text_reference(topic: str, by_book: dict) -> str:
 
 
 # Initialize the concepts database when the module loads
-build_concept_index()
+load_concept_index()
 logger.info("Programming Concepts MCP Server initialized")
 
 if __name__ == "__main__":
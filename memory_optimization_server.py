@@ -19,8 +19,13 @@ import logging
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
+from collections import defaultdict
 from fastmcp import FastMCP
 
+from core.concept_store import open_concept_store, STORE_FILENAME, CONCEPT_FILE_GLOB
+from core.concept_table import ConceptTable
+from core.outputs_watcher import OutputsWatcher, refresh_first, overlay_changed_files
+
 # Initialize MCP server
 mcp = FastMCP("Memory Optimization Server")
 
@@ -29,7 +34,9 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("memory-optimization-mcp")
 
 # Global concepts storage
-concepts = []
+concepts = ConceptTable()
+outputs_watcher = None  # started with load_concepts(); reports concept files the cron runs write
+MEMORY_RELATED_BOOKS = ["os_three_pieces", "expert_c_programming", "kernighan_ritchie"]
 books_metadata = {
     "memory_optimization": "Memory Optimization and Cache Performance"
 }
@@ -86,69 +93,93 @@ MEMORY_PATTERNS = {
     ]
 }
 
-def load_concepts():
+def iter_book_concepts(outputs_dir, book_names, changes=None):
+    """(book, filename, concept) per book: one concept store query, JSON files for books not in it
+
+    changes: outputs watcher changes whose files may be ahead of their store rows
+    """
+    store = open_concept_store(outputs_dir / STORE_FILENAME)
+    stored = defaultdict(list)
+    if store:
+        rows = store.concepts(book_names)
+        for book_name, filename, concept_data in overlay_changed_files(outputs_dir, rows, changes or {},
+                                                                       {book for book, _, _ in rows}):
+            stored[book_name].append((filename, concept_data))
+
+    for book_name in book_names:
+        if book_name in stored:
+            for filename, concept_data in stored[book_name]:
+                yield book_name, filename, concept_data
+            continue
+
+        book_dir = outputs_dir / book_name
+        if not book_dir.exists():
+            continue
+        for concept_file in book_dir.glob(CONCEPT_FILE_GLOB):
+            try:
+                with open(concept_file, 'r', encoding='utf-8') as f:
+                    concept_data = json.load(f)
+            except Exception as e:
+                logger.warning(f"Could not load {concept_file}: {e}")
+                continue
+            yield book_name, concept_file.name, concept_data
+
+def load_concepts(changes=None):
     """Load memory optimization concepts from existing book outputs and samples"""
-    global concepts
-    concepts = []
+    loaded = []
     
     # Load from existing book outputs first (prioritized)
     outputs_dir = Path("outputs")
-    memory_related_books = ["os_three_pieces", "expert_c_programming", "kernighan_ritchie"]
+    memory_related_books = MEMORY_RELATED_BOOKS
     
     loaded_from_books = 0
     
     if outputs_dir.exists():
-        for book_name in memory_related_books:
-            book_dir = outputs_dir / book_name
-            if book_dir.exists():
-                for concept_file in book_dir.glob("concept_*.json"):
-                    try:
-                        with open(concept_file, 'r', encoding='utf-8') as f:
-                            concept_data = json.load(f)
-                            
-                        # Filter for memory-related concepts
-                        topic_lower = concept_data.get('topic', '').lower()
-                        explanation_lower = concept_data.get('explanation', '').lower()
-                        
-                        memory_keywords = [
-                            'cache', 'memory', 'tlb', 'virtual', 'page', 'locality', 
-                            'optimization', 'performance', 'malloc', 'free', 'alignment',
-                            'prefetch', 'bandwidth', 'latency', 'hierarchy', 'stride'
-                        ]
-                        
-                        is_memory_related = any(keyword in topic_lower or keyword in explanation_lower 
-                                              for keyword in memory_keywords)
-                        
-                        if is_memory_related:
-                            concept_id = f"{book_name}_{concept_file.stem}_{loaded_from_books}"
-                            
-                            # Map to memory optimization server format
-                            concept = {
-                                'id': concept_id,
-                                'title': concept_data.get('topic', 'Unknown Concept'),
-                                'description': concept_data.get('explanation', ''),
-                                'content': concept_data.get('explanation', ''),
-                                'category': f"book_{book_name}",
-                                'difficulty_level': 'intermediate',  # Default
-                                'syntax': concept_data.get('syntax', ''),
-                                'book': book_name,
-                                'book_title': books_metadata.get(book_name, book_name),
-                                'source_file': concept_file.name,
-                                'raw_data': concept_data
-                            }
-                            
-                            # Add code examples if available
-                            if concept_data.get('code_example'):
-                                if isinstance(concept_data['code_example'], list):
-                                    concept['syntax'] = '\n'.join(concept_data['code_example'])
-                                else:
-                                    concept['syntax'] = str(concept_data['code_example'])
-                            
-                            concepts.append(concept)
-                            loaded_from_books += 1
-                            
-                    except Exception as e:
-                        logger.warning(f"Could not load {concept_file}: {e}")
+        for book_name, filename, concept_data in iter_book_concepts(outputs_dir, memory_related_books, changes):
+            try:
+                # Filter for memory-related concepts
+                topic_lower = concept_data.get('topic', '').lower()
+                explanation_lower = concept_data.get('explanation', '').lower()
+                
+                memory_keywords = [
+                    'cache', 'memory', 'tlb', 'virtual', 'page', 'locality', 
+                    'optimization', 'performance', 'malloc', 'free', 'alignment',
+                    'prefetch', 'bandwidth', 'latency', 'hierarchy', 'stride'
+                ]
+                
+                is_memory_related = any(keyword in topic_lower or keyword in explanation_lower 
+                                      for keyword in memory_keywords)
+                
+                if is_memory_related:
+                    concept_id = f"{book_name}_{Path(filename).stem}_{loaded_from_books}"
+                    
+                    # Map to memory optimization server format
+                    concept = {
+                        'id': concept_id,
+                        'title': concept_data.get('topic', 'Unknown Concept'),
+                        'description': concept_data.get('explanation', ''),
+                        'content': concept_data.get('explanation', ''),
+                        'category': f"book_{book_name}",
+                        'difficulty_level': 'intermediate',  # Default
+                        'syntax': concept_data.get('syntax', ''),
+                        'book': book_name,
+                        'book_title': books_metadata.get(book_name, book_name),
+                        'source_file': filename,
+                        'raw_data': concept_data
+                    }
+                    
+                    # Add code examples if available
+                    if concept_data.get('code_example'):
+                        if isinstance(concept_data['code_example'], list):
+                            concept['syntax'] = '\n'.join(concept_data['code_example'])
+                        else:
+                            concept['syntax'] = str(concept_data['code_example'])
+                    
+                    loaded.append(concept)
+                    loaded_from_books += 1
+                    
+            except Exception as e:
+                logger.warning(f"Could not load {book_name}/{filename}: {e}")
     
     logger.info(f"Loaded {loaded_from_books} memory-related concepts from existing books")
     
@@ -317,75 +348,69 @@ def load_concepts():
             ]
         }
     ]
+    concepts.reload(loaded)
 
-def load_concepts():
+def load_concepts(changes=None):
     """Load memory optimization concepts from existing book outputs and samples"""
-    global concepts
-    concepts = []
+    loaded = []
     
     # Load from existing book outputs first (prioritized)
     outputs_dir = Path("outputs")
-    memory_related_books = ["os_three_pieces", "expert_c_programming", "kernighan_ritchie"]
+    memory_related_books = MEMORY_RELATED_BOOKS
     
     loaded_from_books = 0
     
     if outputs_dir.exists():
-        for book_name in memory_related_books:
-            book_dir = outputs_dir / book_name
-            if book_dir.exists():
-                for concept_file in book_dir.glob("concept_*.json"):
-                    try:
-                        with open(concept_file, 'r', encoding='utf-8') as f:
-                            concept_data = json.load(f)
-                            
-                        # Filter for memory-related concepts
-                        topic_lower = concept_data.get('topic', '').lower()
-                        explanation_lower = concept_data.get('explanation', '').lower()
-                        
-                        memory_keywords = [
-                            'cache', 'memory', 'tlb', 'virtual', 'page', 'locality', 
-                            'optimization', 'performance', 'malloc', 'free', 'alignment',
-                            'prefetch', 'bandwidth', 'latency', 'hierarchy', 'stride'
-                        ]
-                        
-                        is_memory_related = any(keyword in topic_lower or keyword in explanation_lower 
-                                              for keyword in memory_keywords)
-                        
-                        if is_memory_related:
-                            concept_id = f"{book_name}_{concept_file.stem}_{loaded_from_books}"
-                            
-                            # Map to memory optimization server format with safe dictionary access
-                            concept = {
-                                'id': concept_id,
-                                'title': concept_data.get('topic', 'Unknown Concept'),
-                                'description': concept_data.get('explanation', ''),
-                                'content': concept_data.get('explanation', ''),
-                                'category': f"book_{book_name}",
-                                'difficulty_level': concept_data.get('difficulty_level', 'intermediate'),
-                                'syntax': concept_data.get('syntax', ''),
-                                'book': book_name,
-                                'book_title': books_metadata.get(book_name, book_name),
-                                'source_file': concept_file.name,
-                                'memory_impact': concept_data.get('memory_impact', {}),
-                                'optimization_techniques': concept_data.get('optimization_techniques', []),
-                                'performance_metrics': concept_data.get('performance_metrics', {}),
-                                'related_concepts': concept_data.get('related_concepts', []),
-                                'detection_patterns': concept_data.get('detection_patterns', []),
-                                'raw_data': concept_data
-                            }
-                            
-                            # Add code examples if available
-                            if concept_data.get('code_example'):
-                                if isinstance(concept_data['code_example'], list):
-                                    concept['syntax'] = '\n'.join(concept_data['code_example'])
-                                else:
-                                    concept['syntax'] = str(concept_data['code_example'])
-                            
-                            concepts.append(concept)
-                            loaded_from_books += 1
-                            
-                    except Exception as e:
-                        logger.warning(f"Could not load {concept_file}: {e}")
+        for book_name, filename, concept_data in iter_book_concepts(outputs_dir, memory_related_books, changes):
+            try:
+                # Filter for memory-related concepts
+                topic_lower = concept_data.get('topic', '').lower()
+                explanation_lower = concept_data.get('explanation', '').lower()
+                
+                memory_keywords = [
+                    'cache', 'memory', 'tlb', 'virtual', 'page', 'locality', 
+                    'optimization', 'performance', 'malloc', 'free', 'alignment',
+                    'prefetch', 'bandwidth', 'latency', 'hierarchy', 'stride'
+                ]
+                
+                is_memory_related = any(keyword in topic_lower or keyword in explanation_lower 
+                                      for keyword in memory_keywords)
+                
+                if is_memory_related:
+                    concept_id = f"{book_name}_{Path(filename).stem}_{loaded_from_books}"
+                    
+                    # Map to memory optimization server format with safe dictionary access
+                    concept = {
+                        'id': concept_id,
+                        'title': concept_data.get('topic', 'Unknown Concept'),
+                        'description': concept_data.get('explanation', ''),
+                        'content': concept_data.get('explanation', ''),
+                        'category': f"book_{book_name}",
+                        'difficulty_level': concept_data.get('difficulty_level', 'intermediate'),
+                        'syntax': concept_data.get('syntax', ''),
+                        'book': book_name,
+                        'book_title': books_metadata.get(book_name, book_name),
+                        'source_file': filename,
+                        'memory_impact': concept_data.get('memory_impact', {}),
+                        'optimization_techniques': concept_data.get('optimization_techniques', []),
+                        'performance_metrics': concept_data.get('performance_metrics', {}),
+                        'related_concepts': concept_data.get('related_concepts', []),
+                        'detection_patterns': concept_data.get('detection_patterns', []),
+                        'raw_data': concept_data
+                    }
+                    
+                    # Add code examples if available
+                    if concept_data.get('code_example'):
+                        if isinstance(concept_data['code_example'], list):
+                            concept['syntax'] = '\n'.join(concept_data['code_example'])
+                        else:
+                            concept['syntax'] = str(concept_data['code_example'])
+                    
+                    loaded.append(concept)
+                    loaded_from_books += 1
+                    
+            except Exception as e:
+                logger.warning(f"Could not load {book_name}/{filename}: {e}")
     
     logger.info(f"Loaded {loaded_from_books} memory-related concepts from existing books")
     
@@ -619,8 +644,9 @@ def load_concepts():
             'book_title': books_metadata['memory_optimization'],
             'raw_data': concept_data
         }
-        concepts.append(concept)
+        loaded.append(concept)
     
+    concepts.reload(loaded)
     logger.info(f"Total memory optimization concepts loaded: {len(concepts)} ({loaded_from_books} from books, {len(sample_concepts)} samples)")
         
 def analyze_code_patterns(code: str) -> Dict[str, List[str]]:
@@ -699,10 +725,18 @@ def generate_optimization_suggestions(analysis: MemoryAnalysis, code: str) -> Li
     
     return suggestions
 
-# Load concepts on startup
+def refresh_concepts():
+    """Reload once the outputs watcher has seen concept files of the memory-related books change"""
+    changes = outputs_watcher.changes() if outputs_watcher is not None else None
+    if changes:
+        load_concepts(changes)
+
+# Load concepts on startup (watching first, so nothing written meanwhile is missed)
+outputs_watcher = OutputsWatcher(Path("outputs"), MEMORY_RELATED_BOOKS).start()
 load_concepts()
 
 @mcp.tool()
+@refresh_first(refresh_concepts)
 async def search_concepts(query: str, limit: int = 10) -> str:
     """Search memory optimization concepts by keyword, topic, or description.
     
@@ -740,6 +774,7 @@ async def search_concepts(query: str, limit: int = 10) -> str:
     return result_text
 
 @mcp.tool()
+@refresh_first(refresh_concepts)
 async def analyze_memory_patterns(code_snippet: str, language: str = "c") -> str:
     """Analyze code for memory access patterns and cache behavior.
     
@@ -822,6 +857,7 @@ async def analyze_memory_patterns(code_snippet: str, language: str = "c") -> str
         return f"Error analyzing memory patterns: {str(e)}"
 
 @mcp.tool()
+@refresh_first(refresh_concepts)
 async def suggest_cache_optimizations(code_snippet: str, target_architecture: str = "x86_64") -> str:
     """Provide specific cache optimization recommendations.
     
@@ -910,7 +946,8 @@ async def suggest_cache_optimizations(code_snippet: str, target_architecture: st
     except Exception as e:
         return f"Error generating cache optimizations: {str(e)}"
 
-@mcp.tool() 
+@mcp.tool()
+@refresh_first(refresh_concepts)
 async def detect_tlb_issues(code_snippet: str, page_size: str = "4kb") -> str:
     """Identify potential TLB thrashing and page table inefficiencies.
     
@@ -1001,6 +1038,7 @@ async def detect_tlb_issues(code_snippet: str, page_size: str = "4kb") -> str:
         return f"Error detecting TLB issues: {str(e)}"
 
 @mcp.tool()
+@refresh_first(refresh_concepts)
 async def explain_memory_concept(concept_name: str) -> str:
     """Detailed explanation of memory optimization concepts.
     
@@ -1077,6 +1115,7 @@ async def explain_memory_concept(concept_name: str) -> str:
     return result
 
 @mcp.tool()
+@refresh_first(refresh_concepts)
 async def generate_optimization_checklist(optimization_type: str) -> str:
     """Create step-by-step optimization guides.
     
@@ -1259,6 +1298,7 @@ async def generate_optimization_checklist(optimization_type: str) -> str:
     return result
 
 @mcp.tool()
+@refresh_first(refresh_concepts)
 async def compare_memory_techniques(technique1: str, technique2: str) -> str:
     """Side-by-side comparison of optimization approaches.
     
@@ -1344,6 +1384,7 @@ async def compare_memory_techniques(technique1: str, technique2: str) -> str:
     return result
 
 @mcp.tool()
+@refresh_first(refresh_concepts)
 async def create_optimization_plan(code_snippet: str, performance_target: str) -> str:
     """Generate comprehensive optimization strategy.
     
@@ -1460,6 +1501,7 @@ async def create_optimization_plan(code_snippet: str, performance_target: str) -
         return f"Error creating optimization plan: {str(e)}"
 
 @mcp.tool()
+@refresh_first(refresh_concepts)
 async def get_concept_details(concept_id: str) -> str:
     """Get detailed information about a specific memory optimization concept.
     
@@ -1467,11 +1509,7 @@ async def get_concept_details(concept_id: str) -> str:
         concept_id: Unique identifier of the concept
     """
     # Find concept by ID
-    concept = None
-    for c in concepts:
-        if c['id'] == concept_id:
-            concept = c
-            break
+    concept = concepts.get(concept_id)
     
     if not concept:
         return f"Concept with ID '{concept_id}' not found"
@@ -1480,6 +1518,7 @@ async def get_concept_details(concept_id: str) -> str:
     return await explain_memory_concept(concept['title'])
 
 @mcp.tool()
+@refresh_first(refresh_concepts)
 async def list_all_concepts() -> str:
     """List all available memory optimization concepts."""
     if not concepts:
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Concept Batching Module
+Extracted from the Content-Intelligent C Concept Extraction Engine
+
+Packs several concept candidates into one LLM request. The long extraction
+preamble of a processor prompt is sent once, followed by numbered content
+sections, and the model answers with a JSON array that is mapped back to
+the candidates (and so to their page ranges). Batches are sized by a prompt
+token budget; anything a batch fails to return falls back to a
+single-concept call.
+"""
+
+import re
+import json
+
+from processors.response_cache import cached_completion
+
+CONTENT_MARKER = "CONTENT TO PROCESS:"
+CONTENT_SLOT = "\x00CONTENT_SLOT\x00"
+DEFAULT_MAX_BATCH_SIZE = 4
+CHARS_PER_TOKEN = 4  # rough English/code average, good enough for budgeting
+
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def split_prompt_template(processor, concept_data):
+    """Return (preamble, suffix) around the content of a processor prompt
+
+    None when the prompt does not follow the CONTENT TO PROCESS layout.
+    """
+    template = processor._concept_prompt(concept_data, CONTENT_SLOT)
+    if template.count(CONTENT_SLOT) != 1:
+        return None
+
+    head, suffix = template.split(CONTENT_SLOT)
+    if CONTENT_MARKER not in head:
+        return None
+
+    preamble = head.rsplit(CONTENT_MARKER, 1)[0]
+    return preamble, suffix.strip()
+
+
+def plan_batches(concepts, templates, token_budget, max_batch_size=DEFAULT_MAX_BATCH_SIZE):
+    """Group candidate indexes into batches that share a preamble and fit the budget"""
+    batches = []
+    current = []
+    current_tokens = 0
+
+    for i, concept in enumerate(concepts):
+        content_tokens = estimate_tokens(concept["raw_content"])
+        template = templates[i]
+
+        fits = (
+            current
+            and template is not None
+            and templates[current[0]] == template
+            and len(current) < max_batch_size
+            and current_tokens + content_tokens <= token_budget
+        )
+        if fits:
+            current.append(i)
+            current_tokens += content_tokens
+            continue
+
+        if current:
+            batches.append(current)
+        current = [i]
+        current_tokens = (estimate_tokens(template[0]) if template else 0) + content_tokens
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def build_batch_prompt(preamble, suffix, concepts):
+    """Single shared preamble followed by numbered content sections"""
+    count = len(concepts)
+    sections = "\n\n".join(
+        f"=== CONTENT SECTION {number} (pages {concept['page_range']}) ===\n{concept['raw_content']}"
+        for number, concept in enumerate(concepts, 1)
+    )
+    closing = suffix.replace("as JSON:", "for every section as a JSON array:") if "as JSON:" in suffix else suffix
+
+    return f"""{preamble.rstrip()}
+
+BATCH MODE: The content below is split into {count} independent CONTENT SECTIONS.
+Apply every instruction above to EACH section separately: one atomic concept per section.
+Return a JSON array of exactly {count} objects in section order. Each object uses the
+exact format above plus an "index" field holding its section number (1-{count}).
+
+{CONTENT_MARKER}
+{sections}
+
+{closing}"""
+
+
+def parse_batch_response(response_text, count):
+    """Map a JSON-array reply back to section positions; None if unusable"""
+    json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
+    if not json_match:
+        return None
+
+    try:
+        items = json.loads(json_match.group())
+    except json.JSONDecodeError as e:
+        print(f"Failed to parse batch JSON: {e}")
+        return None
+
+    if not isinstance(items, list):
+        return None
+
+    results = [None] * count
+    for position, item in enumerate(items):
+        if not isinstance(item, dict):
+            continue
+        index = item.pop("index", position + 1)
+        if isinstance(index, int) and 1 <= index <= count and results[index - 1] is None:
+            results[index - 1] = item
+
+    # Cache only replies that answered every section
+    return results if all(results) else None
+
+
+def process_concepts_batched(processor, concepts, call, model, temperature, max_tokens,
+                             token_budget, max_batch_size=DEFAULT_MAX_BATCH_SIZE):
+    """Process candidates in token-budgeted batches; results align with concepts
+
+    call(prompt, max_tokens, batch=True) performs one raw completion for the processor;
+    model / temperature / max_tokens are its single-concept settings.
+    """
+    templates = [split_prompt_template(processor, concept) for concept in concepts]
+    results = [None] * len(concepts)
+
+    for batch in plan_batches(concepts, templates, token_budget, max_batch_size):
+        if len(batch) == 1:
+            results[batch[0]] = processor.process_concept(concepts[batch[0]])
+            continue
+
+        batch_concepts = [concepts[i] for i in batch]
+        preamble, suffix = templates[batch[0]]
+        prompt = build_batch_prompt(preamble, suffix, batch_concepts)
+        batch_max_tokens = max_tokens * len(batch) if max_tokens else None
+        print(f"📦 Batched {len(batch)} concepts into one request (~{estimate_tokens(prompt)} prompt tokens)")
+
+        try:
+            parsed, cache_hit = cached_completion(
+                processor.response_cache, model, prompt, temperature, batch_max_tokens,
+                lambda batch_prompt: call(batch_prompt, batch_max_tokens, batch=True),
+                lambda text: parse_batch_response(text, len(batch))
+            )
+        except Exception as e:
+            print(f"Error processing concept batch: {e}")
+            parsed, cache_hit = None, False
+
+        if parsed is None:
+            print(f"↩️  Batch response unusable, falling back to {len(batch)} single-concept calls")
+            for i in batch:
+                results[i] = processor.process_concept(concepts[i])
+            continue
+
+        for i, parsed_concept in zip(batch, parsed):
+            results[i] = processor._attach_metadata(parsed_concept, concepts[i], cache_hit)
+
+    return results
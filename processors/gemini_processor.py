@@ -11,26 +11,59 @@ import json
 import re
 import os
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
 import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+
+from processors.response_cache import cached_completion
+from processors.batching import process_concepts_batched, estimate_tokens, DEFAULT_MAX_BATCH_SIZE
+from processors.rate_limiter import get_rate_limiter, RateLimitError, TransientAPIError
+from processors.routing_processor import record_latency
+from processors.streaming import consume_stream
+from core.metrics import get_metrics, token_usage
 
 # Ensure we can find project root from anywhere
 PROJECT_ROOT = "/home/shahar42/Suumerizing_C_holy_grale_book"
 if PROJECT_ROOT not in sys.path:
     sys.path.append(PROJECT_ROOT)
 
+MAX_OUTPUT_TOKENS = 8192  # gemini-1.5-flash output limit
+
+
+def iter_stream_text(response):
+    """Text of each streamed chunk; chunks without parts (a MAX_TOKENS or SAFETY finish) are skipped
+
+    chunk.text raises ValueError on those, so the parts are read directly.
+    """
+    for chunk in response:
+        for candidate in chunk.candidates[:1]:
+            for part in candidate.content.parts:
+                if part.text:
+                    yield part.text
+
 
 class GeminiAtomicProcessor:
     """Processes raw content into atomic training data using Gemini"""
     
-    def __init__(self, api_key):
+    def __init__(self, api_key, response_cache=None, rate_limiter=None, stream=False, base_url=None):
         if not api_key:
             raise ValueError("API key is required")
         
+        self.model_name = 'gemini-1.5-flash'
+        self.max_tokens = 2048  # per-concept output cap; a batch gets this times its size
+        self.response_cache = response_cache
+        self.rate_limiter = rate_limiter or get_rate_limiter("gemini")
+        self.stream = stream  # stream single-concept replies through the incremental parser
+        
         try:
-            genai.configure(api_key=api_key)
-            self.model = genai.GenerativeModel('gemini-1.5-flash')
+            if base_url:
+                # REST transport so the SDK can target a plain HTTP endpoint (e.g. the mock server)
+                genai.configure(api_key=api_key, transport="rest", client_options={"api_endpoint": base_url})
+            else:
+                genai.configure(api_key=api_key)
+            self.model = genai.GenerativeModel(self.model_name)
             print(f"🤖 Gemini 1.5 Flash initialized successfully")
         except Exception as e:
             print(f"❌ Failed to initialize Gemini: {e}")
@@ -39,37 +72,94 @@ class GeminiAtomicProcessor:
     def process_concept(self, concept_data):
         """Transform raw concept into atomic training format"""
         
-        # Detect book context from metadata
-        source_title = concept_data.get("source_title", "")
-        book_context = self._detect_book_context(source_title, concept_data.get("raw_content", ""))
-        
-        prompt = self._build_atomic_extraction_prompt(
-            concept_data["raw_content"], 
-            book_context
-        )
+        prompt = self._concept_prompt(concept_data)
         
         try:
-            response = self.model.generate_content(prompt)
-            
-            # Parse Gemini's response into structured format
-            parsed_concept = self._parse_gemini_response(response.text)
-            
-            # Add metadata
-            parsed_concept["extraction_metadata"] = {
-                "source": concept_data.get("source_title", "Unknown Source"),
-                "page_range": concept_data["page_range"],
-                "extraction_date": datetime.now().isoformat(),
-                "has_code": concept_data["has_code"],
-                "has_explanation": concept_data["has_explanation"],
-                "book_context": book_context
-            }
+            # Parse Gemini's response into structured format (replayed from cache when possible)
+            # Default temperature, explicit output cap
+            parsed_concept, cache_hit = cached_completion(
+                self.response_cache, self.model_name, prompt, None, self.max_tokens,
+                lambda single_prompt: self._call_gemini_api(single_prompt, self.max_tokens, stream=self.stream),
+                self._parse_gemini_response
+            )
             
-            return parsed_concept
+            return self._attach_metadata(parsed_concept, concept_data, cache_hit)
             
         except Exception as e:
             print(f"Error processing concept: {e}")
             return None
     
+    def process_concepts(self, concepts, token_budget, max_batch_size=DEFAULT_MAX_BATCH_SIZE):
+        """Transform several raw concepts using batched requests (results align with input)"""
+        return process_concepts_batched(
+            self, concepts, self._call_gemini_api, self.model_name, None, self.max_tokens,
+            token_budget, max_batch_size
+        )
+    
+    def _concept_prompt(self, concept_data, raw_content=None):
+        """Context-aware prompt for one concept; raw_content overrides the concept text"""
+        # Detect book context from metadata
+        source_title = concept_data.get("source_title", "")
+        book_context = self._detect_book_context(source_title, concept_data.get("raw_content", ""))
+        
+        return self._build_atomic_extraction_prompt(
+            concept_data["raw_content"] if raw_content is None else raw_content,
+            book_context
+        )
+    
+    def _attach_metadata(self, parsed_concept, concept_data, cache_hit):
+        """Add extraction metadata to a parsed concept"""
+        source_title = concept_data.get("source_title", "")
+        parsed_concept["extraction_metadata"] = {
+            "source": concept_data.get("source_title", "Unknown Source"),
+            "page_range": concept_data["page_range"],
+            "extraction_date": datetime.now().isoformat(),
+            "has_code": concept_data["has_code"],
+            "has_explanation": concept_data["has_explanation"],
+            "book_context": self._detect_book_context(source_title, concept_data.get("raw_content", "")),
+            "response_cache_hit": cache_hit
+        }
+        
+        return parsed_concept
+    
+    def _call_gemini_api(self, prompt, max_tokens=None, stream=False, batch=False):
+        """Make API call to Gemini"""
+        if max_tokens:
+            max_tokens = min(max_tokens, MAX_OUTPUT_TOKENS)  # large batches stay within the model's limit
+        kwargs = {"generation_config": {"max_output_tokens": max_tokens}} if max_tokens else {}
+        
+        def send():
+            started = time.perf_counter()
+            try:
+                with get_metrics().span("llm_call", provider="gemini", model=self.model_name, stream=stream) as span:
+                    if stream:
+                        # The SDK cannot cancel a streamed generation: an early return stops reading
+                        # it, not the tokens the server still generates and bills
+                        response = self.model.generate_content(prompt, stream=True, **kwargs)
+                        text = consume_stream(iter_stream_text(response), "Gemini", started=started)
+                        # Counts as of the last chunk read (every chunk carries them)
+                        usage = getattr(response, "usage_metadata", None)
+                    else:
+                        response = self.model.generate_content(prompt, **kwargs)
+                        text = response.text
+                        usage = getattr(response, "usage_metadata", None)
+                    
+                    span.update(token_usage(
+                        prompt, text,
+                        getattr(usage, "prompt_token_count", None), getattr(usage, "candidates_token_count", None)
+                    ))
+                    # Network time only: the limiter's waits and retries happen outside send()
+                    record_latency("gemini", time.perf_counter() - started, batch)
+                    return text
+            except google_exceptions.ResourceExhausted as e:
+                raise RateLimitError(f"Gemini rate limited: {e}") from e
+            except (google_exceptions.ServiceUnavailable, google_exceptions.InternalServerError,
+                    google_exceptions.DeadlineExceeded) as e:
+                raise TransientAPIError(f"Gemini transient error: {e}") from e
+        
+        # Waits for quota, retries 429 / transient failures
+        return self.rate_limiter.call(send, estimate_tokens(prompt) + (max_tokens or 0))
+    
     def _detect_book_context(self, source_title, raw_content):
         """Detect which book we're processing to provide proper context"""
         source_lower = source_title.lower()
@@ -8,36 +8,52 @@ Processes raw content into atomic training data using X.AI's Grok AI.
 
 import json
 import re
+import time
 from datetime import datetime
-import requests
+
+from processors.http_client import get_http_client, format_timing, DEFAULT_POOL_SIZE
+from processors.response_cache import cached_completion
+from processors.batching import process_concepts_batched, estimate_tokens, DEFAULT_MAX_BATCH_SIZE
+from processors.rate_limiter import get_rate_limiter, check_response
+from processors.routing_processor import record_latency
+from processors.streaming import consume_stream, iter_sse_content
+from core.metrics import get_metrics, token_usage
 
 
 class GrokAtomicProcessor:
     """Processes raw content into atomic training data using Grok"""
     
-    def __init__(self, api_key):
+    def __init__(self, api_key, base_url="https://api.x.ai/v1", pool_size=DEFAULT_POOL_SIZE, probe_connection=False,
+                 response_cache=None, rate_limiter=None, stream=False):
         if not api_key:
             raise ValueError("API key is required")
         
         self.api_key = api_key
-        self.base_url = "https://api.x.ai/v1"
+        self.base_url = base_url
         self.model = "grok-3-mini"
+        self.temperature = 0.1  # Low temperature for consistent structured output
+        self.max_tokens = 4000
+        self.response_cache = response_cache
+        self.rate_limiter = rate_limiter or get_rate_limiter("grok")
+        self.stream = stream  # stream single-concept replies through the incremental parser
+        self.headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        # Keep-alive pool shared by every Grok processor in this process
+        self.http = get_http_client(self.base_url, pool_size)
         
         try:
-            # Test the API key with a simple request
-            self._test_connection()
+            # Probing costs a round trip; without it a bad key surfaces on the first concept
+            if probe_connection:
+                self._test_connection()
             print(f"🤖 Grok AI initialized successfully")
         except Exception as e:
             print(f"❌ Failed to initialize Grok: {e}")
             raise
     
     def _test_connection(self):
-        """Test API connection"""
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-        
+        """Test API connection (also warms a pooled connection)"""
         # Simple test payload
         test_payload = {
             "messages": [
@@ -47,12 +63,7 @@ class GrokAtomicProcessor:
             "max_tokens": 10
         }
         
-        response = requests.post(
-            f"{self.base_url}/chat/completions",
-            headers=headers,
-            json=test_payload,
-            timeout=10
-        )
+        response, _ = self.http.post_json("/chat/completions", test_payload, headers=self.headers, timeout=10)
         
         if response.status_code != 200:
             raise Exception(f"API test failed: {response.status_code} - {response.text}")
@@ -60,58 +71,90 @@ class GrokAtomicProcessor:
     def process_concept(self, concept_data):
         """Transform raw concept into atomic training format"""
         
-        prompt = self._build_atomic_extraction_prompt(concept_data["raw_content"])
+        prompt = self._concept_prompt(concept_data)
         
         try:
-            response_text = self._call_grok_api(prompt)
+            # Parse Grok's response into structured format (replayed from cache when possible)
+            parsed_concept, cache_hit = cached_completion(
+                self.response_cache, self.model, prompt, self.temperature, self.max_tokens,
+                lambda single_prompt: self._call_grok_api(single_prompt, stream=self.stream), self._parse_grok_response
+            )
             
-            # Parse Grok's response into structured format
-            parsed_concept = self._parse_grok_response(response_text)
-            
-            # Add metadata
-            parsed_concept["extraction_metadata"] = {
-                "source": "The C Programming Language - Kernighan & Ritchie",
-                "page_range": concept_data["page_range"],
-                "extraction_date": datetime.now().isoformat(),
-                "has_code": concept_data["has_code"],
-                "has_explanation": concept_data["has_explanation"]
-            }
-            
-            return parsed_concept
+            return self._attach_metadata(parsed_concept, concept_data, cache_hit)
             
         except Exception as e:
             print(f"Error processing concept: {e}")
             return None
     
-    def _call_grok_api(self, prompt):
-        """Make API call to Grok"""
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
+    def process_concepts(self, concepts, token_budget, max_batch_size=DEFAULT_MAX_BATCH_SIZE):
+        """Transform several raw concepts using batched requests (results align with input)"""
+        return process_concepts_batched(
+            self, concepts, self._call_grok_api, self.model, self.temperature, self.max_tokens,
+            token_budget, max_batch_size
+        )
+    
+    def _concept_prompt(self, concept_data, raw_content=None):
+        """Prompt for one concept; raw_content overrides the concept text"""
+        return self._build_atomic_extraction_prompt(
+            concept_data["raw_content"] if raw_content is None else raw_content
+        )
+    
+    def _attach_metadata(self, parsed_concept, concept_data, cache_hit):
+        """Add extraction metadata to a parsed concept"""
+        parsed_concept["extraction_metadata"] = {
+            "source": "The C Programming Language - Kernighan & Ritchie",
+            "page_range": concept_data["page_range"],
+            "extraction_date": datetime.now().isoformat(),
+            "has_code": concept_data["has_code"],
+            "has_explanation": concept_data["has_explanation"],
+            "response_cache_hit": cache_hit
         }
         
+        return parsed_concept
+    
+    def _call_grok_api(self, prompt, max_tokens=None, stream=False, batch=False):
+        """Make API call to Grok"""
         payload = {
             "messages": [
                 {"role": "user", "content": prompt}
             ],
             "model": self.model,
-            "max_tokens": 4000,
-            "temperature": 0.1,  # Low temperature for consistent structured output
-            "stream": False
+            "max_tokens": max_tokens or self.max_tokens,
+            "temperature": self.temperature,
+            "stream": stream
         }
+        if stream:
+            payload["stream_options"] = {"include_usage": True}  # real token counts in the last chunk
         
-        response = requests.post(
-            f"{self.base_url}/chat/completions",
-            headers=headers,
-            json=payload,
-            timeout=60
-        )
-        
-        if response.status_code != 200:
-            raise Exception(f"Grok API call failed: {response.status_code} - {response.text}")
+        def send():
+            started = time.perf_counter()
+            with get_metrics().span("llm_call", provider="grok", model=self.model, stream=stream) as span:
+                response, timing = self.http.post_json(
+                    "/chat/completions", payload, headers=self.headers, timeout=60, stream=stream
+                )
+                print(f"⏱️  Grok request: {format_timing(timing)}")
+                check_response(response, "Grok")
+                
+                if response.status_code != 200:
+                    raise Exception(f"Grok API call failed: {response.status_code} - {response.text}")
+                
+                if stream:
+                    # Returns at the first complete concept object; unusable output closes the stream early
+                    usage = {}  # filled by the final usage chunk if the stream is read that far
+                    text = consume_stream(iter_sse_content(response, usage), "Grok", close=response.close,
+                                          started=started)
+                else:
+                    response_data = response.json()
+                    text = response_data["choices"][0]["message"]["content"]
+                    usage = response_data.get("usage") or {}
+                
+                span.update(token_usage(prompt, text, usage.get("prompt_tokens"), usage.get("completion_tokens")))
+                # Network time only: the limiter's waits and retries happen outside send()
+                record_latency("grok", time.perf_counter() - started, batch)
+                return text
         
-        response_data = response.json()
-        return response_data["choices"][0]["message"]["content"]
+        # Waits for quota, retries 429 / transient failures
+        return self.rate_limiter.call(send, estimate_tokens(prompt) + payload["max_tokens"])
     
     def _build_atomic_extraction_prompt(self, raw_content):
         """Build surgical prompt for atomic concept extraction"""
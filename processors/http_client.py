@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Pooled HTTP Client Module
+Extracted from the Content-Intelligent C Concept Extraction Engine
+
+Keep-alive requests.Session shared by the REST based processors (Grok,
+GPT-4.1 Nano). Connections are reused across concepts and books, and every
+request is timed as connect (TCP + TLS) / TTFB / transfer so the handshake
+savings are visible.
+"""
+
+import time
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+DEFAULT_POOL_SIZE = 4
+
+# Timing record of the request currently running on this thread
+_timing = threading.local()
+
+
+class _TimedConnectionMixin:
+    """Records handshake and time-to-first-byte on the calling thread"""
+
+    def connect(self):
+        started = time.perf_counter()
+        super().connect()
+        record = getattr(_timing, "record", None)
+        if record is not None:
+            record["connect"] += time.perf_counter() - started
+            record["new_connection"] = True
+
+    def request(self, *args, **kwargs):
+        record = getattr(_timing, "record", None)
+        if record is not None:
+            record["request_start"] = time.perf_counter()
+        return super().request(*args, **kwargs)
+
+    def getresponse(self, *args, **kwargs):
+        response = super().getresponse(*args, **kwargs)
+        record = getattr(_timing, "record", None)
+        if record is not None and "request_start" in record:
+            record["headers_received"] = time.perf_counter()
+        return response
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose pools hand out timed connections"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool
+        }
+
+
+class PooledHTTPClient:
+    """Keep-alive session for one API base URL with per-request timing"""
+
+    def __init__(self, base_url, pool_size=DEFAULT_POOL_SIZE):
+        self.base_url = base_url.rstrip("/")
+        self.pool_size = 0
+        self.session = requests.Session()
+        self.pool_lock = threading.Lock()
+        self.adapter = None
+        self.in_flight = {}  # adapter -> requests started on it; replaced adapters stay until they drain
+        self.grow_pool(pool_size)
+
+        self.stats_lock = threading.Lock()
+        self.requests_made = 0
+        self.new_connections = 0
+        self.totals = {"connect": 0.0, "ttfb": 0.0, "transfer": 0.0, "total": 0.0}
+
+    def grow_pool(self, pool_size):
+        """Make room for at least pool_size connections (never shrinks)"""
+        with self.pool_lock:
+            if pool_size <= self.pool_size:
+                return
+            # Requests in flight keep the old adapter until they finish; new ones use the larger pool
+            replaced = self.adapter
+            self.adapter = TimedHTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            self.in_flight[self.adapter] = 0
+            self.session.mount("http://", self.adapter)
+            self.session.mount("https://", self.adapter)
+            self.pool_size = pool_size
+            drained = replaced is not None and self.in_flight[replaced] == 0
+            if drained:
+                del self.in_flight[replaced]
+        if drained:
+            replaced.close()
+
+    def _request_started(self):
+        with self.pool_lock:
+            self.in_flight[self.adapter] += 1
+            return self.adapter
+
+    def _request_finished(self, adapter):
+        """Close a replaced adapter once its last request is done"""
+        with self.pool_lock:
+            self.in_flight[adapter] -= 1
+            drained = adapter is not self.adapter and self.in_flight[adapter] == 0
+            if drained:
+                del self.in_flight[adapter]
+        if drained:
+            adapter.close()
+
+    def post_json(self, path, payload, headers=None, timeout=60, stream=False):
+        """POST a JSON payload; returns (response, timing)
+
+        With stream=True the transfer time only covers the headers, callers
+        that consume the body incrementally time the rest themselves.
+        """
+        record = {"connect": 0.0, "new_connection": False}
+        _timing.record = record
+        adapter = self._request_started()
+        started = time.perf_counter()
+        try:
+            response = self.session.post(
+                f"{self.base_url}{path}", headers=headers, json=payload, timeout=timeout, stream=stream
+            )
+        finally:
+            _timing.record = None
+            # A streamed body still holds its connection; a closed pool drops it once released
+            self._request_finished(adapter)
+        finished = time.perf_counter()
+
+        request_start = record.get("request_start", started)
+        headers_received = record.get("headers_received", finished)
+        timing = {
+            "connect": record["connect"],
+            "ttfb": headers_received - request_start,
+            "transfer": finished - headers_received,
+            "total": finished - started,
+            "reused_connection": not record["new_connection"]
+        }
+
+        with self.stats_lock:
+            self.requests_made += 1
+            self.new_connections += record["new_connection"]
+            for key in self.totals:
+                self.totals[key] += timing[key]
+
+        return response, timing
+
+    def stats(self):
+        """Aggregate timings: averages per request and connection reuse"""
+        with self.stats_lock:
+            count = self.requests_made
+            return {
+                "requests": count,
+                "new_connections": self.new_connections,
+                "reused_connections": count - self.new_connections,
+                **{f"avg_{key}": (value / count if count else 0.0) for key, value in self.totals.items()}
+            }
+
+    def close(self):
+        self.session.close()
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_http_client(base_url, pool_size=DEFAULT_POOL_SIZE):
+    """Return the process-wide pooled client for base_url, creating it once
+
+    Its pool grows to the largest pool_size any caller asked for.
+    """
+    with _clients_lock:
+        client = _clients.get(base_url)
+        if client is None:
+            client = _clients[base_url] = PooledHTTPClient(base_url, pool_size)
+        else:
+            client.grow_pool(pool_size)
+        return client
+
+
+def format_timing(timing):
+    """One-line connect / TTFB / transfer breakdown for console logs"""
+    connection = "reused" if timing["reused_connection"] else "new"
+    return (f"connect {timing['connect']:.3f}s | TTFB {timing['ttfb']:.3f}s | "
+            f"transfer {timing['transfer']:.3f}s | total {timing['total']:.3f}s ({connection} connection)")
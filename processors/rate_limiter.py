@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter Module
+Extracted from the Content-Intelligent C Concept Extraction Engine
+
+Provider-aware admission control shared by every processor. Each provider
+gets request/min and token/min token buckets from
+config/providers_config.json, an AIMD concurrency window driven by observed
+latency and errors, and a retry loop that honours Retry-After and otherwise
+backs off exponentially with full jitter. 429s and transient failures are
+retried instead of losing the concept for the day.
+"""
+
+import json
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+import requests
+
+PROVIDERS_CONFIG_FILE = Path(__file__).resolve().parent.parent / "config" / "providers_config.json"
+
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BASE_BACKOFF = 1.0
+DEFAULT_MAX_BACKOFF = 60.0
+LATENCY_TOLERANCE = 2.5  # latency this many times the baseline counts as congestion
+
+
+class RateLimitError(Exception):
+    """Provider rejected the request for quota/rate reasons (HTTP 429)"""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TransientAPIError(Exception):
+    """Retryable provider failure (5xx, timeouts, dropped connections)"""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def check_response(response, provider_name):
+    """Raise RateLimitError / TransientAPIError for retryable HTTP statuses"""
+    if response.status_code == 429:
+        raise RateLimitError(
+            f"{provider_name} rate limited: {response.text[:200]}",
+            retry_after=parse_retry_after(response.headers.get("Retry-After"))
+        )
+    if response.status_code in (408, 409) or response.status_code >= 500:
+        raise TransientAPIError(
+            f"{provider_name} transient error {response.status_code}: {response.text[:200]}",
+            retry_after=parse_retry_after(response.headers.get("Retry-After"))
+        )
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at rate_per_minute"""
+
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, amount=1):
+        """Block until `amount` tokens are available and take them"""
+        amount = min(amount, self.capacity)
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def drain(self):
+        """Empty the bucket after the provider reports we overran the quota"""
+        with self.lock:
+            self._refill()
+            self.tokens = 0
+
+
+class AdaptiveConcurrency:
+    """AIMD window of in-flight requests driven by latency and errors"""
+
+    def __init__(self, initial=1, minimum=1, maximum=8):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(min(max(initial, minimum), maximum))
+        self.in_flight = 0
+        self.baseline_latency = None
+        self.condition = threading.Condition()
+
+    def acquire(self):
+        with self.condition:
+            while self.in_flight >= int(self.limit):
+                self.condition.wait()
+            self.in_flight += 1
+
+    def release(self):
+        with self.condition:
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+    def on_success(self, latency):
+        with self.condition:
+            if self.baseline_latency is None or latency < self.baseline_latency:
+                self.baseline_latency = latency
+            else:
+                # Let the baseline drift up slowly so one lucky request does not pin it
+                self.baseline_latency += 0.05 * (latency - self.baseline_latency)
+
+            if latency > LATENCY_TOLERANCE * self.baseline_latency:
+                self._decrease()
+            else:
+                # Additive increase: +1 per window's worth of successes
+                self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+            self.condition.notify_all()
+
+    def on_failure(self):
+        with self.condition:
+            self._decrease()
+
+    def _decrease(self):
+        self.limit = max(self.minimum, self.limit / 2)
+
+
+class ProviderRateLimiter:
+    """Token buckets + adaptive concurrency + retries for one API provider"""
+
+    def __init__(self, provider_name, requests_per_minute=None, tokens_per_minute=None,
+                 max_concurrency=4, min_concurrency=1, max_retries=DEFAULT_MAX_RETRIES,
+                 base_backoff=DEFAULT_BASE_BACKOFF, max_backoff=DEFAULT_MAX_BACKOFF):
+        self.provider_name = provider_name
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.concurrency = AdaptiveConcurrency(min_concurrency, min_concurrency, max_concurrency)
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self.stats_lock = threading.Lock()
+        self.calls = 0
+        self.retries = 0
+        self.rate_limited = 0
+
+    def _backoff(self, attempt, retry_after):
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        # Exponential backoff with full jitter
+        return random.uniform(0, min(self.max_backoff, self.base_backoff * (2 ** attempt)))
+
+    def call(self, fn, estimated_tokens=0):
+        """Run fn() under the provider's limits, retrying rate limits and transient errors"""
+        attempt = 0
+        while True:
+            if self.request_bucket:
+                self.request_bucket.acquire(1)
+            if self.token_bucket and estimated_tokens:
+                self.token_bucket.acquire(estimated_tokens)
+
+            self.concurrency.acquire()
+            started = time.monotonic()
+            try:
+                result = fn()
+            except (RateLimitError, TransientAPIError, requests.ConnectionError, requests.Timeout) as e:
+                self.concurrency.on_failure()
+                rate_limited = isinstance(e, RateLimitError)
+                if rate_limited:
+                    # The provider's view of our quota wins over the local estimate
+                    if self.request_bucket:
+                        self.request_bucket.drain()
+                    if self.token_bucket:
+                        self.token_bucket.drain()
+
+                with self.stats_lock:
+                    self.rate_limited += rate_limited
+                    if attempt < self.max_retries:
+                        self.retries += 1
+
+                if attempt >= self.max_retries:
+                    raise
+
+                delay = self._backoff(attempt, getattr(e, "retry_after", None))
+                print(f"⏳ {self.provider_name}: {e.__class__.__name__}, retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+                attempt += 1
+            else:
+                self.concurrency.on_success(time.monotonic() - started)
+                with self.stats_lock:
+                    self.calls += 1
+                return result
+            finally:
+                self.concurrency.release()
+
+            time.sleep(delay)
+
+    def stats(self):
+        with self.stats_lock:
+            return {
+                "calls": self.calls,
+                "retries": self.retries,
+                "rate_limited": self.rate_limited,
+                "concurrency_limit": int(self.concurrency.limit)
+            }
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def load_provider_limits(provider_name, config_file=PROVIDERS_CONFIG_FILE):
+    if not Path(config_file).exists():
+        return {}
+    with open(config_file, 'r') as f:
+        return json.load(f).get(provider_name, {})
+
+
+def get_rate_limiter(provider_name):
+    """Return the process-wide limiter for a provider, built from providers_config.json"""
+    with _limiters_lock:
+        limiter = _limiters.get(provider_name)
+        if limiter is None:
+            limits = load_provider_limits(provider_name)
+            limiter = _limiters[provider_name] = ProviderRateLimiter(
+                provider_name,
+                requests_per_minute=limits.get("requests_per_minute"),
+                tokens_per_minute=limits.get("tokens_per_minute"),
+                max_concurrency=limits.get("max_concurrency", 4),
+                min_concurrency=limits.get("min_concurrency", 1),
+                max_retries=limits.get("max_retries", DEFAULT_MAX_RETRIES)
+            )
+        return limiter
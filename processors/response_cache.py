@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+LLM Response Cache Module
+Extracted from the Content-Intelligent C Concept Extraction Engine
+
+Content-addressed SQLite cache of raw LLM responses shared by all processors.
+Entries are keyed on hash(model, prompt, temperature, max_tokens), so
+re-running a session after a crash costs no API calls while any prompt
+tweak naturally misses. The database is kept under a size budget by
+evicting the least recently used responses.
+"""
+
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+
+from core.metrics import get_metrics
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class ResponseCache:
+    """SQLite-backed LRU cache of LLM response text"""
+
+    def __init__(self, db_path, max_bytes=DEFAULT_MAX_BYTES, bypass=False, refresh=False):
+        self.db_path = Path(db_path)
+        self.max_bytes = max_bytes
+        self.bypass = bypass    # neither read nor write the cache
+        self.refresh = refresh  # skip reads but store fresh responses
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared by the book threads, serialised by self.lock
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+        """)
+        self.conn.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(model, prompt, temperature, max_tokens):
+        """Content address of one completion request"""
+        material = json.dumps([model, prompt, temperature, max_tokens], ensure_ascii=False)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Return the cached response text, or None on a miss"""
+        if self.bypass or self.refresh:
+            return None
+
+        with self.lock:
+            row = self.conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self.conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+            self.conn.commit()
+            return row[0]
+
+    def put(self, key, model, response_text):
+        """Store a response and evict least recently used entries over budget"""
+        if self.bypass:
+            return
+
+        size = len(response_text.encode("utf-8"))
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, size, created, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response_text, size, now, now)
+            )
+            self._evict()
+            self.conn.commit()
+
+    def _evict(self):
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        freed = 0
+        victims = []
+        for key, size in self.conn.execute("SELECT key, size FROM responses ORDER BY last_used"):
+            victims.append((key,))
+            freed += size
+            if total - freed <= self.max_bytes:
+                break
+        self.conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        with self.lock:
+            entries, total_bytes = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": total_bytes
+        }
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def cached_completion(cache, model, prompt, temperature, max_tokens, call, parse):
+    """Run call(prompt) through the cache; returns (parsed_response, cache_hit)
+
+    Only responses that parse are stored, so a malformed reply is retried
+    on the next run instead of being replayed forever.
+    """
+    if cache is None:
+        return parse(call(prompt)), False
+
+    key = ResponseCache.make_key(model, prompt, temperature, max_tokens)
+    response_text = cache.get(key)
+    if response_text is not None:
+        parsed = parse(response_text)
+        if parsed:
+            get_metrics().record("llm_cache_hit", 0.0, model=model, bytes=len(response_text))
+            return parsed, True
+
+    response_text = call(prompt)
+    parsed = parse(response_text)
+    if parsed:
+        cache.put(key, model, response_text)
+    return parsed, False
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Routing Processor Module
+Extracted from the Content-Intelligent C Concept Extraction Engine
+
+Wraps the provider processors (Gemini, Grok, GPT-4.1 Nano) behind the same
+process_concept interface. The book's primary provider is tried first; if it
+has not answered by its p95 latency, a hedged request goes to the next
+provider and the first valid JSON wins. A provider that fails outright is
+failed over immediately.
+
+Deadlines come from per-provider latency histograms of the network send
+alone (recorded by the processors after the rate limiter lets a request
+through, so cache hits, quota waits and retry backoff do not skew them),
+kept apart for single-concept and batched requests. The histograms are
+persisted at most once a minute and at exit, so deadlines stay meaningful
+from the first request of a run.
+"""
+
+import os
+import json
+import math
+import time
+import atexit
+import threading
+import contextvars
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+LATENCY_FILE = Path(__file__).resolve().parent.parent / "cache" / "provider_latency.json"
+DEFAULT_HEDGE_DEADLINE = 30.0
+MIN_SAMPLES = 5
+HEDGE_QUANTILE = 0.95
+SAVE_INTERVAL_SECONDS = 60.0
+SINGLE = "single"
+BATCH = "batch"
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram with p-quantile lookup"""
+
+    BUCKETS_PER_DOUBLING = 4
+    MIN_LATENCY = 0.05
+    MAX_SAMPLES = 1000  # halve counts beyond this so the histogram tracks drift
+
+    def __init__(self, counts=None):
+        self.counts = {int(bucket): count for bucket, count in (counts or {}).items()}
+        self.lock = threading.Lock()
+
+    def _bucket(self, latency):
+        return max(0, int(math.log2(max(latency, self.MIN_LATENCY) / self.MIN_LATENCY) * self.BUCKETS_PER_DOUBLING))
+
+    def _upper_bound(self, bucket):
+        return self.MIN_LATENCY * 2 ** ((bucket + 1) / self.BUCKETS_PER_DOUBLING)
+
+    def record(self, latency):
+        with self.lock:
+            bucket = self._bucket(latency)
+            self.counts[bucket] = self.counts.get(bucket, 0) + 1
+            if sum(self.counts.values()) > self.MAX_SAMPLES:
+                self.counts = {b: c // 2 for b, c in self.counts.items() if c // 2}
+
+    def samples(self):
+        with self.lock:
+            return sum(self.counts.values())
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-quantile (None when empty)"""
+        with self.lock:
+            total = sum(self.counts.values())
+            if not total:
+                return None
+            target = q * total
+            seen = 0
+            for bucket in sorted(self.counts):
+                seen += self.counts[bucket]
+                if seen >= target:
+                    return self._upper_bound(bucket)
+            return self._upper_bound(max(self.counts))
+
+
+_histograms = {}
+_histograms_lock = threading.Lock()
+_last_saved = time.monotonic()
+_unsaved = False
+
+
+def _load_histograms():
+    if not LATENCY_FILE.exists():
+        return {}
+    try:
+        with open(LATENCY_FILE, 'r') as f:
+            return json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return {}
+
+
+def get_latency_histogram(provider_name, kind=SINGLE):
+    """Process-wide histogram for a provider's single or batch sends, seeded from the last runs"""
+    key = f"{provider_name}:{kind}"
+    with _histograms_lock:
+        if not _histograms:
+            for name, counts in _load_histograms().items():
+                if ":" in name:  # older files held whole-call timings per provider
+                    _histograms[name] = LatencyHistogram(counts)
+        if key not in _histograms:
+            _histograms[key] = LatencyHistogram()
+        return _histograms[key]
+
+
+def record_latency(provider_name, seconds, batch=False):
+    """Record one successful network send; persists at most every SAVE_INTERVAL_SECONDS"""
+    global _last_saved, _unsaved
+    get_latency_histogram(provider_name, BATCH if batch else SINGLE).record(seconds)
+    with _histograms_lock:
+        _unsaved = True
+        due = time.monotonic() - _last_saved >= SAVE_INTERVAL_SECONDS
+        if due:
+            _last_saved = time.monotonic()
+    if due:
+        save_latency_histograms()
+
+
+def save_latency_histograms():
+    """Persist all histograms (atomic replace); no-op when nothing was recorded"""
+    global _unsaved
+    with _histograms_lock:
+        if not _unsaved:
+            return
+        _unsaved = False
+        data = {name: dict(histogram.counts) for name, histogram in _histograms.items()}
+    LATENCY_FILE.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = LATENCY_FILE.with_name(f".{LATENCY_FILE.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, LATENCY_FILE)
+
+
+atexit.register(save_latency_histograms)
+
+
+class RoutingProcessor:
+    """Primary provider with p95-hedged secondary requests and failover"""
+
+    def __init__(self, primary_name, processors, fallback_names=(), default_deadline=DEFAULT_HEDGE_DEADLINE):
+        # processors: provider name -> processor instance (None if unavailable)
+        self.provider_names = [name for name in [primary_name, *fallback_names] if processors.get(name)]
+        if not self.provider_names:
+            raise ValueError(f"No working processor among {[primary_name, *fallback_names]}")
+
+        self.processors = processors
+        self.primary_name = self.provider_names[0]
+        self.default_deadline = default_deadline
+        self.executor = ThreadPoolExecutor(max_workers=len(self.provider_names) * 2)
+
+        # Let the engine see the primary's cache (summary hit rate) and settings
+        self.response_cache = getattr(processors[self.primary_name], "response_cache", None)
+
+        print(f"🔀 Routing: {' → '.join(self.provider_names)} (hedge at p{int(HEDGE_QUANTILE * 100)})")
+
+    def hedge_deadline(self, provider_name, method="process_concept"):
+        """Seconds to wait on a provider before hedging"""
+        histogram = get_latency_histogram(provider_name, BATCH if method == "process_concepts" else SINGLE)
+        if histogram.samples() < MIN_SAMPLES:
+            return self.default_deadline
+        return histogram.quantile(HEDGE_QUANTILE)
+
+    def _call(self, provider_name, method, args):
+        processor = self.processors[provider_name]
+        if method == "process_concepts" and not hasattr(processor, "process_concepts"):
+            return [processor.process_concept(concept) for concept in args[0]]
+        return getattr(processor, method)(*args)
+
+    def _route(self, method, args, is_valid):
+        pending = {}  # future -> provider name
+        launched = []
+
+        def launch():
+            provider_name = self.provider_names[len(launched)]
+            launched.append(provider_name)
+            # Copy the context so metrics spans and log routing stay with the calling book
+            context = contextvars.copy_context()
+            pending[self.executor.submit(context.run, self._call, provider_name, method, args)] = provider_name
+
+        launch()
+        hedged = False
+        last_result = None
+        while pending:
+            can_hedge = len(launched) < len(self.provider_names)
+            deadline = self.hedge_deadline(launched[-1], method) if can_hedge else None
+            done, _ = wait(pending, timeout=deadline, return_when=FIRST_COMPLETED)
+
+            if not done:
+                print(f"🏁 {launched[-1]} slower than its p{int(HEDGE_QUANTILE * 100)} ({deadline:.1f}s), "
+                      f"hedging with {self.provider_names[len(launched)]}")
+                launch()
+                hedged = True
+                continue
+
+            for future in done:
+                provider_name = pending.pop(future)
+                if future.exception() is not None:
+                    print(f"❌ {provider_name} raised: {future.exception()}")
+                    continue
+
+                last_result = future.result()
+                if is_valid(last_result):
+                    # First valid answer wins; losers are cancelled if not yet running,
+                    # otherwise their replies are discarded
+                    for loser in pending:
+                        loser.cancel()
+                    return provider_name, hedged, last_result
+
+            if not pending and len(launched) < len(self.provider_names):
+                print(f"↪️  {launched[-1]} gave no valid result, failing over to {self.provider_names[len(launched)]}")
+                launch()
+
+        return None, hedged, last_result
+
+    @staticmethod
+    def _tag(processed_concept, provider_name, hedged):
+        processed_concept["extraction_metadata"]["provider"] = provider_name
+        processed_concept["extraction_metadata"]["hedged"] = hedged
+
+    def process_concept(self, concept_data):
+        """Transform raw concept into atomic training format via the fastest healthy provider"""
+        provider_name, hedged, result = self._route(
+            "process_concept", (concept_data,), lambda processed: bool(processed and processed.get("topic"))
+        )
+        if provider_name is None:
+            return None
+
+        self._tag(result, provider_name, hedged)
+        return result
+
+    def process_concepts(self, concepts, token_budget, max_batch_size):
+        """Batched variant; a batch is valid if any concept came back"""
+        provider_name, hedged, results = self._route(
+            "process_concepts", (concepts, token_budget, max_batch_size), lambda processed: bool(processed and any(processed))
+        )
+        if provider_name is None:
+            return results or [None] * len(concepts)
+
+        for processed_concept in results:
+            if processed_concept:
+                self._tag(processed_concept, provider_name, hedged)
+        return results
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Streaming Response Module
+Extracted from the Content-Intelligent C Concept Extraction Engine
+
+Incremental JSON parsing for streamed LLM completions. The parser tracks the
+concept object as tokens arrive, validates the schema, and aborts as soon as
+the output is obviously unusable (e.g. the "Invalid Content for Extraction"
+concepts produced for title pages), so no more tokens are paid for. Once the
+object is complete only a short tail is read (closing fence, then the
+provider's usage chunk when stream_options.include_usage was requested), so
+the result is usable as early as possible. A stream closed before its usage
+arrives leaves the token metrics to token_usage()'s estimate (flagged
+tokens_estimated).
+"""
+
+import re
+import json
+import time
+
+REQUIRED_FIELDS = ("topic", "explanation")
+
+# Topics models emit when a chunk holds no real concept (title pages, indexes, ...)
+INVALID_TOPIC_PATTERN = re.compile(
+    r"invalid content|no (valid |discernible |clear )?(c )?(programming )?concept|not applicable|"
+    r"insufficient (content|information)|unable to (extract|identify)|no content|^n/?a$",
+    re.IGNORECASE
+)
+TOPIC_VALUE_PATTERN = re.compile(r'"topic"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+# Give up if this much prose arrives without the JSON object starting
+MAX_PREAMBLE_CHARS = 2000
+# Content read after the object while waiting for the usage chunk
+MAX_TAIL_CHARS = 200
+
+
+class InvalidConceptStream(Exception):
+    """Streamed output is not a usable concept; the stream should be closed"""
+
+
+class IncrementalConceptParser:
+    """Feeds streamed text and yields the concept JSON as soon as it is complete"""
+
+    def __init__(self, started=None):
+        self.buffer = []
+        self.text_length = 0
+        self.object_start = None  # offset of the opening brace in the joined text
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.topic_checked = False
+        self.object_text = None
+        self.first_token_at = None
+        self.started = started or time.perf_counter()
+
+    def feed(self, chunk):
+        """Consume a chunk; returns True once the concept object is complete"""
+        if self.object_text is not None or not chunk:
+            return self.object_text is not None
+
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+
+        offset = self.text_length
+        self.buffer.append(chunk)
+        self.text_length += len(chunk)
+
+        for position, char in enumerate(chunk, offset):
+            if self.object_start is None:
+                if char == "{":
+                    self.object_start = position
+                    self.depth = 1
+                continue
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                self.in_string = True
+            elif char == "{":
+                self.depth += 1
+            elif char == "}":
+                self.depth -= 1
+                if self.depth == 0:
+                    self.object_text = "".join(self.buffer)[self.object_start:position + 1]
+                    self._validate(self.object_text)
+                    return True
+
+        if self.object_start is None and self.text_length > MAX_PREAMBLE_CHARS:
+            raise InvalidConceptStream(f"No JSON object after {self.text_length} characters")
+
+        if not self.topic_checked and self.object_start is not None:
+            self._check_topic("".join(self.buffer)[self.object_start:])
+
+        return False
+
+    def _check_topic(self, partial_object):
+        match = TOPIC_VALUE_PATTERN.search(partial_object)
+        if not match:
+            return
+        self.topic_checked = True
+        topic = match.group(1)
+        if INVALID_TOPIC_PATTERN.search(topic.strip()):
+            raise InvalidConceptStream(f"Model reported no usable concept: '{topic}'")
+
+    def _validate(self, object_text):
+        try:
+            concept = json.loads(object_text)
+        except json.JSONDecodeError as e:
+            raise InvalidConceptStream(f"Streamed JSON does not parse: {e}") from e
+
+        missing = [field for field in REQUIRED_FIELDS if not isinstance(concept.get(field), str) or not concept[field]]
+        if missing:
+            raise InvalidConceptStream(f"Streamed concept missing {', '.join(missing)}")
+        if "code_example" in concept and not isinstance(concept["code_example"], list):
+            raise InvalidConceptStream("Streamed concept has a non-list code_example")
+        if not self.topic_checked:
+            self._check_topic(object_text)
+
+    def result(self):
+        """Complete concept JSON text (raises if the stream ended early)"""
+        if self.object_text is None:
+            raise InvalidConceptStream("Stream ended before the concept JSON was complete")
+        return self.object_text
+
+    def timing(self):
+        now = time.perf_counter()
+        return {
+            "ttft": (self.first_token_at - self.started) if self.first_token_at else None,
+            "elapsed": now - self.started,
+            "chars": self.text_length
+        }
+
+
+def iter_sse_content(response, usage=None):
+    """Yield content deltas from an OpenAI-compatible chat completions SSE stream
+
+    The usage chunk (stream_options.include_usage) is copied into `usage`.
+    """
+    for line in response.iter_lines(decode_unicode=True):
+        if not line or not line.startswith("data:"):
+            continue
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            return
+        event = json.loads(data)
+        if usage is not None and event.get("usage"):
+            usage.update(event["usage"])
+        for choice in event.get("choices") or []:
+            content = choice.get("delta", {}).get("content")
+            if content:
+                yield content
+
+
+def consume_stream(chunks, label, close=None, started=None):
+    """Feed streamed chunks to a parser; returns the concept JSON text
+
+    Once the object is complete, reads at most MAX_TAIL_CHARS more content
+    (so a trailing usage chunk is still seen) and calls close() to drop the
+    rest of the stream, also when the output is rejected early.
+    started (perf_counter) is when the request was sent.
+    """
+    parser = IncrementalConceptParser(started)
+    chunks = iter(chunks)
+    try:
+        for chunk in chunks:
+            if parser.feed(chunk):
+                break
+        text = parser.result()
+        timing = parser.timing()
+
+        tail_chars = 0
+        for chunk in chunks:
+            tail_chars += len(chunk)
+            if tail_chars > MAX_TAIL_CHARS:
+                break
+    except InvalidConceptStream as e:
+        timing = parser.timing()
+        print(f"✂️  {label} stream aborted after {timing['chars']} chars ({timing['elapsed']:.2f}s): {e}")
+        raise
+    finally:
+        if close is not None:
+            close()
+
+    ttft = f"{timing['ttft']:.2f}s" if timing["ttft"] is not None else "n/a"
+    print(f"🌊 {label} stream: first token {ttft}, usable concept at {timing['elapsed']:.2f}s ({timing['chars']} chars)")
+    return text
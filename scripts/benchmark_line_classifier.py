@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Line Classifier Micro-Benchmark
+Compares the legacy per-pattern re.match/re.search classifier with the
+precompiled classify_line() engine over the text of the bundled books.
+
+Run from the project root:
+    python scripts/benchmark_line_classifier.py --max-pages 60
+"""
+
+import re
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+sys.path.append('.')
+
+import pdfplumber
+from core.pdf_extractor import classify_line
+
+CONFIG_FILE = Path("config/books_config.json")
+
+
+def legacy_is_header(line):
+    """Original _is_header: three uncompiled patterns per line"""
+    header_patterns = [
+        r'^Chapter\s+\d+',
+        r'^\d+\.\d+\s+\w+',
+        r'^[A-Z][A-Za-z\s]+$'
+    ]
+    for pattern in header_patterns:
+        if re.match(pattern, line) and len(line) < 80:
+            return True
+    return False
+
+
+def legacy_is_code_line(line):
+    """Original _is_code_line: eleven uncompiled patterns per line"""
+    code_indicators = [
+        r'#include\s*<',
+        r'\bint\s+main\s*\(',
+        r'\bprintf\s*\(',
+        r'\bfor\s*\(',
+        r'\bwhile\s*\(',
+        r'\bif\s*\(',
+        r'^\s*{',
+        r'^\s*}',
+        r';\s*$',
+        r'/\*.*\*/',
+        r'//.*'
+    ]
+    for indicator in code_indicators:
+        if re.search(indicator, line):
+            return True
+    return False
+
+
+def legacy_classify(line):
+    if legacy_is_header(line):
+        return "header"
+    if legacy_is_code_line(line):
+        return "code"
+    return "text"
+
+
+def compiled_classify(line):
+    return classify_line(line)[0]
+
+
+def load_book_lines(max_pages):
+    """Collect stripped, non-empty lines from every bundled book PDF"""
+    with open(CONFIG_FILE, 'r') as f:
+        books = json.load(f)
+
+    lines = []
+    for book_key, book in books.items():
+        pdf_path = Path(book["pdf_path"])
+        if not pdf_path.exists():
+            print(f"⏭️  {book_key}: PDF not bundled ({pdf_path}), skipping")
+            continue
+
+        book_lines = 0
+        with pdfplumber.open(pdf_path) as pdf:
+            for page in pdf.pages[:max_pages]:
+                text = page.extract_text() or ""
+                for line in text.split('\n'):
+                    line = line.strip()
+                    if line:
+                        lines.append(line)
+                        book_lines += 1
+        print(f"📚 {book_key}: {book_lines} lines")
+
+    return lines
+
+
+def time_classifier(classifier, lines, rounds):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for line in lines:
+            classifier(line)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(lines) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the PDF line classifier")
+    parser.add_argument("--max-pages", type=int, default=60, help="pages to read per book")
+    parser.add_argument("--rounds", type=int, default=5, help="timing rounds (best is reported)")
+    args = parser.parse_args()
+
+    lines = load_book_lines(args.max_pages)
+    if not lines:
+        print("❌ No bundled book text found")
+        return
+
+    mismatches = sum(1 for line in lines if legacy_classify(line) != compiled_classify(line))
+
+    legacy_rate = time_classifier(legacy_classify, lines, args.rounds)
+    compiled_rate = time_classifier(compiled_classify, lines, args.rounds)
+
+    print(f"\n📏 {len(lines)} lines, {mismatches} classification mismatches")
+    print(f"🐢 Legacy classifier:   {legacy_rate:,.0f} lines/s")
+    print(f"⚡ Compiled classifier: {compiled_rate:,.0f} lines/s")
+    print(f"📈 Speed-up: {compiled_rate / legacy_rate:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
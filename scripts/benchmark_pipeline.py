@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Extraction Pipeline Benchmark
+Runs PDF extraction → concept detection → processing → save end to end
+against the bundled books, with the LLM replaced by a replay of recorded
+responses (the concept JSON already in outputs/<book>/), so numbers reflect
+core/ only. Every run uses a fresh temporary output directory; real progress,
+backlogs and page caches are never touched.
+
+Reports pages/s, blocks/s, concepts/s, peak RSS and per-stage time, and
+writes the results as JSON to logs/benchmarks/. With --baseline the run
+fails (exit 1) when throughput drops more than --tolerance below it.
+
+Run from the project root:
+    python scripts/benchmark_pipeline.py --pages 40 --repeat 3
+    python scripts/benchmark_pipeline.py --baseline logs/benchmarks/pipeline_<date>.json
+"""
+
+import io
+import sys
+import json
+import time
+import shutil
+import hashlib
+import platform
+import argparse
+import resource
+import statistics
+import subprocess
+import tempfile
+import contextlib
+from datetime import datetime
+from pathlib import Path
+
+sys.path.append('.')
+
+from core.extraction_engine import ExtractionEngine, load_books_config, resolve_project_path, PROJECT_ROOT
+from core.metrics import reset_metrics
+
+DEFAULT_BOOKS = ["kernighan_ritchie", "expert_c_programming", "linkers_loaders"]
+RESULTS_DIR = PROJECT_ROOT / "logs" / "benchmarks"
+STAGES = ["pdf_extraction", "concept_detection", "processing", "save", "other"]
+THROUGHPUT_METRICS = ["pages_per_s", "blocks_per_s", "concepts_per_s"]
+
+
+class ReplayProcessor:
+    """Answers concept requests with recorded responses instead of calling an LLM"""
+
+    def __init__(self, fixtures, source_title, latency=0.0):
+        if not fixtures:
+            raise ValueError("No recorded responses to replay")
+        self.fixtures = fixtures
+        self.source_title = source_title
+        self.latency = latency
+        self.calls = 0
+
+    def process_concept(self, concept_data):
+        """Recorded concept for this content (deterministic per raw_content)"""
+        if self.latency:
+            time.sleep(self.latency)
+
+        digest = hashlib.sha256(concept_data["raw_content"].encode("utf-8")).digest()
+        processed = json.loads(self.fixtures[int.from_bytes(digest[:4], "big") % len(self.fixtures)])
+        processed["extraction_metadata"] = {
+            "source": self.source_title,
+            "page_range": concept_data["page_range"],
+            "extraction_date": datetime.now().isoformat(),
+            "has_code": concept_data["has_code"],
+            "has_explanation": concept_data["has_explanation"],
+            "response_cache_hit": False
+        }
+
+        self.calls += 1
+        return processed
+
+    def process_concepts(self, concepts, token_budget, max_batch_size):
+        """Batch entry point so the engine's batching path is exercised too"""
+        return [self.process_concept(concept) for concept in concepts]
+
+
+def load_fixtures(fixtures_dir):
+    """Recorded concept JSON (serialised, without extraction metadata)"""
+    fixtures = []
+    for concept_file in sorted(Path(fixtures_dir).glob("*.json")):
+        try:
+            with open(concept_file, 'r') as f:
+                concept = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            continue
+        if isinstance(concept, dict) and concept.get("topic"):
+            concept.pop("extraction_metadata", None)
+            fixtures.append(json.dumps(concept))
+    return fixtures
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process and its (pool) children"""
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(own / scale, 1), round(children / scale, 1)
+
+
+def run_once(book_key, book_config, fixtures, args):
+    """One cold session over the configured page window; returns metrics"""
+    work_dir = Path(tempfile.mkdtemp(prefix=f"bench_{book_key}_"))
+    config = dict(book_config, output_dir=str(work_dir / "outputs"), page_window=args.pages)
+    if args.workers is not None:
+        config["extract_workers"] = args.workers
+    # Replayed topics repeat at random, so topic folding would distort concepts/s unless asked for
+    config["dedup"] = args.dedup
+
+    processor = ReplayProcessor(fixtures, config["source_title"], args.replay_latency)
+    # Stage spans of this run only, kept out of logs/metrics
+    metrics = reset_metrics(work_dir / "metrics")
+    log = io.StringIO()
+
+    try:
+        with contextlib.redirect_stdout(log if not args.verbose else sys.stdout):
+            engine = ExtractionEngine(book_key, config, processor=processor)
+            engine.progress_tracker.progress["last_processed_page"] = args.start_page
+            started = time.perf_counter()
+            engine.run_extraction_session(max_concepts=args.max_concepts)
+            wall = time.perf_counter() - started
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        reset_metrics()
+
+    spans = metrics.book_rollup(book_key)
+    empty = dict.fromkeys(("seconds", "items", "pages", "count"), 0)
+    stages = {stage: spans.get(stage, empty)["seconds"] for stage in STAGES[:-1]}
+    stages["other"] = max(0.0, wall - sum(stages.values()))
+    pages = spans.get("pdf_extraction", empty)["pages"]
+    blocks = spans.get("pdf_extraction", empty)["items"]
+    concepts_saved = spans.get("save", empty)["count"]
+    rss_self, rss_children = peak_rss_mb()
+
+    return {
+        "wall_seconds": round(wall, 4),
+        "pages": pages,
+        "blocks": blocks,
+        "concepts_detected": spans.get("concept_detection", empty)["items"],
+        "concepts_saved": concepts_saved,
+        "pages_per_s": round(pages / wall, 3) if wall else 0.0,
+        "blocks_per_s": round(blocks / wall, 3) if wall else 0.0,
+        "concepts_per_s": round(concepts_saved / wall, 3) if wall else 0.0,
+        "stage_seconds": {stage: round(seconds, 4) for stage, seconds in stages.items()},
+        "peak_rss_mb": rss_self,
+        "peak_rss_children_mb": rss_children
+    }
+
+
+def median_run(runs):
+    """Per-metric median across repeats"""
+    summary = {key: statistics.median(run[key] for run in runs)
+               for key in runs[0] if isinstance(runs[0][key], (int, float))}
+    summary["stage_seconds"] = {stage: round(statistics.median(run["stage_seconds"][stage] for run in runs), 4)
+                                for stage in STAGES}
+    return summary
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_to_baseline(results, baseline_file, tolerance):
+    """List of regressions (metric below baseline by more than tolerance)"""
+    with open(baseline_file, 'r') as f:
+        baseline = json.load(f)
+
+    if baseline.get("settings") != results["settings"]:
+        print(f"⚠️  Baseline settings differ ({baseline.get('settings')}); comparison may be misleading")
+
+    regressions = []
+    for book_key, book in results["books"].items():
+        base_book = baseline.get("books", {}).get(book_key)
+        if not base_book:
+            continue
+        for metric in THROUGHPUT_METRICS:
+            current, previous = book["median"][metric], base_book["median"].get(metric)
+            if previous and current < previous * (1 - tolerance):
+                regressions.append(f"{book_key} {metric}: {current:.2f} vs baseline {previous:.2f} "
+                                   f"({current / previous - 1:+.0%})")
+    return regressions
+
+
+def print_report(results):
+    print(f"\n{'Book':<24} {'pages/s':>9} {'blocks/s':>9} {'concepts/s':>11} {'RSS MB':>8}   stages (s)")
+    for book_key, book in results["books"].items():
+        median = book["median"]
+        stages = " ".join(f"{stage}={seconds:.2f}" for stage, seconds in median["stage_seconds"].items())
+        print(f"{book_key:<24} {median['pages_per_s']:>9.2f} {median['blocks_per_s']:>9.1f} "
+              f"{median['concepts_per_s']:>11.2f} {median['peak_rss_mb']:>8.1f}   {stages}")
+    for book_key, reason in results["skipped"].items():
+        print(f"{book_key:<24} skipped: {reason}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="End-to-end extraction pipeline benchmark with replayed LLM responses")
+    parser.add_argument("books", nargs="*", default=DEFAULT_BOOKS, help="book keys from config/books_config.json")
+    parser.add_argument("--pages", type=int, default=30, help="pages per session (page_window)")
+    parser.add_argument("--start-page", type=int, default=0)
+    parser.add_argument("--max-concepts", type=int, default=10000,
+                        help="concepts to process per session (default: every concept in the window)")
+    parser.add_argument("--workers", type=int, default=None, help="override extract_workers")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per book; medians are reported")
+    parser.add_argument("--replay-latency", type=float, default=0.0, help="simulated seconds per LLM call")
+    parser.add_argument("--dedup", action="store_true", help="enable near-duplicate skipping and topic folding")
+    parser.add_argument("--fixtures", help="directory of recorded concept JSON (default: the book's output_dir)")
+    parser.add_argument("--output", help="results file (default: logs/benchmarks/pipeline_<timestamp>.json)")
+    parser.add_argument("--baseline", help="earlier results file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed throughput drop vs baseline")
+    parser.add_argument("--verbose", action="store_true", help="show the engine's own output")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    books_config = load_books_config()
+
+    results = {
+        "timestamp": datetime.now().isoformat(),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {key: getattr(args, key) for key in
+                     ("pages", "start_page", "max_concepts", "workers", "repeat", "replay_latency", "dedup")},
+        "books": {},
+        "skipped": {}
+    }
+
+    for book_key in args.books:
+        book_config = books_config.get(book_key)
+        if book_config is None:
+            results["skipped"][book_key] = "not in books_config.json"
+            continue
+        if not resolve_project_path(book_config["pdf_path"]).exists():
+            results["skipped"][book_key] = "PDF missing"
+            continue
+
+        fixtures = load_fixtures(args.fixtures or resolve_project_path(book_config["output_dir"]))
+        if not fixtures:
+            results["skipped"][book_key] = "no recorded responses to replay"
+            continue
+
+        print(f"⏱️  Benchmarking {book_key} ({args.pages} pages from {args.start_page}, "
+              f"{len(fixtures)} recorded responses, {args.repeat} run(s))...")
+        runs = [run_once(book_key, book_config, fixtures, args) for _ in range(args.repeat)]
+        results["books"][book_key] = {"runs": runs, "median": median_run(runs)}
+
+    print_report(results)
+
+    output_file = Path(args.output) if args.output else \
+        RESULTS_DIR / f"pipeline_{datetime.now().strftime('%Y-%m-%d-%H%M%S')}.json"
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_file, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n💾 Results written to {output_file}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, args.baseline, args.tolerance)
+        if regressions:
+            print(f"❌ Throughput regressions beyond {args.tolerance:.0%}:")
+            for regression in regressions:
+                print(f"   {regression}")
+            return 1
+        print(f"✅ No throughput regressions beyond {args.tolerance:.0%} vs {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
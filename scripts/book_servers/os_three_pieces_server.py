@@ -10,41 +10,63 @@ from pathlib import Path
 
 sys.path.append('.')
 from mcp.server.fastmcp import FastMCP
+from core.concept_store import open_concept_store, STORE_FILENAME, CONCEPT_FILE_GLOB
+from core.concept_table import ConceptTable
+from core.outputs_watcher import OutputsWatcher, refresh_first, overlay_changed_files
 
 mcp = FastMCP("operating-systems")
 
 # Load Operating Systems concepts only
-concepts = []
+concepts = ConceptTable()
+outputs_watcher = None  # started below; reports concept files the cron runs write
 book_name = "os_three_pieces"
 book_title = "Operating Systems: Three Easy Pieces (Arpaci-Dusseau)"
 
-def load_concepts():
+def load_concepts(changes=None):
     """Load Operating Systems concepts from outputs directory"""
-    global concepts
-    concepts_dir = Path("outputs") / book_name
-    
-    if not concepts_dir.exists():
-        return
-        
-    for concept_file in concepts_dir.glob("concept_*.json"):
+    store = open_concept_store(Path("outputs") / STORE_FILENAME)
+    if store and book_name in store.books():
+        # One query instead of opening every concept file
+        rows = overlay_changed_files(Path("outputs"), store.concepts([book_name]), changes or {}, [book_name])
+        stored = [(filename, concept_data) for _, filename, concept_data in rows]
+    else:
+        concepts_dir = Path("outputs") / book_name
+        if not concepts_dir.exists():
+            return
+
+        stored = []
+        for concept_file in concepts_dir.glob(CONCEPT_FILE_GLOB):
+            try:
+                with open(concept_file, 'r', encoding='utf-8') as f:
+                    stored.append((concept_file.name, json.load(f)))
+            except Exception:
+                continue
+
+    loaded = []
+    for filename, concept_data in stored:
         try:
-            with open(concept_file, 'r', encoding='utf-8') as f:
-                concept_data = json.load(f)
-                
-                concept = {
-                    'id': f"{book_name}_{concept_file.stem}",
-                    'title': concept_data.get('topic', 'Unknown'),
-                    'description': concept_data.get('explanation', ''),
-                    'content': concept_data.get('example_explanation', ''),
-                    'syntax': concept_data.get('syntax', ''),
-                    'code_example': concept_data.get('code_example', []),
-                    'raw_data': concept_data
-                }
-                concepts.append(concept)
+            concept = {
+                'id': f"{book_name}_{Path(filename).stem}",
+                'title': concept_data.get('topic', 'Unknown'),
+                'description': concept_data.get('explanation', ''),
+                'content': concept_data.get('example_explanation', ''),
+                'syntax': concept_data.get('syntax', ''),
+                'code_example': concept_data.get('code_example', []),
+                'raw_data': concept_data
+            }
+            loaded.append(concept)
         except Exception:
             continue
+    concepts.reload(loaded)
+
+def refresh_concepts():
+    """Reload the book once the outputs watcher has seen its concept files change"""
+    changes = outputs_watcher.changes() if outputs_watcher is not None else None
+    if changes:
+        load_concepts(changes)
 
 @mcp.tool()
+@refresh_first(refresh_concepts)
 def search_concepts(query: str, limit: int = 10) -> str:
     """Search Operating Systems concepts"""
     if not query.strip():
@@ -75,9 +97,10 @@ def search_concepts(query: str, limit: int = 10) -> str:
     return result
 
 @mcp.tool()
+@refresh_first(refresh_concepts)
 def get_concept_details(concept_id: str) -> str:
     """Get detailed information about an Operating Systems concept"""
-    concept = next((c for c in concepts if c['id'] == concept_id), None)
+    concept = concepts.get(concept_id)
     
     if not concept:
         return f"Operating Systems concept not found: {concept_id}"
@@ -100,6 +123,7 @@ def get_concept_details(concept_id: str) -> str:
     return result
 
 @mcp.tool()
+@refresh_first(refresh_concepts)
 def list_all_concepts() -> str:
     """List all available Operating Systems concepts"""
     if not concepts:
@@ -111,7 +135,8 @@ def list_all_concepts() -> str:
     
     return result
 
-# Load concepts on startup
+# Load concepts on startup (watching first, so nothing written meanwhile is missed)
+outputs_watcher = OutputsWatcher(Path("outputs"), [book_name]).start()
 load_concepts()
 
 if __name__ == "__main__":
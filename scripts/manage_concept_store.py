@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Concept Store Maintenance
+Imports the per-book JSON outputs into outputs/concepts.sqlite3, exports
+the store back to the classic outputs/<book>/*.json layout, prints
+per-book counts and lists concepts with near-identical topics. The
+extraction engine keeps the store current on its own; this is for the
+first migration and for tools that still want plain files.
+
+Run from the project root:
+    python scripts/manage_concept_store.py import
+    python scripts/manage_concept_store.py export /tmp/outputs_export
+    python scripts/manage_concept_store.py stats
+    python scripts/manage_concept_store.py duplicates linkers_loaders
+"""
+
+import sys
+import argparse
+
+sys.path.append('.')
+
+from core.extraction_engine import load_books_config, resolve_project_path
+from core.concept_store import ConceptStore, DEFAULT_STORE_FILE
+from core.progress_tracker import read_progress
+from core.dedup import ConceptDeduplicator, DEFAULT_TOPIC_THRESHOLD
+
+
+def import_books(store, books_config, book_keys):
+    for book_key in book_keys:
+        output_dir = resolve_project_path(books_config[book_key]["output_dir"])
+        imported = store.import_directory(book_key, output_dir)
+        if (output_dir / "progress.json").exists():
+            store.sync_progress(book_key, read_progress(str(output_dir / "progress.json")))
+        print(f"🗄️  {book_key}: imported {imported} new concept files")
+
+
+def print_stats(store):
+    versions = store.versions()
+    print(f"{'Book':<24} {'concepts':>9} {'last page':>10} {'sessions':>9}")
+    for book_key in sorted(versions):
+        progress = store.progress(book_key) or {"last_processed_page": "-", "extraction_sessions": []}
+        print(f"{book_key:<24} {versions[book_key][0]:>9} {progress['last_processed_page']:>10} "
+              f"{len(progress['extraction_sessions']):>9}")
+
+
+def print_duplicates(store, book_keys, threshold):
+    """Groups of stored concepts the engine would now fold into one"""
+    for book_key in book_keys:
+        dedup = ConceptDeduplicator(book_key, topic_threshold=threshold)
+        groups = {}
+        for filename, topic in store.topic_files(book_key):
+            first = dedup.find_similar_topic(topic)
+            if first is None:
+                dedup.record_topic(topic, filename)
+                first = filename
+            groups.setdefault(first, []).append(f"{filename} ({topic})")
+
+        repeats = {first: files for first, files in groups.items() if len(files) > 1}
+        print(f"\n📚 {book_key}: {sum(len(files) - 1 for files in repeats.values())} near-duplicate concepts")
+        for files in repeats.values():
+            print("   " + "\n     ≈ ".join(files))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Import, export or inspect the SQLite concept store")
+    parser.add_argument("--db", default=str(DEFAULT_STORE_FILE), help="store file (default: outputs/concepts.sqlite3)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="backfill concept files and progress from outputs/")
+    import_parser.add_argument("books", nargs="*", help="book keys (default: every configured book)")
+
+    export_parser = commands.add_parser("export", help="write concept JSON files and progress.json per book")
+    export_parser.add_argument("target", help="directory to create <book>/ folders in")
+    export_parser.add_argument("books", nargs="*", help="book keys (default: every stored book)")
+
+    commands.add_parser("stats", help="concepts, last page and sessions per book")
+
+    duplicates_parser = commands.add_parser("duplicates", help="list concepts with near-identical topics")
+    duplicates_parser.add_argument("books", nargs="*", help="book keys (default: every stored book)")
+    duplicates_parser.add_argument("--threshold", type=float, default=DEFAULT_TOPIC_THRESHOLD,
+                                   help="topic word overlap (Jaccard) counted as a duplicate")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    store = ConceptStore(args.db)
+
+    if args.command == "import":
+        books_config = load_books_config()
+        unknown = [book_key for book_key in args.books if book_key not in books_config]
+        if unknown:
+            print(f"❌ Unknown books: {', '.join(unknown)}")
+            return 1
+        import_books(store, books_config, args.books or list(books_config))
+    elif args.command == "export":
+        written = store.export_json(args.target, args.books or None)
+        print(f"💾 Exported {written} concept files to {args.target}")
+    elif args.command == "duplicates":
+        print_duplicates(store, args.books or sorted(store.books()), args.threshold)
+    else:
+        print_stats(store)
+
+    store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
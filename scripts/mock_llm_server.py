@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+Mock LLM Server
+Local stand-in for the LLM providers, for offline load testing of the
+extraction pipeline without burning real quota.
+
+Speaks the wire formats the processors use:
+  - OpenAI / xAI chat completions: POST .../chat/completions (plain JSON or SSE)
+  - Gemini: POST .../models/<model>:generateContent and :streamGenerateContent
+    (JSON array stream, or SSE with ?alt=sse)
+
+Replies are canned concept JSON (by default the concepts already in
+outputs/<book>/), with configurable latency distribution, error rate, 429
+injection and an optional real per-minute quota. Batched prompts get a JSON
+array with one concept per CONTENT SECTION. GET /stats returns counters.
+
+Run from the project root:
+    python scripts/mock_llm_server.py --port 8765 --latency 0.8 --error-rate 0.02 --rate-limit-rate 0.05
+
+Then point the processors at it (dummy API keys are fine):
+    LLM_BASE_URL=http://127.0.0.1:8765/v1 GROK_API_KEY=mock OPENAI_API_KEY=mock GEMINI_API_KEY=mock \\
+        python books/extract_all.py
+"""
+
+import re
+import json
+import math
+import time
+import random
+import hashlib
+import argparse
+import threading
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+OUTPUTS_DIR = Path("outputs")
+CHARS_PER_TOKEN = 4
+STREAM_CHUNK_CHARS = 16
+
+DEFAULT_CONCEPT = {
+    "topic": "Pointer Arithmetic",
+    "explanation": "Pointer arithmetic moves a pointer by whole elements of the pointed-to type, "
+                   "which is how C walks arrays without indexing.",
+    "syntax": "type *p = array; p + n;",
+    "code_example": [
+        "#include <stdio.h>",
+        "",
+        "int main(void) {",
+        "    int a[3] = {1, 2, 3};",
+        "    int *p = a;",
+        "    printf(\"%d\\n\", *(p + 2));",
+        "    return 0;",
+        "}"
+    ],
+    "example_explanation": "p + 2 points two ints past a[0], so the program prints 3."
+}
+
+INVALID_CONCEPT = {
+    "topic": "Invalid Content for Extraction",
+    "explanation": "The provided content does not contain a C programming concept.",
+    "syntax": "",
+    "code_example": [],
+    "example_explanation": ""
+}
+
+BATCH_SECTION_PATTERN = re.compile(r"=== CONTENT SECTION (\d+)")
+
+
+def load_canned_concepts(path=None):
+    """Concept dicts to answer with: a JSON list file, a directory of concept files, or outputs/"""
+    path = Path(path) if path else OUTPUTS_DIR
+    if path.is_file():
+        with open(path, 'r') as f:
+            concepts = json.load(f)
+        return concepts if isinstance(concepts, list) else [concepts]
+
+    concepts = []
+    for concept_file in sorted(path.glob("**/*.json")) if path.is_dir() else []:
+        try:
+            with open(concept_file, 'r') as f:
+                concept = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            continue
+        if isinstance(concept, dict) and concept.get("topic") and concept.get("explanation"):
+            concept.pop("extraction_metadata", None)
+            concepts.append(concept)
+    return concepts or [DEFAULT_CONCEPT]
+
+
+class LatencyModel:
+    """Samples time-to-first-byte from a named distribution"""
+
+    def __init__(self, distribution, mean, jitter, rng):
+        self.distribution = distribution
+        self.mean = mean
+        self.jitter = jitter
+        self.rng = rng
+
+    def sample(self):
+        if self.mean <= 0:
+            return 0.0
+        if self.distribution == "uniform":
+            return max(0.0, self.rng.uniform(self.mean - self.jitter, self.mean + self.jitter))
+        if self.distribution == "exponential":
+            return self.rng.expovariate(1.0 / self.mean)
+        if self.distribution == "lognormal":
+            # Heavy right tail like real APIs; jitter is sigma of the underlying normal
+            sigma = self.jitter or 0.5
+            return self.rng.lognormvariate(0, sigma) * self.mean / math.exp(sigma * sigma / 2)
+        return self.mean
+
+
+class QuotaWindow:
+    """Real requests/min quota, so client-side rate limiting can be exercised"""
+
+    def __init__(self, requests_per_minute):
+        self.requests_per_minute = requests_per_minute
+        self.timestamps = []
+        self.lock = threading.Lock()
+
+    def admit(self):
+        """None if admitted, otherwise seconds until a slot frees up"""
+        if not self.requests_per_minute:
+            return None
+        with self.lock:
+            now = time.monotonic()
+            self.timestamps = [t for t in self.timestamps if now - t < 60]
+            if len(self.timestamps) >= self.requests_per_minute:
+                return 60 - (now - self.timestamps[0])
+            self.timestamps.append(now)
+            return None
+
+
+class MockLLMState:
+    """Shared configuration and counters for all request handlers"""
+
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.rng_lock = threading.Lock()
+        self.latency = LatencyModel(args.latency_distribution, args.latency, args.jitter, self.rng)
+        self.quota = QuotaWindow(args.rpm)
+        self.concepts = load_canned_concepts(args.concepts)
+        self.stats_lock = threading.Lock()
+        self.counters = {"requests": 0, "ok": 0, "rate_limited": 0, "errors": 0, "invalid": 0,
+                         "streamed": 0, "batched": 0, "in_flight": 0, "max_in_flight": 0}
+
+    def roll(self, probability):
+        with self.rng_lock:
+            return self.rng.random() < probability
+
+    def ttfb(self):
+        with self.rng_lock:
+            return self.latency.sample()
+
+    def count(self, name, delta=1):
+        with self.stats_lock:
+            self.counters[name] += delta
+            if name == "in_flight":
+                self.counters["max_in_flight"] = max(self.counters["max_in_flight"], self.counters["in_flight"])
+
+    def stats(self):
+        with self.stats_lock:
+            return dict(self.counters)
+
+    def concept_for(self, content):
+        """Deterministic canned concept for a piece of content"""
+        digest = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        if self.roll(self.args.invalid_rate):
+            self.count("invalid")
+            return dict(INVALID_CONCEPT)
+        concept = dict(self.concepts[int(digest[:8], 16) % len(self.concepts)])
+        if self.args.unique_topics:
+            concept["topic"] = f"{concept['topic']} ({digest[:6]})"
+        return concept
+
+    def completion_text(self, prompt):
+        """Concept JSON, or a JSON array when the prompt is a batch"""
+        content = prompt.rsplit("CONTENT TO PROCESS:", 1)[-1]
+        sections = BATCH_SECTION_PATTERN.split(content)
+        if "BATCH MODE" in prompt and len(sections) > 1:
+            self.count("batched")
+            # split() alternates [preamble, number, body, number, body, ...]
+            answers = []
+            for number, body in zip(sections[1::2], sections[2::2]):
+                concept = self.concept_for(body)
+                concept["index"] = int(number)
+                answers.append(concept)
+            return json.dumps(answers, indent=2)
+        return json.dumps(self.concept_for(content), indent=2)
+
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    """Routes provider-style requests to canned replies"""
+
+    protocol_version = "HTTP/1.1"
+    state = None
+
+    def log_message(self, format, *args):
+        if self.state.args.verbose:
+            super().log_message(format, *args)
+
+    def do_GET(self):
+        if urlparse(self.path).path.rstrip("/").endswith("stats"):
+            self._send_json(200, self.state.stats())
+        else:
+            self._send_json(404, {"error": {"message": "not found"}})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": {"message": "invalid JSON body"}})
+            return
+
+        url = urlparse(self.path)
+        if url.path.endswith("/chat/completions"):
+            provider = "openai"
+        elif ":generateContent" in url.path or ":streamGenerateContent" in url.path:
+            provider = "gemini"
+        else:
+            self._send_json(404, {"error": {"message": f"unknown endpoint {url.path}"}})
+            return
+
+        state = self.state
+        state.count("requests")
+        state.count("in_flight")
+        try:
+            if self._inject_failure():
+                return
+            time.sleep(state.ttfb())
+            if provider == "openai":
+                self._chat_completion(request)
+            else:
+                self._gemini(request, url)
+            state.count("ok")
+        except (BrokenPipeError, ConnectionResetError):
+            # Client aborted a stream early (e.g. invalid concept detected)
+            pass
+        finally:
+            state.count("in_flight", -1)
+
+    def _inject_failure(self):
+        state = self.state
+        wait = state.quota.admit()
+        if wait is None and state.roll(state.args.rate_limit_rate):
+            wait = state.args.retry_after
+        if wait is not None:
+            state.count("rate_limited")
+            self._send_json(429, {"error": {"message": "Rate limit exceeded", "code": 429}},
+                            {"Retry-After": str(max(1, int(wait + 0.999)))})
+            return True
+
+        if state.roll(state.args.error_rate):
+            state.count("errors")
+            with state.rng_lock:
+                status = state.rng.choice([500, 502, 503])
+            self._send_json(status, {"error": {"message": "Mock upstream failure", "code": status}})
+            return True
+        return False
+
+    def _generation_delay(self, text):
+        tokens_per_second = self.state.args.tokens_per_second
+        return len(text) / CHARS_PER_TOKEN / tokens_per_second if tokens_per_second else 0.0
+
+    def _chat_completion(self, request):
+        prompt = "\n".join(str(message.get("content", "")) for message in request.get("messages", []))
+        text = self.state.completion_text(prompt)
+        model = request.get("model", "mock-model")
+        usage = {"prompt_tokens": len(prompt) // CHARS_PER_TOKEN, "completion_tokens": len(text) // CHARS_PER_TOKEN}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+        if request.get("stream"):
+            self.state.count("streamed")
+            events = [
+                {"object": "chat.completion.chunk", "model": model,
+                 "choices": [{"index": 0, "delta": {"content": text[i:i + STREAM_CHUNK_CHARS]}}]}
+                for i in range(0, len(text), STREAM_CHUNK_CHARS)
+            ]
+            events.append({"object": "chat.completion.chunk", "model": model,
+                           "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+            if (request.get("stream_options") or {}).get("include_usage"):
+                events.append({"object": "chat.completion.chunk", "model": model, "choices": [], "usage": usage})
+            self._send_sse(events, text, done_marker=True)
+            return
+
+        time.sleep(self._generation_delay(text))
+        self._send_json(200, {
+            "object": "chat.completion",
+            "model": model,
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+            "usage": usage
+        })
+
+    def _gemini(self, request, url):
+        prompt = "\n".join(
+            part.get("text", "")
+            for content in request.get("contents", [])
+            for part in content.get("parts", [])
+        )
+        text = self.state.completion_text(prompt)
+
+        def chunk(piece, finished):
+            candidate = {"content": {"role": "model", "parts": [{"text": piece}]}, "index": 0}
+            if finished:
+                candidate["finishReason"] = "STOP"
+            return {"candidates": [candidate], "usageMetadata": {
+                "promptTokenCount": len(prompt) // CHARS_PER_TOKEN,
+                "candidatesTokenCount": len(text) // CHARS_PER_TOKEN
+            }}
+
+        if ":streamGenerateContent" not in url.path:
+            time.sleep(self._generation_delay(text))
+            self._send_json(200, chunk(text, True))
+            return
+
+        self.state.count("streamed")
+        pieces = [text[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(text), STREAM_CHUNK_CHARS)]
+        events = [chunk(piece, i == len(pieces) - 1) for i, piece in enumerate(pieces)]
+        if parse_qs(url.query).get("alt") == ["sse"]:
+            self._send_sse(events, text)
+        else:
+            self._send_json_array_stream(events, text)
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _start_chunked(self, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _write_chunk(self, data):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def _send_sse(self, events, text, done_marker=False):
+        delay = self._generation_delay(text) / max(1, len(events))
+        self._start_chunked("text/event-stream")
+        for event in events:
+            self._write_chunk(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+            time.sleep(delay)
+        if done_marker:
+            self._write_chunk(b"data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _send_json_array_stream(self, events, text):
+        delay = self._generation_delay(text) / max(1, len(events))
+        self._start_chunked("application/json")
+        for i, event in enumerate(events):
+            self._write_chunk((("[" if i == 0 else ",\r\n") + json.dumps(event)).encode("utf-8"))
+            time.sleep(delay)
+        self._write_chunk(b"]")
+        self.wfile.write(b"0\r\n\r\n")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Mock OpenAI/xAI/Gemini server for offline load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.5, help="mean time to first byte in seconds")
+    parser.add_argument("--latency-distribution", choices=["fixed", "uniform", "exponential", "lognormal"],
+                        default="lognormal")
+    parser.add_argument("--jitter", type=float, default=0.5,
+                        help="half-width for uniform, sigma for lognormal")
+    parser.add_argument("--tokens-per-second", type=float, default=200.0,
+                        help="generation speed for the reply body (0 = instant)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability of a 5xx reply")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="probability of an injected 429")
+    parser.add_argument("--retry-after", type=float, default=2.0, help="Retry-After seconds on injected 429s")
+    parser.add_argument("--rpm", type=int, default=0, help="enforce a real requests/min quota (0 = off)")
+    parser.add_argument("--invalid-rate", type=float, default=0.0,
+                        help="probability of an 'Invalid Content for Extraction' concept")
+    parser.add_argument("--concepts", help="JSON list file or directory of concept JSON (default: outputs/)")
+    parser.add_argument("--no-unique-topics", dest="unique_topics", action="store_false",
+                        help="return canned topics verbatim instead of tagging them with a content hash")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    return parser.parse_args(argv)
+
+
+def create_server(args):
+    """Build (but do not start) the mock server; port 0 picks a free port"""
+    handler = type("BoundMockLLMHandler", (MockLLMHandler,), {"state": MockLLMState(args)})
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    server = create_server(args)
+    host, port = server.server_address[:2]
+    state = server.RequestHandlerClass.state
+
+    print(f"🧪 Mock LLM server on http://{host}:{port} ({len(state.concepts)} canned concepts)")
+    print(f"   latency {args.latency_distribution} mean {args.latency}s, {args.tokens_per_second} tok/s, "
+          f"errors {args.error_rate:.0%}, 429s {args.rate_limit_rate:.0%}, rpm {args.rpm or 'unlimited'}")
+    print(f"   LLM_BASE_URL=http://{host}:{port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"📊 {json.dumps(state.stats())}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Concurrent Master Daily Multi-Book Extraction Runner
+Python replacement for run_all_daily.sh that runs every book at once
+
+Books are I/O bound on Gemini, Grok and OpenAI, so each one runs in its own
+worker thread under a single asyncio loop. Provider calls are paced by the
+shared per-provider rate limiters (config/providers_config.json), every
+book gets its own timeout and SIGTERM/SIGINT cancels all books
+cooperatively (the current LLM call finishes, progress and backlog are
+saved). Nightly wall time is roughly that of the slowest book instead of
+the sum of all of them.
+
+There is no global run lock: each book is locked for its session
+(core/book_lock.py), so overlapping runs share the work and a book that is
+already being extracted elsewhere is reported as LOCKED and skipped.
+
+Usage (from the project root):
+    python scripts/run_all_daily.py [--timeout 600] [book_key ...]
+"""
+
+import os
+import sys
+import signal
+import asyncio
+import argparse
+import threading
+import contextvars
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+# Add project root to Python path for module imports
+sys.path.append('.')
+
+from core.extraction_engine import (
+    ExtractionEngine, PROJECT_ROOT, ENV_CONFIG_FILE, PROCESSORS,
+    load_books_config, load_providers_config, resolve_project_path, create_processor, create_book_processor,
+    get_response_cache
+)
+from core.metrics import get_metrics, format_stage_times
+from core.book_lock import BookLockedError
+
+LOG_DIR = PROJECT_ROOT / "logs"
+OUTPUTS_DIR = PROJECT_ROOT / "outputs"
+DEFAULT_BOOK_TIMEOUT = 600
+CANCEL_GRACE_SECONDS = 120
+
+
+class ThreadRoutedStream:
+    """sys.stdout replacement that sends each book thread's prints to its own log
+
+    The target lives in a context variable, so threads that run work with a
+    copied context (the routing processor's hedged requests) print to the
+    same book log as the book thread that started them.
+    """
+
+    def __init__(self, default_stream):
+        self.default_stream = default_stream
+        self.routed = contextvars.ContextVar("routed_stream", default=None)
+
+    def route_to(self, stream):
+        self.routed.set(stream)
+
+    def _stream(self):
+        return self.routed.get() or self.default_stream
+
+    def write(self, data):
+        return self._stream().write(data)
+
+    def flush(self):
+        self._stream().flush()
+
+    def isatty(self):
+        return self._stream().isatty()
+
+
+class MasterRunner:
+    """Runs one extraction session per configured book concurrently"""
+
+    def __init__(self, book_keys=None, timeout=DEFAULT_BOOK_TIMEOUT):
+        self.books = {
+            key: config for key, config in load_books_config().items()
+            if not book_keys or key in book_keys
+        }
+        self.providers_config = load_providers_config()
+        self.timeout = timeout
+        self.run_date = datetime.now().strftime("%Y-%m-%d")
+        self.master_log = LOG_DIR / f"master_extraction_{self.run_date}.log"
+        self.interactive = sys.__stdout__.isatty()
+
+        self.stdout = ThreadRoutedStream(sys.stdout)
+        self.master_lock = threading.Lock()
+        self.processors = {}
+        self.cancel_events = {key: threading.Event() for key in self.books}
+        self.results = {}
+        self.durations = {}
+        self.concepts = {}
+
+    # Logging (same line format as run_all_daily.sh)
+
+    def log(self, level, message):
+        line = f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} [{level}] {message}\n"
+        with self.master_lock:
+            self.stdout.default_stream.write(line)
+            self.stdout.default_stream.flush()
+            with open(self.master_log, 'a') as f:
+                f.write(line)
+
+    def book_name(self, book_key):
+        return self.books[book_key].get("display_name", book_key)
+
+    def ai_model(self, book_key):
+        processor_name = self.books[book_key]["processor"]
+        return PROCESSORS[processor_name][3] if processor_name in PROCESSORS else processor_name
+
+    # Setup
+
+    def provider_names(self, book_key=None):
+        """Primary + fallback providers of one book, or of every active book"""
+        book_keys = [book_key] if book_key else [
+            key for key, config in self.books.items() if config.get("status", "active") == "active"
+        ]
+        names = []
+        for key in book_keys:
+            for name in [self.books[key]["processor"], *self.books[key].get("fallback_processors", [])]:
+                if name not in names:
+                    names.append(name)
+        return names
+
+    def create_processors(self):
+        """Create one shared processor per provider used by an active book"""
+        for processor_name in self.provider_names():
+            limits = self.providers_config.get(processor_name, {})
+            try:
+                # Processors pace themselves through the shared per-provider rate limiter
+                self.processors[processor_name] = create_processor(processor_name)
+                self.log("INFO", f"{PROCESSORS[processor_name][3]} processor ready "
+                                 f"({limits.get('requests_per_minute', '∞')} req/min, "
+                                 f"{limits.get('tokens_per_minute', '∞')} tok/min, "
+                                 f"up to {limits.get('max_concurrency', 4)} in flight)")
+            except Exception as e:
+                self.processors[processor_name] = None
+                self.log("ERROR", f"Failed to initialize {processor_name} processor: {e}")
+
+    def cancel_all(self, signal_name):
+        self.log("WARN", f"Received {signal_name}, cancelling all book extractions...")
+        for event in self.cancel_events.values():
+            event.set()
+
+    # Per-book execution
+
+    def _run_book_session(self, book_key):
+        """Worker thread body: run one session with output routed to the book log"""
+        book_log = LOG_DIR / f"{book_key}_{self.run_date}.log"
+        with open(book_log, 'a', buffering=1) as log_stream:
+            self.stdout.route_to(log_stream)
+            try:
+                print(f"\n🕐 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} concurrent extraction run")
+                processor = create_book_processor(self.books[book_key], shared_processors=self.processors)
+                engine = ExtractionEngine(book_key, self.books[book_key], processor=processor)
+                engine.run_extraction_session(cancel_event=self.cancel_events[book_key])
+                return engine.progress_tracker.progress["total_concepts_extracted"]
+            except BookLockedError as e:
+                print(f"🔒 Skipping: {e}")
+                raise
+            except Exception as e:
+                print(f"❌ {self.book_name(book_key)} extraction failed: {e}")
+                raise
+            finally:
+                self.stdout.route_to(None)
+
+    async def run_book(self, book_key):
+        book_config = self.books[book_key]
+        book_name = self.book_name(book_key)
+        self.log("INFO", f"Processing: {book_name} ({self.ai_model(book_key)})")
+
+        if book_config.get("status", "active") != "active":
+            self.log("INFO", f"Skipping {book_name} (status: {book_config.get('status')})")
+            self.results[book_key] = "PENDING"
+            return
+
+        if not resolve_project_path(book_config["pdf_path"]).exists():
+            self.log("ERROR", f"PDF not found: {book_config['pdf_path']}")
+            self.results[book_key] = "PDF_MISSING"
+            return
+
+        if not any(self.processors.get(name) for name in self.provider_names(book_key)):
+            self.log("ERROR", f"{book_name} has no working processor ({', '.join(self.provider_names(book_key))})")
+            self.results[book_key] = "FAILED"
+            return
+
+        self.log("INFO", f"Running extraction for {book_name}...")
+        started = datetime.now()
+        session = asyncio.ensure_future(asyncio.to_thread(self._run_book_session, book_key))
+
+        done, _ = await asyncio.wait({session}, timeout=self.timeout)
+        if not done:
+            # Threads cannot be killed: ask the engine to stop after its current call
+            self.cancel_events[book_key].set()
+            await asyncio.wait({session}, timeout=CANCEL_GRACE_SECONDS)
+
+        self.durations[book_key] = int((datetime.now() - started).total_seconds())
+        duration = self.durations[book_key]
+
+        if not session.done():
+            self.log("ERROR", f"{book_name} did not stop within {CANCEL_GRACE_SECONDS}s of cancellation")
+            self.results[book_key] = "TIMEOUT"
+        elif isinstance(session.exception(), BookLockedError):
+            self.log("WARN", f"{book_name} skipped: {session.exception()}")
+            self.results[book_key] = "LOCKED"
+        elif session.exception() is not None:
+            self.log("ERROR", f"{book_name} extraction failed: {session.exception()}")
+            self.results[book_key] = "FAILED"
+        elif not done:
+            self.log("ERROR", f"{book_name} extraction timed out (>{self.timeout}s)")
+            self.results[book_key] = "TIMEOUT"
+        elif self.cancel_events[book_key].is_set():
+            self.log("WARN", f"{book_name} extraction cancelled ({duration}s)")
+            self.results[book_key] = "CANCELLED"
+        else:
+            self.concepts[book_key] = session.result()
+            self.log("INFO", f"{book_name} extraction completed successfully ({duration}s, {self.concepts[book_key]} total concepts)")
+            self.results[book_key] = "SUCCESS"
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        # One thread per book so no book waits for a free worker
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=max(len(self.books), 1)))
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, self.cancel_all, sig.name)
+
+        self.create_processors()
+        await asyncio.gather(*(self.run_book(book_key) for book_key in self.books))
+
+    # Reporting
+
+    def ordered_results(self):
+        """Results in books_config.json order rather than completion order"""
+        return [(book_key, self.results[book_key]) for book_key in self.books if book_key in self.results]
+
+    @staticmethod
+    def metrics_section(metrics):
+        """Markdown roll-up of the run's metrics spans"""
+        if not metrics["spans"]:
+            return ""
+
+        section = """## Stage Timing & Cost
+Time is summed over all books, which run concurrently.
+
+| Stage | Spans | Time (s) | Items | MB |
+|-------|-------|----------|-------|----|
+"""
+        for name, aggregate in metrics["spans"].items():
+            section += (f"| {name} | {aggregate['count']} | {aggregate['seconds']:.2f} | {aggregate['items']} | "
+                        f"{aggregate['bytes'] / 1024 / 1024:.2f} |\n")
+
+        if metrics["providers"]:
+            section += """
+| Provider | Calls | Errors | Time (s) | Prompt Tokens | Completion Tokens | Estimated Usage (calls) | Est. Cost (USD) |
+|----------|-------|--------|----------|---------------|-------------------|-------------------------|-----------------|
+"""
+            for provider, aggregate in metrics["providers"].items():
+                section += (f"| {provider} | {aggregate['count']} | {aggregate['errors']} | {aggregate['seconds']:.2f} | "
+                            f"{aggregate['prompt_tokens']} | {aggregate['completion_tokens']} | "
+                            f"{aggregate['tokens_estimated']} | {aggregate['cost']:.4f} |\n")
+        return section + "\n"
+
+    def write_summary(self, wall_seconds):
+        total_books = len(self.books)
+        successful = sum(1 for result in self.results.values() if result == "SUCCESS")
+        failed = sum(1 for result in self.results.values() if result not in ("SUCCESS", "PENDING", "LOCKED"))
+
+        self.log("INFO", "Master Extraction Summary")
+        self.log("INFO", "=========================")
+        for book_key, result in self.ordered_results():
+            book_name = self.book_name(book_key)
+            duration = self.durations.get(book_key, 0)
+            if result == "SUCCESS":
+                self.log("INFO", f"✅ {book_name}: COMPLETED ({duration}s, {self.concepts[book_key]} concepts)")
+            elif result == "PENDING":
+                self.log("INFO", f"⏳ {book_name}: PENDING")
+            elif result == "LOCKED":
+                self.log("WARN", f"🔒 {book_name}: LOCKED (running elsewhere)")
+            elif result == "FAILED":
+                self.log("ERROR", f"❌ {book_name}: FAILED ({duration}s)")
+            elif result == "TIMEOUT":
+                self.log("ERROR", f"⏰ {book_name}: TIMEOUT ({duration}s)")
+            elif result == "CANCELLED":
+                self.log("ERROR", f"🛑 {book_name}: CANCELLED ({duration}s)")
+            elif result == "PDF_MISSING":
+                self.log("ERROR", f"📄 {book_name}: PDF MISSING")
+
+        self.log("INFO", "Statistics:")
+        self.log("INFO", f"📚 Total books configured: {total_books}")
+        self.log("INFO", f"✅ Successful extractions: {successful}")
+        self.log("INFO", f"❌ Failed extractions: {failed}")
+
+        now = datetime.now()
+        summary_path = OUTPUTS_DIR / f"master_daily_summary_{now.strftime('%Y-%m-%d-%H%M')}.md"
+        run_type = "Interactive" if self.interactive else "Automated (cron)"
+
+        summary = f"""# 🏛️ Master Daily Extraction Summary
+
+**Date:** {now.strftime('%Y-%m-%d %H:%M:%S')}
+**Total Books:** {total_books}
+**Successful:** {successful}
+**Failed:** {failed}
+**Run Type:** {run_type}
+**Wall Time:** {wall_seconds}s (concurrent)
+
+## Book Status
+
+"""
+        metrics = get_metrics().rollup()
+        for book_key, result in self.ordered_results():
+            summary += f"### {self.book_name(book_key)} ({self.ai_model(book_key)})\n"
+            summary += f"**Status:** {result}\n"
+            if result == "SUCCESS":
+                summary += f"**Duration:** {self.durations[book_key]}s | **Total Concepts:** {self.concepts[book_key]}\n"
+            if metrics["books"].get(book_key):
+                summary += f"**Stage Time:** {format_stage_times(metrics['books'][book_key])}\n"
+            summary += "\n"
+
+        summary += self.metrics_section(metrics)
+
+        if now.hour < 11:
+            next_run = "Today at 11:00"
+        elif now.hour < 23:
+            next_run = "Today at 23:00"
+        else:
+            next_run = "Tomorrow at 11:00"
+
+        summary += f"""
+## Logs
+- **Master Log:** `logs/master_extraction_{self.run_date}.log`
+- **Individual Logs:** `logs/{{book}}_{self.run_date}.log`
+- **Metrics:** `logs/metrics/metrics_{now.strftime('%Y-%m-%d')}.jsonl`
+
+## Next Steps
+- Next automated run: {next_run}
+- Check individual book logs for any issues
+- Monitor API usage and rate limits
+
+---
+*Generated by Master Archaeological Extraction Engine*
+"""
+        OUTPUTS_DIR.mkdir(parents=True, exist_ok=True)
+        with open(summary_path, 'w') as f:
+            f.write(summary)
+        self.log("INFO", f"Master summary saved: {summary_path}")
+
+        total_duration = sum(self.durations.values())
+        self.log("INFO", "Performance Metrics:")
+        self.log("INFO", f"💡 Wall time: {wall_seconds}s")
+        self.log("INFO", f"💡 Total book time: {total_duration}s")
+        if total_books:
+            self.log("INFO", f"💡 Average per book: {total_duration // total_books}s")
+            self.log("INFO", f"💡 Success rate: {successful * 100 // total_books}%")
+
+        for processor_name, processor in self.processors.items():
+            rate_limiter = getattr(processor, "rate_limiter", None) if processor else None
+            if rate_limiter:
+                stats = rate_limiter.stats()
+                self.log("INFO", f"💡 {PROCESSORS[processor_name][3]} rate limiter: {stats['calls']} calls, "
+                                 f"{stats['retries']} retries, {stats['rate_limited']} rate limited, "
+                                 f"final concurrency {stats['concurrency_limit']}")
+
+            http = getattr(processor, "http", None) if processor else None
+            if http and http.requests_made:
+                stats = http.stats()
+                self.log("INFO", f"💡 {PROCESSORS[processor_name][3]} HTTP: {stats['requests']} requests, "
+                                 f"{stats['new_connections']} new / {stats['reused_connections']} reused connections, "
+                                 f"avg connect {stats['avg_connect']:.3f}s, TTFB {stats['avg_ttfb']:.3f}s, "
+                                 f"transfer {stats['avg_transfer']:.3f}s")
+
+        total_cost = sum(provider["cost"] for provider in metrics["providers"].values())
+        if metrics["providers"]:
+            self.log("INFO", f"💡 Estimated LLM cost: ${total_cost:.4f}")
+
+        response_cache = get_response_cache()
+        if response_cache is not None:
+            stats = response_cache.stats()
+            self.log("INFO", f"💡 LLM response cache: {stats['hits']} hits, {stats['misses']} misses "
+                             f"({stats['hit_rate']:.0%} hit rate, {stats['entries']} entries, "
+                             f"{stats['bytes'] / 1024 / 1024:.1f} MB)")
+
+        if failed:
+            self.log("WARN", "Some extractions failed - check API rate limits")
+
+        return successful, total_books
+
+
+def main():
+    """Main execution"""
+    parser = argparse.ArgumentParser(description="Run daily extraction for all books concurrently")
+    parser.add_argument("books", nargs="*", help="book keys to run (default: every configured book)")
+    parser.add_argument("--timeout", type=int, default=DEFAULT_BOOK_TIMEOUT, help="per-book timeout in seconds")
+    parser.add_argument("--no-cache", action="store_true", help="bypass the LLM response cache entirely")
+    parser.add_argument("--refresh-cache", action="store_true", help="ignore cached responses but store fresh ones")
+    args = parser.parse_args()
+
+    if args.no_cache:
+        os.environ["LLM_CACHE_BYPASS"] = "1"
+    if args.refresh_cache:
+        os.environ["LLM_CACHE_REFRESH"] = "1"
+
+    os.chdir(PROJECT_ROOT)
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+
+    runner = MasterRunner(args.books or None, timeout=args.timeout)
+    if not ENV_CONFIG_FILE.exists():
+        runner.log("ERROR", f"Config file not found: {ENV_CONFIG_FILE}")
+        return 1
+
+    sys.stdout = runner.stdout
+    try:
+        runner.log("INFO", "Starting master daily extraction (concurrent)...")
+        runner.log("INFO", f"Run type: {'Interactive' if runner.interactive else 'Automated (cron)'}")
+
+        started = datetime.now()
+        asyncio.run(runner.run())
+        successful, total_books = runner.write_summary(int((datetime.now() - started).total_seconds()))
+    finally:
+        sys.stdout = runner.stdout.default_stream
+
+    if successful == total_books:
+        runner.log("INFO", "🎉 All book extractions completed successfully!")
+        return 0
+
+    runner.log("WARN", f"Some extractions had issues (Success: {successful}/{total_books})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
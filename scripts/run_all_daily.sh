@@ -26,7 +26,6 @@ PROJECT_DIR="/home/shahar42/Suumerizing_C_holy_grale_book"
 VENV_PATH="$PROJECT_DIR/venv"
 LOG_DIR="$PROJECT_DIR/logs"
 BOOKS_DIR="$PROJECT_DIR/books"
-LOCK_FILE="$PROJECT_DIR/extraction.lock"
 MASTER_LOG="$LOG_DIR/master_extraction_$(date +%Y-%m-%d).log"
 
 # Function for timestamped logging
@@ -36,26 +35,9 @@ log() {
     echo "$(date '+%Y-%m-%d %H:%M:%S') [$level] $*" | tee -a "$MASTER_LOG"
 }
 
-# Function for cleanup on exit
-cleanup() {
-    if [[ -f "$LOCK_FILE" ]]; then
-        rm -f "$LOCK_FILE"
-        log "INFO" "Lock file removed"
-    fi
-}
-
-# Set up cleanup trap
-trap cleanup EXIT INT TERM
-
-# Check for running instance (file locking)
-if [[ -f "$LOCK_FILE" ]]; then
-    log "ERROR" "Another extraction is already running (lock file exists)"
-    exit 1
-fi
-
-# Create lock file with PID
-echo $$ > "$LOCK_FILE"
-log "INFO" "Created lock file with PID $$"
+# No global lock: the extraction engine locks each book for its session
+# (outputs/<book>/.extraction.lock), so overlapping runs extract different
+# books in parallel and a book that is already running exits with code 75
 
 # Ensure we're in the right directory
 if [[ ! -d "$PROJECT_DIR" ]]; then
@@ -195,7 +177,8 @@ for book_key in "${!BOOK_SCRIPTS[@]}"; do
         # Count extracted concepts from progress file
         progress_file="outputs/$book_key/progress.json"
         if [[ -f "$progress_file" ]]; then
-            concepts=$(jq -r '.total_concepts_extracted // 0' "$progress_file" 2>/dev/null || echo "0")
+            # Read through ProgressTracker so sessions still only in progress.journal are counted
+            concepts=$(python3 -c "import sys; sys.path.insert(0, '.'); from core.progress_tracker import read_progress; print(read_progress(sys.argv[1])['total_concepts_extracted'])" "$progress_file" 2>/dev/null || echo "0")
             BOOK_CONCEPTS[$book_key]=$concepts
         else
             BOOK_CONCEPTS[$book_key]="0"
@@ -210,7 +193,11 @@ for book_key in "${!BOOK_SCRIPTS[@]}"; do
         duration=$((end_time - start_time))
         BOOK_DURATIONS[$book_key]=$duration
         
-        if [[ $exit_code -eq 124 ]]; then
+        if [[ $exit_code -eq 75 ]]; then
+            log "WARN" "$book_name skipped (already being extracted by another run)"
+            BOOK_RESULTS[$book_key]="LOCKED"
+            continue
+        elif [[ $exit_code -eq 124 ]]; then
             log "ERROR" "$book_name extraction timed out (>10 minutes)"
             BOOK_RESULTS[$book_key]="TIMEOUT"
         else
@@ -252,6 +239,9 @@ for book_key in "${!BOOK_RESULTS[@]}"; do
         "TIMEOUT")
             log "ERROR" "⏰ $book_name: TIMEOUT (${duration}s)"
             ;;
+        "LOCKED")
+            log "WARN" "🔒 $book_name: LOCKED (running elsewhere)"
+            ;;
         "SCRIPT_MISSING")
             log "ERROR" "📄 $book_name: SCRIPT MISSING"
             ;;
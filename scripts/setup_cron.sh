@@ -13,6 +13,8 @@ NC='\033[0m'
 # Configuration
 PROJECT_DIR="/home/shahar42/Suumerizing_C_holy_grale_book"
 MASTER_SCRIPT="$PROJECT_DIR/scripts/run_all_daily.sh"
+# Concurrent Python runner (all books at once); run_all_daily.sh stays as the sequential fallback
+MASTER_RUNNER="$PROJECT_DIR/venv/bin/python3 $PROJECT_DIR/scripts/run_all_daily.py"
 CRON_LOG_DIR="$PROJECT_DIR/logs/cron"
 
 echo -e "${BLUE}🕐 Updated Cron Setup for 5-Book Extraction System${NC}"
@@ -52,10 +54,10 @@ CRON_ENTRIES="# Automated C Programming Book Concept Extraction
 # Logs are stored in $CRON_LOG_DIR
 
 # Morning extraction at 11:00 AM
-0 11 * * * cd $PROJECT_DIR && $MASTER_SCRIPT >> $CRON_LOG_DIR/morning_\$(date +\\%Y-\\%m-\\%d).log 2>&1
+0 11 * * * cd $PROJECT_DIR && $MASTER_RUNNER >> $CRON_LOG_DIR/morning_\$(date +\\%Y-\\%m-\\%d).log 2>&1
 
 # Evening extraction at 11:00 PM  
-0 23 * * * cd $PROJECT_DIR && $MASTER_SCRIPT >> $CRON_LOG_DIR/evening_\$(date +\\%Y-\\%m-\\%d).log 2>&1
+0 23 * * * cd $PROJECT_DIR && $MASTER_RUNNER >> $CRON_LOG_DIR/evening_\$(date +\\%Y-\\%m-\\%d).log 2>&1
 
 # Weekly cleanup of old cron logs (keep last 14 days)
 0 1 * * 0 find $CRON_LOG_DIR -name '*.log' -mtime +14 -delete
@@ -86,7 +88,7 @@ install_cron() {
         fi
         
         # Remove existing extraction jobs
-        current_cron=$(echo "$current_cron" | grep -v "Automated C Programming Book" | grep -v "$MASTER_SCRIPT" | grep -v "find $CRON_LOG_DIR")
+        current_cron=$(echo "$current_cron" | grep -v "Automated C Programming Book" | grep -v "scripts/run_all_daily" | grep -v "find $CRON_LOG_DIR")
     fi
     
     # Add new cron jobs
@@ -253,7 +255,7 @@ case "${1:-setup}" in
     "remove")
         echo -e "${YELLOW}🗑️  Removing extraction cron jobs...${NC}"
         if crontab -l 2>/dev/null | grep -q "Automated C Programming Book"; then
-            current_cron=$(crontab -l 2>/dev/null | grep -v "Automated C Programming Book" | grep -v "$MASTER_SCRIPT" | grep -v "find $CRON_LOG_DIR")
+            current_cron=$(crontab -l 2>/dev/null | grep -v "Automated C Programming Book" | grep -v "scripts/run_all_daily" | grep -v "find $CRON_LOG_DIR")
             echo "$current_cron" | crontab -
             echo -e "${GREEN}✅ Extraction cron jobs removed${NC}"
         else
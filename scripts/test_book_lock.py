@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Quick test script for the per-book extraction lock (core/book_lock.py)
+Checks exclusion, release, stale-lock reclaim and the reclaim race where
+two runs judge the same lock file stale, in a temporary directory.
+
+Run from the project root:
+    python scripts/test_book_lock.py
+"""
+
+import os
+import sys
+import json
+import time
+import fcntl
+import shutil
+import socket
+import tempfile
+import threading
+sys.path.append('.')
+
+from core.book_lock import BookLock, BookLockedError
+
+DEAD_PID = 2 ** 22 + 12345  # above the largest pid_max Linux allows, so never a live process
+
+
+def check(label, ok):
+    print(f"{'✅' if ok else '❌'} {label}")
+    return ok
+
+
+def is_locked(lock_path):
+    try:
+        BookLock(lock_path, "test_book").acquire().release()
+        return False
+    except BookLockedError:
+        return True
+
+
+def leave_stale_lock(lock_path):
+    """Lock file held by an orphaned descriptor whose recorded holder is dead"""
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    fcntl.flock(fd, fcntl.LOCK_EX)
+    os.pwrite(fd, json.dumps({"pid": DEAD_PID, "host": socket.gethostname()}).encode("utf-8"), 0)
+    return fd
+
+
+def test_exclusion(tmp_path):
+    """Only one holder at a time; release frees the book"""
+    lock_path = os.path.join(tmp_path, ".extraction.lock")
+    lock = BookLock(lock_path, "test_book").acquire()
+    locked_while_held = is_locked(lock_path)
+    lock.release()
+    return all([
+        check("second acquire fails while held", locked_while_held),
+        check("acquire succeeds after release", not is_locked(lock_path)),
+    ])
+
+
+def test_stale_reclaim(tmp_path):
+    """A lock whose recorded PID is dead is taken over"""
+    lock_path = os.path.join(tmp_path, ".extraction.lock")
+    orphan = leave_stale_lock(lock_path)
+    try:
+        lock = BookLock(lock_path, "test_book").acquire()
+        reclaimed = os.fstat(lock.fd).st_ino != os.fstat(orphan).st_ino
+        lock.release()
+    except BookLockedError:
+        reclaimed = False
+    os.close(orphan)
+    return check("stale lock reclaimed onto a new lock file", reclaimed)
+
+
+def test_reclaim_race(tmp_path):
+    """A reclaimer that stalls after its inode check never unlinks its successor's lock file"""
+    lock_path = os.path.join(tmp_path, ".extraction.lock")
+    orphan = leave_stale_lock(lock_path)
+    slow = BookLock(lock_path, "test_book")
+    fast = BookLock(lock_path, "test_book")
+    slow_fd = os.open(lock_path, os.O_RDWR)
+    fast_fd = os.open(lock_path, os.O_RDWR)
+
+    still_linked = BookLock._still_linked
+
+    def stalling_still_linked(self, fd):
+        linked = still_linked(self, fd)
+        if self is slow and linked:
+            time.sleep(0.3)
+        return linked
+
+    BookLock._still_linked = stalling_still_linked
+    try:
+        stalled = threading.Thread(target=slow._reclaim, args=(slow_fd,))
+        stalled.start()
+        time.sleep(0.1)
+        fast._reclaim(fast_fd)
+        holder = BookLock(lock_path, "test_book").acquire()
+        stalled.join()
+    finally:
+        BookLock._still_linked = still_linked
+
+    intact = os.path.exists(lock_path) and os.stat(lock_path).st_ino == os.fstat(holder.fd).st_ino
+    excluded = is_locked(lock_path)
+    holder.release()
+    for fd in (slow_fd, fast_fd, orphan):
+        os.close(fd)
+    return all([
+        check("successor's lock file survives the stalled reclaim", intact),
+        check("no second holder after the race", excluded),
+    ])
+
+
+if __name__ == "__main__":
+    print("🔍 Testing book lock\n")
+    results = []
+    for test in [test_exclusion, test_stale_reclaim, test_reclaim_race]:
+        tmp_path = tempfile.mkdtemp(prefix="book_lock_test_")
+        try:
+            results.append(test(tmp_path))
+        finally:
+            shutil.rmtree(tmp_path)
+
+    passed = all(results)
+    print("\n" + "=" * 60)
+    print("✅ Book lock tests passed!" if passed else "❌ Book lock tests failed")
+    sys.exit(0 if passed else 1)
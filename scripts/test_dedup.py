@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Quick test script for concept deduplication (core/dedup.py)
+Checks which topic pairs fold into an existing concept and which stay
+separate, and that near-duplicate raw content is found through LSH.
+
+Run from the project root:
+    python scripts/test_dedup.py
+"""
+
+import sys
+sys.path.append('.')
+
+from core.dedup import ConceptDeduplicator, topic_tokens
+
+# (saved topic, new topic) pairs that are the same concept
+SAME_TOPICS = [
+    ("Main Function", "The main() Function in C"),
+    ("Pointer Arithmetic", "Pointer Arithmetic in C"),
+    ("The read() System Call", "read() System Call"),
+]
+
+# (saved topic, new topic) pairs that only share words
+DIFFERENT_TOPICS = [
+    ("Arrays of Pointers", "Pointers to Arrays"),
+    ("Pointer to Const", "Const Pointer"),
+    ("Pointer to Function", "Function Returning a Pointer"),
+    ("Signals in Threads", "Threads and Signals"),
+]
+
+CONTENT = ("The fork function creates a new process. The new process is called the child "
+           "process and is an exact copy of the parent except for the returned process ID. "
+           "Both processes continue executing with the instruction that follows the call.")
+
+
+def check(label, ok):
+    print(f"{'✅' if ok else '❌'} {label}")
+    return ok
+
+
+def test_topic_folding():
+    """Same concept folds, shared words alone do not"""
+    print("🔍 Testing topic folding\n")
+    results = []
+    for saved, new in SAME_TOPICS + DIFFERENT_TOPICS:
+        dedup = ConceptDeduplicator("test_book")
+        dedup.record_topic(saved, "concept_001.json")
+        folded = dedup.find_similar_topic(new) is not None
+        expected = (saved, new) in SAME_TOPICS
+        results.append(check(f"'{new}' {'folds into' if folded else 'stays separate from'} '{saved}'",
+                             folded == expected))
+
+    results.append(check("topic tokens keep order and prepositions",
+                         topic_tokens("The Arrays of Pointers in C") == ("arrays", "of", "pointers")))
+    return all(results)
+
+
+def test_content_duplicates():
+    """A lightly edited copy of recorded content is caught, unrelated content is not"""
+    print("\n🔍 Testing near-duplicate content\n")
+    dedup = ConceptDeduplicator("test_book")
+    dedup.record_content(CONTENT, "concept_001.json")
+
+    edited = CONTENT.replace("is an exact copy", "is an identical copy")
+    duplicate = dedup.find_duplicate_content(edited)
+    unrelated = dedup.find_duplicate_content(
+        "A mutex protects shared data from concurrent access by several threads at once.")
+    return all([
+        check("exact copy is a duplicate", dedup.find_duplicate_content(CONTENT) is not None),
+        check("edited copy is a near-duplicate of concept_001.json",
+              duplicate is not None and dedup.describe(duplicate[0]) == "concept_001.json"),
+        check("unrelated content is not a duplicate", unrelated is None),
+    ])
+
+
+if __name__ == "__main__":
+    passed = all([test_topic_folding(), test_content_duplicates()])
+    print("\n" + "=" * 60)
+    print("✅ Dedup tests passed!" if passed else "❌ Dedup tests failed")
+    sys.exit(0 if passed else 1)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Quick test script for the concept search index (core/search_index.py)
+Checks BM25F ranking, prefix and plural matching, book filtering and
+live removal on a handful of hand-made concepts.
+
+Run from the project root:
+    python scripts/test_search_index.py
+"""
+
+import sys
+sys.path.append('.')
+
+from core.search_index import ConceptSearchIndex
+
+CONCEPTS = [
+    {"id": "kr_1", "book": "kernighan_ritchie", "book_title": "The C Programming Language",
+     "title": "Pointer Arithmetic", "description": "Adding integers to a pointer moves it by whole elements",
+     "content": "p + 1 points to the next element of the array"},
+    {"id": "kr_2", "book": "kernighan_ritchie", "book_title": "The C Programming Language",
+     "title": "Arrays of Pointers", "description": "An array whose elements are pointers to strings",
+     "content": "Sorting lines by swapping pointers instead of copying text"},
+    {"id": "unix_1", "book": "unix_env", "book_title": "Advanced Programming in the UNIX Environment",
+     "title": "Memory Allocation", "description": "malloc, calloc and realloc return heap memory",
+     "content": "The allocator keeps free lists; memcpy copies between the blocks"},
+    {"id": "unix_2", "book": "unix_env", "book_title": "Advanced Programming in the UNIX Environment",
+     "title": "Process Creation", "description": "fork creates a child process",
+     "content": "The child gets a copy of the parent's memory"},
+]
+
+
+def check(label, ok):
+    print(f"{'✅' if ok else '❌'} {label}")
+    return ok
+
+
+def ids(results):
+    return [concept["id"] for concept, _ in results]
+
+
+def build_index():
+    index = ConceptSearchIndex()
+    for concept in CONCEPTS:
+        index.add(concept)
+    return index
+
+
+def test_matching():
+    """Prefixes, plurals and ranking"""
+    print("🔍 Testing search matching\n")
+    index = build_index()
+    return all([
+        check("prefix 'mem' finds memory and memcpy concepts", set(ids(index.search("mem"))) == {"unix_1", "unix_2"}),
+        check("prefix 'alloc' finds Memory Allocation first", ids(index.search("alloc"))[:1] == ["unix_1"]),
+        check("plural 'pointers' finds both pointer concepts", set(ids(index.search("pointers"))) == {"kr_1", "kr_2"}),
+        check("singular 'array' finds 'Arrays of Pointers' by title first",
+              ids(index.search("array"))[:1] == ["kr_2"]),
+        check("title hit outranks content hit ('process')", ids(index.search("process"))[:1] == ["unix_2"]),
+        check("require_all needs every word", ids(index.search("pointer arithmetic", require_all=True)) == ["kr_1"]),
+        check("book filter", ids(index.search("memory", book="kernighan_ritchie")) == []),
+        check("unknown word finds nothing", index.search("zebraquux") == []),
+    ])
+
+
+def test_removal():
+    """Removed concepts stop matching and the rest still rank"""
+    print("\n🔍 Testing live removal\n")
+    index = build_index()
+    index.remove("unix_1")
+    return all([
+        check("removed concept no longer matches", "unix_1" not in ids(index.search("memory"))),
+        check("other concepts still match", ids(index.search("memory")) == ["unix_2"]),
+        check("document count follows removals", len(index) == len(CONCEPTS) - 1),
+    ])
+
+
+if __name__ == "__main__":
+    passed = all([test_matching(), test_removal()])
+    print("\n" + "=" * 60)
+    print("✅ Search index tests passed!" if passed else "❌ Search index tests failed")
+    sys.exit(0 if passed else 1)
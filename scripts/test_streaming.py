@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Quick test script for streamed completions (processors/streaming.py)
+Feeds scripted chunk sequences through consume_stream and checks that
+invalid topics and bad schemas abort the stream early, that a complete
+concept returns without reading the whole stream, and that SSE usage
+chunks are picked up.
+
+Run from the project root:
+    python scripts/test_streaming.py
+"""
+
+import io
+import sys
+import contextlib
+sys.path.append('.')
+
+from processors.streaming import consume_stream, iter_sse_content, InvalidConceptStream, MAX_TAIL_CHARS
+
+VALID_CONCEPT = ['```json\n{"topic": "Pointer ', 'Arithmetic", "explanation": "Adding ',
+                 'to a pointer moves it", "code_example": ["p + 1;"]}', '\n```']
+
+
+class ScriptedStream:
+    """Chunk source that records how much was read and whether it was closed"""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.read = 0
+        self.closed = False
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            self.read += 1
+            yield chunk
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSSEResponse:
+    def __init__(self, lines):
+        self.lines = lines
+
+    def iter_lines(self, decode_unicode=False):
+        return iter(self.lines)
+
+
+def check(label, ok):
+    print(f"{'✅' if ok else '❌'} {label}")
+    return ok
+
+
+def run(chunks):
+    """(text or exception, stream) with the module's console output suppressed"""
+    stream = ScriptedStream(chunks)
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            return consume_stream(iter(stream), "Test", close=stream.close), stream
+        except InvalidConceptStream as e:
+            return e, stream
+
+
+def test_invalid_topics():
+    """Streams naming no usable concept are cut off right after the topic"""
+    print("🔍 Testing early aborts\n")
+    results = []
+    for topic in ["Invalid Content for Extraction", "No Valid C Programming Concept", "N/A"]:
+        chunks = ['{"topic": "', topic, '", "explanation": "', "x" * 50, '"}'] + ["never read"] * 100
+        result, stream = run(chunks)
+        results.append(check(f"'{topic}' aborts after {stream.read} of {len(chunks)} chunks and closes",
+                             isinstance(result, InvalidConceptStream) and stream.read <= 4 and stream.closed))
+
+    result, stream = run(['{"topic": "Pointer Arithmetic", "explanation": ""}'])
+    results.append(check("missing explanation is rejected", isinstance(result, InvalidConceptStream)))
+    result, stream = run(['{"topic": "Pointers", "explanation": "x", "code_example": "p++;"}'])
+    results.append(check("non-list code_example is rejected", isinstance(result, InvalidConceptStream)))
+    result, stream = run(["Let me think about this. " * 100] * 3)
+    results.append(check("prose without JSON is given up on", isinstance(result, InvalidConceptStream)))
+    result, stream = run(['{"topic": "Pointers", "explanation": "cut'])
+    results.append(check("stream ending mid-object is rejected", isinstance(result, InvalidConceptStream)))
+    return all(results)
+
+
+def test_complete_concept():
+    """A valid concept returns once complete and only a short tail is read"""
+    print("\n🔍 Testing complete concepts\n")
+    text, stream = run(VALID_CONCEPT)
+    long_tail, tail_stream = run(VALID_CONCEPT + ["." * MAX_TAIL_CHARS] * 50)
+    return all([
+        check("concept JSON extracted without the fence", text.startswith("{") and text.endswith("}")),
+        check("stream closed afterwards", stream.closed),
+        check("tail after the object is capped",
+              isinstance(long_tail, str) and tail_stream.read < len(tail_stream.chunks)),
+    ])
+
+
+def test_sse_usage():
+    """Content deltas are yielded and the usage chunk is copied"""
+    print("\n🔍 Testing SSE parsing\n")
+    usage = {}
+    response = FakeSSEResponse([
+        'data: {"choices": [{"delta": {"content": "{\\"topic\\": "}}]}',
+        '',
+        'data: {"choices": [{"delta": {"content": "\\"X\\"}"}}]}',
+        'data: {"choices": [], "usage": {"prompt_tokens": 12, "completion_tokens": 5}}',
+        'data: [DONE]',
+        'data: {"choices": [{"delta": {"content": "after done"}}]}',
+    ])
+    content = list(iter_sse_content(response, usage))
+    return all([
+        check("content deltas in order", content == ['{"topic": ', '"X"}']),
+        check("usage copied", usage == {"prompt_tokens": 12, "completion_tokens": 5}),
+    ])
+
+
+if __name__ == "__main__":
+    passed = all([test_invalid_topics(), test_complete_concept(), test_sse_usage()])
+    print("\n" + "=" * 60)
+    print("✅ Streaming tests passed!" if passed else "❌ Streaming tests failed")
+    sys.exit(0 if passed else 1)
@@ -18,6 +18,9 @@ sys.path.append('.')
 
 from mcp.server.fastmcp import FastMCP
 
+from core.concept_store import open_concept_store, STORE_FILENAME, CONCEPT_FILE_GLOB
+from core.outputs_watcher import OutputsWatcher, overlay_changed_files, CHANGED
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("topic-detection-mcp")
@@ -29,6 +32,8 @@ mcp = FastMCP("topic-detection")
 EXTRACTED_CONCEPTS_CACHE = {}
 CACHE_LAST_UPDATED = {}
 CACHE_FILE_TIMESTAMPS = {}
+OUTPUTS_WATCHER = None  # follows outputs/ in the background once the cache is initialized
+CACHE_VERSION = None  # OUTPUTS_WATCHER.version the cache was loaded at
 
 # Book configurations from your existing setup
 BOOK_CONFIGS = {
@@ -167,15 +172,21 @@ def extract_keywords_from_topic(topic: str) -> Tuple[List[str], List[str]]:
     return phrases, individual_words
 
 def get_file_modification_times(outputs_dir: Path) -> Dict[str, float]:
-    """Get modification times for all concept files"""
+    """Get modification times for all concept files (one entry per book held in the concept store)"""
     file_times = {}
     
     if not outputs_dir.exists():
         return file_times
+    
+    store = open_concept_store(outputs_dir / STORE_FILENAME)
+    stored_versions = store.versions() if store else {}
+    for book_id, (_, updated) in stored_versions.items():
+        if book_id in BOOK_CONFIGS:
+            file_times[f"{store.db_path}:{book_id}"] = updated
         
     for book_dir in outputs_dir.iterdir():
-        if book_dir.is_dir() and book_dir.name in BOOK_CONFIGS:
-            for concept_file in book_dir.glob("concept_*.json"):
+        if book_dir.is_dir() and book_dir.name in BOOK_CONFIGS and book_dir.name not in stored_versions:
+            for concept_file in book_dir.glob(CONCEPT_FILE_GLOB):
                 try:
                     file_times[str(concept_file)] = concept_file.stat().st_mtime
                 except OSError:
@@ -183,10 +194,44 @@ def get_file_modification_times(outputs_dir: Path) -> Dict[str, float]:
                     
     return file_times
 
+def load_book_topics(outputs_dir: Path, changes=None) -> Dict[str, List[str]]:
+    """Concept topics per book: one concept store query, JSON files for books not in it
+
+    changes: outputs watcher changes whose files may be ahead of their store rows
+    """
+    topics_by_book = {}
+    
+    store = open_concept_store(outputs_dir / STORE_FILENAME)
+    if store:
+        for book_id, topic in store.topics(list(BOOK_CONFIGS)):
+            topics_by_book.setdefault(book_id, []).append(topic)
+        written = {key: change for key, change in (changes or {}).items() if change == CHANGED}
+        for book_id, _, concept in overlay_changed_files(outputs_dir, [], written, set(topics_by_book)):
+            topic = concept.get('topic') if isinstance(concept, dict) else None
+            if topic and topic not in topics_by_book[book_id]:
+                topics_by_book[book_id].append(topic)
+    
+    for book_dir in outputs_dir.iterdir():
+        if book_dir.is_dir() and book_dir.name in BOOK_CONFIGS and book_dir.name not in topics_by_book:
+            for concept_file in book_dir.glob(CONCEPT_FILE_GLOB):
+                try:
+                    with open(concept_file, 'r', encoding='utf-8') as f:
+                        concept = json.load(f)
+                    if 'topic' in concept:
+                        topics_by_book.setdefault(book_dir.name, []).append(concept['topic'])
+                except Exception as e:
+                    logger.warning(f"Could not load {concept_file}: {e}")
+    
+    return topics_by_book
+
 def cache_needs_refresh() -> bool:
     """Check if cache needs to be refreshed based on file modification times"""
     if not EXTRACTED_CONCEPTS_CACHE:
         return True  # Cache is empty
+    
+    if OUTPUTS_WATCHER is not None:
+        # The watcher thread sees new and changed concept files; queries never stat the tree
+        return OUTPUTS_WATCHER.version != CACHE_VERSION
         
     outputs_dir = Path("outputs")
     current_times = get_file_modification_times(outputs_dir)
@@ -207,7 +252,7 @@ def load_extracted_concepts() -> Dict[str, Dict[str, List[str]]]:
     Returns:
         Dict with structure: {book_id: {"phrases": [...], "words": [...]}}
     """
-    global EXTRACTED_CONCEPTS_CACHE, CACHE_LAST_UPDATED, CACHE_FILE_TIMESTAMPS
+    global EXTRACTED_CONCEPTS_CACHE, CACHE_LAST_UPDATED, CACHE_FILE_TIMESTAMPS, CACHE_VERSION
     
     # Check if we need to refresh cache
     if not cache_needs_refresh():
@@ -223,39 +268,31 @@ def load_extracted_concepts() -> Dict[str, Dict[str, List[str]]]:
         logger.warning(f"Outputs directory not found: {outputs_dir}")
         return {}
     
-    # Update file timestamps
+    # Update file timestamps (taking the watcher version first: changes made while loading trigger another refresh)
+    changes = None
+    if OUTPUTS_WATCHER is not None:
+        CACHE_VERSION = OUTPUTS_WATCHER.version
+        changes = OUTPUTS_WATCHER.changes()
     CACHE_FILE_TIMESTAMPS = get_file_modification_times(outputs_dir)
     
-    for book_dir in outputs_dir.iterdir():
-        if book_dir.is_dir() and book_dir.name in BOOK_CONFIGS:
-            book_phrases = []
-            book_words = []
-            concept_count = 0
-            
-            for concept_file in book_dir.glob("concept_*.json"):
-                try:
-                    with open(concept_file, 'r', encoding='utf-8') as f:
-                        concept = json.load(f)
-                        
-                        # Extract keywords from the topic
-                        if 'topic' in concept:
-                            phrases, words = extract_keywords_from_topic(concept['topic'])
-                            book_phrases.extend(phrases)
-                            book_words.extend(words)
-                            concept_count += 1
-                            
-                except Exception as e:
-                    logger.warning(f"Could not load {concept_file}: {e}")
-            
-            if concept_count > 0:
-                # Remove duplicates while preserving order
-                concepts_by_book[book_dir.name] = {
-                    "phrases": list(dict.fromkeys(book_phrases)),  # Remove duplicates, preserve order
-                    "words": list(dict.fromkeys(book_words))
-                }
-                logger.info(f"Loaded {concept_count} concepts from {book_dir.name}: "
-                           f"{len(concepts_by_book[book_dir.name]['phrases'])} phrases, "
-                           f"{len(concepts_by_book[book_dir.name]['words'])} words")
+    for book_id, topics in load_book_topics(outputs_dir, changes).items():
+        book_phrases = []
+        book_words = []
+        
+        # Extract keywords from the topics
+        for topic in topics:
+            phrases, words = extract_keywords_from_topic(topic)
+            book_phrases.extend(phrases)
+            book_words.extend(words)
+        
+        # Remove duplicates while preserving order
+        concepts_by_book[book_id] = {
+            "phrases": list(dict.fromkeys(book_phrases)),  # Remove duplicates, preserve order
+            "words": list(dict.fromkeys(book_words))
+        }
+        logger.info(f"Loaded {len(topics)} concepts from {book_id}: "
+                   f"{len(concepts_by_book[book_id]['phrases'])} phrases, "
+                   f"{len(concepts_by_book[book_id]['words'])} words")
     
     # Update cache
     EXTRACTED_CONCEPTS_CACHE = concepts_by_book
@@ -524,7 +561,10 @@ def analyze_topic_coverage(user_question: str) -> str:
 # Initialize cache on server startup
 def initialize_cache():
     """Initialize the concepts cache on server startup"""
+    global OUTPUTS_WATCHER
     try:
+        if Path("outputs").exists():
+            OUTPUTS_WATCHER = OutputsWatcher(Path("outputs"), BOOK_CONFIGS).start()
         concepts = load_extracted_concepts()
         if concepts:
             logger.info(f"✅ Initialized concept cache with {len(concepts)} books")